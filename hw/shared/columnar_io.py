@@ -0,0 +1,271 @@
+"""
+Columnar Parquet Export and Import for Chapter, Page and Layout Span Tables
+
+Chapter statistics, per-page extraction statistics and layout spans are small,
+typed numeric tables, while the chapter content and page text they come with are
+large strings. Each table is written as two Parquet files: a stats file with typed
+columns, and a content file holding only the text column plus its key, compressed
+harder. Analytics can reload just the columns they need (column projection), and
+can skip the text entirely.
+
+Approach: pyarrow schemas -> <name>.parquet (stats) + <name>_content.parquet (text)
+
+Requires pyarrow (imported on first use).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+try:
+    from .layout_table import SpanTable
+    from .lazy_imports import lazy_import
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from layout_table import SpanTable
+    from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+
+CHAPTER_COLUMNS = {
+    "chapter_title": "string",
+    "chapter_number": "int32",
+    "start_line": "int32",
+    "end_line": "int32",
+    "sentence_count": "int32",
+    "word_count": "int64",
+    "token_count": "int64",
+    "character_count": "int64",
+}
+PAGE_COLUMNS = {
+    "page": "int32",
+    "char_count": "int64",
+    "word_count": "int64",
+    "content_hash": "string",
+}
+
+
+def _type(name: str):
+    return pa.string() if name == "string" else getattr(pa, name)()
+
+
+def _paths(directory: Union[str, Path], name: str):
+    directory = Path(directory)
+    return directory / f"{name}.parquet", directory / f"{name}_content.parquet"
+
+
+def write_table(records: Iterable[Mapping[str, Any]], directory: Union[str, Path], name: str,
+                columns: Dict[str, str], key: str, content: str, compression: str = "zstd",
+                content_compression_level: int = 9) -> Path:
+    """
+    Write per-row dictionaries as a typed stats file and a separate content file.
+
+    Args:
+        records: Row dictionaries (or mappings such as ChapterView)
+        directory: Output directory (created if missing)
+        name: Table name, used for the file names
+        columns: Stats column names and Arrow type names; columns absent from every row are skipped
+        key: Column identifying rows, written to both files
+        content: Name of the text column written to the content file
+        compression: Parquet codec for both files
+        content_compression_level: Codec level for the content file
+
+    Returns:
+        Path of the stats file
+    """
+    records = list(records)
+    stats_path, content_path = _paths(directory, name)
+    stats_path.parent.mkdir(parents=True, exist_ok=True)
+
+    present = [column for column in columns
+               if column == key or any(column in record for record in records)]
+    stats = pa.table(
+        {column: pa.array([record.get(column) for record in records], type=_type(columns[column]))
+         for column in present}
+    )
+    pq.write_table(stats, stats_path, compression=compression)
+
+    texts = pa.table({
+        key: stats.column(key),
+        content: pa.array([record.get(content) for record in records], type=pa.large_string()),
+    })
+    pq.write_table(texts, content_path, compression=compression,
+                   compression_level=content_compression_level, use_dictionary=False)
+    return stats_path
+
+
+def read_table(directory: Union[str, Path], name: str, columns: Optional[List[str]] = None,
+               with_content: bool = False):
+    """
+    Read a table written by write_table into a pandas DataFrame.
+
+    Args:
+        directory: Directory holding the files
+        name: Table name
+        columns: Stats columns to load (all when None)
+        with_content: Also load the content file and append its text column
+
+    Returns:
+        pandas DataFrame
+    """
+    stats_path, content_path = _paths(directory, name)
+    table = pq.read_table(stats_path, columns=columns)
+    if with_content:
+        texts = pq.read_table(content_path)
+        content = texts.column_names[-1]
+        # Both files are written in the same row order
+        table = table.append_column(content, texts.column(content))
+    return table.to_pandas()
+
+
+def write_chapters(chapters_data: Iterable[Mapping[str, Any]], directory: Union[str, Path],
+                   name: str = "chapters", **kwargs) -> Path:
+    """
+    Write get_chapter_data output (dictionaries or ChapterViews).
+
+    Args:
+        chapters_data: Chapter records
+        directory: Output directory
+        name: Table name
+        **kwargs: Arguments passed to write_table (compression options)
+
+    Returns:
+        Path of the stats file
+    """
+    return write_table(chapters_data, directory, name, CHAPTER_COLUMNS, "chapter_number", "content", **kwargs)
+
+
+def read_chapters(directory: Union[str, Path], columns: Optional[List[str]] = None,
+                  with_content: bool = False, name: str = "chapters"):
+    """
+    Read chapter statistics, optionally with their content.
+
+    Args:
+        directory: Directory holding the files
+        columns: Stats columns to load (all when None)
+        with_content: Also load the content column
+        name: Table name
+
+    Returns:
+        pandas DataFrame
+    """
+    return read_table(directory, name, columns, with_content)
+
+
+def write_pages(pages_data: Iterable[Mapping[str, Any]], directory: Union[str, Path],
+                name: str = "pages", **kwargs) -> Path:
+    """
+    Write extract_text_from_pdf output; page text goes to the content file.
+
+    Args:
+        pages_data: Page dictionaries
+        directory: Output directory
+        name: Table name
+        **kwargs: Arguments passed to write_table (compression options)
+
+    Returns:
+        Path of the stats file
+    """
+    return write_table(pages_data, directory, name, PAGE_COLUMNS, "page", "text", **kwargs)
+
+
+def read_pages(directory: Union[str, Path], columns: Optional[List[str]] = None,
+               with_content: bool = False, name: str = "pages"):
+    """
+    Read page statistics, optionally with the page text.
+
+    Args:
+        directory: Directory holding the files
+        columns: Stats columns to load (all when None)
+        with_content: Also load the text column
+        name: Table name
+
+    Returns:
+        pandas DataFrame
+    """
+    return read_table(directory, name, columns, with_content)
+
+
+def write_spans(table: SpanTable, directory: Union[str, Path], name: str = "spans",
+                compression: str = "zstd", content_compression_level: int = 9) -> Path:
+    """
+    Write a SpanTable. Fonts are stored as an Arrow dictionary column, span text in the content file.
+
+    Args:
+        table: SpanTable to write
+        directory: Output directory (created if missing)
+        name: Table name
+        compression: Parquet codec for both files
+        content_compression_level: Codec level for the content file
+
+    Returns:
+        Path of the stats file
+    """
+    stats_path, content_path = _paths(directory, name)
+    stats_path.parent.mkdir(parents=True, exist_ok=True)
+
+    span_ids = pa.array(np.arange(len(table), dtype=np.int64))
+    stats = pa.table({
+        "span": span_ids,
+        "page": pa.array(table.page),
+        "x0": pa.array(table.bbox[:, 0]),
+        "y0": pa.array(table.bbox[:, 1]),
+        "x1": pa.array(table.bbox[:, 2]),
+        "y1": pa.array(table.bbox[:, 3]),
+        "size": pa.array(table.size),
+        "flags": pa.array(table.flags),
+        "font": pa.DictionaryArray.from_arrays(pa.array(table.font_id), pa.array(table.fonts, type=pa.string())),
+    })
+    pq.write_table(stats, stats_path, compression=compression)
+
+    texts = pa.table({
+        "span": span_ids,
+        "page": stats.column("page"),
+        "text": pa.array(list(table.text), type=pa.large_string()),
+    })
+    pq.write_table(texts, content_path, compression=compression,
+                   compression_level=content_compression_level, use_dictionary=False)
+    return stats_path
+
+
+def read_spans(directory: Union[str, Path], pages: Optional[Iterable[int]] = None,
+               with_text: bool = True, name: str = "spans") -> SpanTable:
+    """
+    Read a SpanTable written by write_spans.
+
+    Args:
+        directory: Directory holding the files
+        pages: Only load spans on these pages (filtered while reading)
+        with_text: Load span text; without it the text column is empty strings
+        name: Table name
+
+    Returns:
+        SpanTable
+    """
+    stats_path, content_path = _paths(directory, name)
+    filters = [("page", "in", list(pages))] if pages is not None else None
+    stats = pq.read_table(stats_path, filters=filters)
+
+    fonts_column = stats.unify_dictionaries().column("font").combine_chunks()
+    fonts = fonts_column.dictionary.to_pylist()
+    font_id = fonts_column.indices.to_numpy(zero_copy_only=False)
+
+    text = np.empty(stats.num_rows, dtype=object)
+    text[:] = ""
+    if with_text:
+        # The content file carries the page column too, so the same filter applies
+        text[:] = pq.read_table(content_path, columns=["text"], filters=filters).column("text").to_pylist()
+
+    bbox = np.column_stack([stats.column(c).to_numpy() for c in ("x0", "y0", "x1", "y1")])
+    return SpanTable(
+        stats.column("page").to_numpy(),
+        bbox,
+        stats.column("size").to_numpy(),
+        stats.column("flags").to_numpy(),
+        font_id,
+        fonts,
+        text,
+    )
@@ -0,0 +1,239 @@
+"""
+Keyword-Based Document Type Classification in a Single Pass
+
+Every document type is described by a set of keywords, and a document's score for
+a type is the number of distinct keywords of that type it contains. All keyword
+sets are searched together chunk by chunk: each chunk is lowercased and searched
+for the keywords not found yet with C substring search, so a document is scanned
+once without a lowercased copy of the whole text. Text can be streamed page by
+page and scanning stops as soon as the result is decided.
+
+Approach: keyword sets -> per-chunk lowercase + substring search of unfound keywords
+          -> distinct-keyword scores
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+
+# The rules OCR.detect_document_type has always used
+DEFAULT_RULES = {
+    "academic": ["university", "course", "credit", "prerequisite", "professor", "department"],
+    "legal": ["county", "state of", "notary", "acknowledged", "sworn", "witness"],
+}
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive matcher for the distinct keywords that occur in a text.
+
+    Text is lowercased one chunk at a time and every keyword not found yet is
+    looked up with str's substring search, so the scanning runs in C and never
+    needs a lowercased copy of a whole document. Keywords that overlap or nest
+    ("he" in "she") are all found, and keywords split between two chunks are
+    found through the text carried from one scan to the next.
+    """
+
+    def __init__(self, keywords: List[str]):
+        """
+        Build the matcher.
+
+        Args:
+            keywords: Keywords to match; matching ignores case
+        """
+        self.keywords = [keyword.lower() for keyword in keywords]
+        self._ids: Dict[str, List[int]] = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            self._ids.setdefault(keyword, []).append(keyword_id)
+        self._overlap = max((len(keyword) for keyword in self._ids), default=1) - 1
+
+    def scan(self, text: str, found: List[bool], state: str = "") -> str:
+        """
+        Search text and mark the keywords that occur.
+
+        Args:
+            text: Text to scan
+            found: Per-keyword flags to update in place
+            state: Lowercased text carried over from a previous scan (its return value)
+
+        Returns:
+            Text to carry into the next scan, so a stream can be scanned chunk by chunk
+        """
+        window = state + text.lower()
+        for keyword, keyword_ids in self._ids.items():
+            if not found[keyword_ids[0]] and keyword in window:
+                for keyword_id in keyword_ids:
+                    found[keyword_id] = True
+        return window[max(len(window) - self._overlap, 0):] if self._overlap else ""
+
+    def find(self, text: str) -> List[str]:
+        """
+        Return the distinct keywords that occur in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Matched keywords, in keyword order
+        """
+        found = [False] * len(self.keywords)
+        self.scan(text, found)
+        return [keyword for keyword, hit in zip(self.keywords, found) if hit]
+
+
+class DocumentTypeClassifier:
+    """
+    Classifies documents by counting distinct keywords per document type.
+
+    This class handles:
+    - Scoring any number of document types in a single pass
+    - Streaming pages with early exit once the winner is decided
+    - Optional sampling (max_pages) and a looser decisive margin for large volumes
+    - Loading rule sets from a JSON config file or dict
+    """
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None, default_type: str = "general",
+                 empty_type: str = "unknown", max_pages: Optional[int] = None,
+                 decisive_margin: Optional[int] = None, chunk_size: int = 65536):
+        """
+        Initialize the classifier.
+
+        Args:
+            rules: Mapping of document type to keywords (defaults to DEFAULT_RULES)
+            default_type: Type returned when no single type has the highest score
+            empty_type: Type returned for empty text
+            max_pages: Only scan this many pages in classify_pages (None scans all)
+            decisive_margin: Stop once the leader is this many keywords ahead. Without a
+                margin, scanning only stops when no other type can catch up, so the
+                result is the same as scanning everything
+            chunk_size: Characters scanned between early-exit checks
+        """
+        self.rules = {doc_type: list(keywords) for doc_type, keywords in (rules or DEFAULT_RULES).items()}
+        self.default_type = default_type
+        self.empty_type = empty_type
+        self.max_pages = max_pages
+        self.decisive_margin = decisive_margin
+        self.chunk_size = chunk_size
+
+        self.types = list(self.rules)
+        keywords = []
+        self._keyword_types = []
+        for type_index, doc_type in enumerate(self.types):
+            for keyword in dict.fromkeys(keyword.lower() for keyword in self.rules[doc_type]):
+                keywords.append(keyword)
+                self._keyword_types.append(type_index)
+        self._keyword_totals = [self._keyword_types.count(i) for i in range(len(self.types))]
+        self.matcher = KeywordMatcher(keywords)
+
+    @classmethod
+    def from_config(cls, config: Union[str, Path, Dict[str, Any]]) -> "DocumentTypeClassifier":
+        """
+        Create a classifier from a config dict or JSON file.
+
+        The config holds a "rules" mapping and, optionally, any other constructor
+        argument, for example:
+        {"rules": {"academic": ["university", "course"]}, "max_pages": 20}
+
+        Args:
+            config: Config dict or path to a JSON file
+
+        Returns:
+            DocumentTypeClassifier
+        """
+        if not isinstance(config, dict):
+            with open(config, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        return cls(**config)
+
+    def _scores(self, found: List[bool]) -> List[int]:
+        scores = [0] * len(self.types)
+        for keyword_id, hit in enumerate(found):
+            if hit:
+                scores[self._keyword_types[keyword_id]] += 1
+        return scores
+
+    def _decided(self, scores: List[int]) -> bool:
+        """Whether further text cannot (or, with a margin, is not expected to) change the result."""
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        if len(ranked) < 2:
+            return not ranked or scores[ranked[0]] == self._keyword_totals[ranked[0]]
+        leader, runner_up = ranked[0], ranked[1]
+        if self.decisive_margin is not None and scores[leader] - scores[runner_up] >= self.decisive_margin:
+            return True
+        if all(score == total for score, total in zip(scores, self._keyword_totals)):
+            return True
+        return all(scores[leader] > self._keyword_totals[other]
+                   for other in ranked[1:])
+
+    def _scan(self, chunks: Iterable[str]) -> Optional[List[int]]:
+        """Scan a stream of text chunks; None if it holds no text at all."""
+        found = [False] * len(self.matcher.keywords)
+        state = ""
+        seen_text = False
+        for chunk in chunks:
+            seen_text = seen_text or bool(chunk)
+            for start in range(0, len(chunk), self.chunk_size):
+                state = self.matcher.scan(chunk[start:start + self.chunk_size], found, state)
+                if self._decided(self._scores(found)):
+                    return self._scores(found)
+        return self._scores(found) if seen_text else None
+
+    def _pages(self, pages: Iterable[str]) -> Iterable[str]:
+        """Yield up to max_pages pages, separated by newlines as in the joined text."""
+        for page_index, page in enumerate(pages):
+            if self.max_pages is not None and page_index >= self.max_pages:
+                return
+            if page_index:
+                yield "\n"
+            yield page
+
+    def _label(self, scores: Optional[List[int]]) -> str:
+        if scores is None:
+            return self.empty_type
+        best = max(scores, default=0)
+        if best == 0 or scores.count(best) > 1:
+            return self.default_type
+        return self.types[scores.index(best)]
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """
+        Score text against every document type.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Dictionary mapping document type to its number of distinct matched keywords
+        """
+        found = [False] * len(self.matcher.keywords)
+        self.matcher.scan(text, found)
+        return dict(zip(self.types, self._scores(found)))
+
+    def classify(self, text: str) -> str:
+        """
+        Classify a document.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Document type with the highest score, default_type on a tie, or empty_type for empty text
+        """
+        return self._label(self._scan([text or ""]))
+
+    def classify_pages(self, pages: Iterable[str]) -> str:
+        """
+        Classify a document streamed page by page.
+
+        Pages are only read until the result is decided (or max_pages is reached), so
+        a generator of page texts never has to be fully extracted.
+
+        Args:
+            pages: Iterable of page texts
+
+        Returns:
+            Document type with the highest score, default_type on a tie, or empty_type
+            if no page has text
+        """
+        return self._label(self._scan(self._pages(pages)))
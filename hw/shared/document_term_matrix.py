@@ -0,0 +1,321 @@
+"""
+Out-of-Core Hashed Document-Term Matrix Builder
+
+This module streams documents into a document-term matrix without ever holding
+the vocabulary or the whole corpus in memory. Tokens are mapped to columns with a
+stable hash (the "hashing trick"), so the feature space has a fixed size, and rows
+are emitted as CSR batches that are appended to flat binary files on disk. The
+files are memory-mapped back for analysis, so matrices for millions of emails can
+be built and read on a modest machine.
+
+Approach: crc32 feature hashing + append-only CSR arrays + numpy.memmap
+"""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+try:
+    from .term_frequency import _chunked, tokenize_document
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from term_frequency import _chunked, tokenize_document
+
+
+INDEX_DTYPE = np.int32
+DATA_DTYPE = np.int32
+INDPTR_DTYPE = np.int64
+
+
+def feature_index(token: str, n_features: int) -> int:
+    """
+    Map a token to its hashed column.
+
+    Args:
+        token: Token to hash
+        n_features: Size of the feature space
+
+    Returns:
+        Column index in [0, n_features)
+    """
+    return zlib.crc32(token.encode("utf-8")) % n_features
+
+
+class CSRBatch(NamedTuple):
+    """A block of rows in compressed sparse row form (indptr starts at 0)."""
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    n_features: int
+
+    @property
+    def shape(self):
+        return (len(self.indptr) - 1, self.n_features)
+
+    def to_scipy(self):
+        """Convert to a scipy.sparse.csr_matrix (requires scipy)."""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+
+class HashingDocumentTermBuilder:
+    """
+    Stream documents into hashed CSR batches and append them to disk.
+
+    This class handles:
+    - Fixed-size hashed feature space (no vocabulary kept in memory)
+    - Batching rows into CSR arrays
+    - Appending batches to flat .bin files that can be memory-mapped back
+    - Resuming an existing matrix directory with new documents
+    """
+
+    def __init__(self, n_features: int = 2 ** 20, tokenizer: Optional[Callable[[str], List[str]]] = None,
+                 batch_size: int = 10_000, hash_cache_size: int = 500_000):
+        """
+        Initialize the builder.
+
+        Args:
+            n_features: Number of hashed columns
+            tokenizer: Function mapping a document to a list of tokens (defaults to tokenize_document)
+            batch_size: Number of documents per CSR batch
+            hash_cache_size: Maximum number of token -> column entries memoized before the cache is reset
+        """
+        self.n_features = n_features
+        self.tokenizer = tokenizer if tokenizer is not None else tokenize_document
+        self.batch_size = batch_size
+        self.hash_cache_size = hash_cache_size
+        self._hash_cache = {}
+
+    def _columns(self, tokens: List[str]) -> np.ndarray:
+        """Hash tokens to column indices, memoizing per token type."""
+        cache = self._hash_cache
+        if len(cache) > self.hash_cache_size:
+            cache.clear()
+        columns = []
+        for token in tokens:
+            column = cache.get(token)
+            if column is None:
+                column = cache[token] = zlib.crc32(token.encode("utf-8")) % self.n_features
+            columns.append(column)
+        return np.array(columns, dtype=INDEX_DTYPE)
+
+    def transform(self, documents: Iterable[str]) -> Iterator[CSRBatch]:
+        """
+        Convert documents to CSR batches in memory.
+
+        Args:
+            documents: Iterable of document texts
+
+        Yields:
+            CSRBatch of at most batch_size rows, with sorted column indices per row
+        """
+        for chunk in _chunked(documents, self.batch_size):
+            indptr = np.zeros(len(chunk) + 1, dtype=INDPTR_DTYPE)
+            row_indices = []
+            row_data = []
+            for i, text in enumerate(chunk):
+                columns, counts = np.unique(self._columns(self.tokenizer(text)), return_counts=True)
+                row_indices.append(columns.astype(INDEX_DTYPE, copy=False))
+                row_data.append(counts.astype(DATA_DTYPE, copy=False))
+                indptr[i + 1] = indptr[i] + len(columns)
+
+            yield CSRBatch(
+                indptr,
+                np.concatenate(row_indices) if row_indices else np.zeros(0, INDEX_DTYPE),
+                np.concatenate(row_data) if row_data else np.zeros(0, DATA_DTYPE),
+                self.n_features,
+            )
+
+    @staticmethod
+    def _write_meta(meta_file: Path, meta: dict) -> None:
+        # Write then rename, so meta.json is never left half-written
+        tmp_file = meta_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(meta))
+        os.replace(tmp_file, meta_file)
+
+    def write(self, documents: Iterable[str], output_dir: str) -> "HashedCSRMatrix":
+        """
+        Stream documents into CSR batches and append them to output_dir.
+
+        If output_dir already holds a matrix with the same n_features, the new
+        rows are appended after the existing ones. Bytes past the rows recorded
+        in meta.json (left by an interrupted write) are discarded first.
+
+        Args:
+            documents: Iterable of document texts
+            output_dir: Directory holding the matrix files
+
+        Returns:
+            Memory-mapped view of the complete matrix
+        """
+        path = Path(output_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        meta_file = path / "meta.json"
+
+        if meta_file.exists():
+            meta = json.loads(meta_file.read_text())
+            if meta["n_features"] != self.n_features:
+                raise ValueError(
+                    f"{output_dir} was built with n_features={meta['n_features']}, not {self.n_features}"
+                )
+        else:
+            meta = {"n_features": self.n_features, "n_rows": 0, "nnz": 0,
+                    "index_dtype": np.dtype(INDEX_DTYPE).name, "data_dtype": np.dtype(DATA_DTYPE).name}
+            np.zeros(1, dtype=INDPTR_DTYPE).tofile(path / "indptr.bin")
+            (path / "indices.bin").write_bytes(b"")
+            (path / "data.bin").write_bytes(b"")
+
+        # Drop anything written after the last recorded batch
+        recorded = {
+            "indptr.bin": (meta["n_rows"] + 1) * np.dtype(INDPTR_DTYPE).itemsize,
+            "indices.bin": meta["nnz"] * np.dtype(INDEX_DTYPE).itemsize,
+            "data.bin": meta["nnz"] * np.dtype(DATA_DTYPE).itemsize,
+        }
+        for name, size in recorded.items():
+            with open(path / name, "r+b") as f:
+                f.truncate(size)
+
+        with open(path / "indptr.bin", "ab") as indptr_file, \
+                open(path / "indices.bin", "ab") as indices_file, \
+                open(path / "data.bin", "ab") as data_file:
+            for batch in self.transform(documents):
+                (batch.indptr[1:] + meta["nnz"]).tofile(indptr_file)
+                batch.indices.tofile(indices_file)
+                batch.data.tofile(data_file)
+                meta["n_rows"] += batch.shape[0]
+                meta["nnz"] += len(batch.indices)
+                for f in (indptr_file, indices_file, data_file):
+                    f.flush()
+                # Metadata is written last, so a crash leaves a readable prefix
+                self._write_meta(meta_file, meta)
+
+        self._write_meta(meta_file, meta)
+        return HashedCSRMatrix(output_dir)
+
+
+class HashedCSRMatrix:
+    """
+    Read-only, memory-mapped document-term matrix written by HashingDocumentTermBuilder.
+    """
+
+    def __init__(self, matrix_dir: str):
+        """
+        Open a matrix directory.
+
+        Args:
+            matrix_dir: Directory written by HashingDocumentTermBuilder.write
+        """
+        path = Path(matrix_dir)
+        meta = json.loads((path / "meta.json").read_text())
+        self.n_features = meta["n_features"]
+        self.n_rows = meta["n_rows"]
+        self.nnz = meta["nnz"]
+
+        self.indptr = np.memmap(path / "indptr.bin", dtype=INDPTR_DTYPE, mode="r", shape=(self.n_rows + 1,))
+        if self.nnz:
+            self.indices = np.memmap(path / "indices.bin", dtype=INDEX_DTYPE, mode="r", shape=(self.nnz,))
+            self.data = np.memmap(path / "data.bin", dtype=DATA_DTYPE, mode="r", shape=(self.nnz,))
+        else:
+            self.indices = np.zeros(0, dtype=INDEX_DTYPE)
+            self.data = np.zeros(0, dtype=DATA_DTYPE)
+
+    @property
+    def shape(self):
+        return (self.n_rows, self.n_features)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def rows(self, start: int, stop: int) -> CSRBatch:
+        """
+        Return rows [start, stop) as a CSR batch backed by the memory map.
+
+        Args:
+            start: First row
+            stop: One past the last row
+
+        Returns:
+            CSRBatch whose indptr is rebased to start at 0
+        """
+        stop = min(stop, self.n_rows)
+        lo, hi = int(self.indptr[start]), int(self.indptr[stop])
+        return CSRBatch(np.asarray(self.indptr[start:stop + 1]) - lo,
+                        self.indices[lo:hi], self.data[lo:hi], self.n_features)
+
+    def row(self, i: int) -> dict:
+        """
+        Return one document's non-zero columns.
+
+        Args:
+            i: Row index
+
+        Returns:
+            Dictionary mapping column index to count
+        """
+        lo, hi = int(self.indptr[i]), int(self.indptr[i + 1])
+        return dict(zip(self.indices[lo:hi].tolist(), self.data[lo:hi].tolist()))
+
+    def iter_batches(self, batch_size: int = 10_000) -> Iterator[CSRBatch]:
+        """
+        Iterate over the matrix in row batches.
+
+        Args:
+            batch_size: Number of rows per batch
+
+        Yields:
+            CSRBatch views
+        """
+        for start in range(0, self.n_rows, batch_size):
+            yield self.rows(start, start + batch_size)
+
+    def column_sums(self) -> np.ndarray:
+        """Total count per hashed column."""
+        return np.bincount(self.indices, weights=self.data, minlength=self.n_features).astype(np.int64)
+
+    def document_frequencies(self) -> np.ndarray:
+        """Number of documents containing each hashed column."""
+        return np.bincount(self.indices, minlength=self.n_features)
+
+    def idf(self, smooth: bool = True) -> np.ndarray:
+        """
+        Inverse document frequency per column, using the same formula as scikit-learn.
+
+        Args:
+            smooth: Add one to document frequencies as if an extra document contained every term
+
+        Returns:
+            Array of idf weights
+        """
+        df = self.document_frequencies().astype(np.float64)
+        n = self.n_rows
+        if smooth:
+            return np.log((1 + n) / (1 + df)) + 1
+        with np.errstate(divide="ignore"):
+            return np.log(n / df) + 1
+
+    def tfidf_rows(self, start: int, stop: int, idf: Optional[np.ndarray] = None) -> CSRBatch:
+        """
+        Return rows [start, stop) weighted by tf-idf and L2-normalized.
+
+        Args:
+            start: First row
+            stop: One past the last row
+            idf: Precomputed idf() (computed if omitted)
+
+        Returns:
+            CSRBatch with float64 data
+        """
+        idf = self.idf() if idf is None else idf
+        batch = self.rows(start, stop)
+        data = batch.data * idf[batch.indices]
+        row_ids = np.repeat(np.arange(len(batch.indptr) - 1), np.diff(batch.indptr))
+        norms = np.sqrt(np.bincount(row_ids, weights=data ** 2, minlength=len(batch.indptr) - 1))
+        norms[norms == 0] = 1.0
+        return CSRBatch(batch.indptr, np.asarray(batch.indices), data / norms[row_ids], self.n_features)
+
+    def to_scipy(self):
+        """Convert the whole matrix to a scipy.sparse.csr_matrix (requires scipy)."""
+        return self.rows(0, self.n_rows).to_scipy()
@@ -0,0 +1,384 @@
+"""
+Edit Log for the OCR Cleaning and Fix Stages
+
+Diffing the original and processed text after the fact (difflib) is quadratic on
+large documents and cannot tell which rule made a change. Instead, each cleaning
+and fix rule records its replacements while it runs (through a re.sub callback).
+EditLog maps every replacement back to the original text with a run map: a
+sorted list of stretches of the current text that are still unchanged copies of
+the original. Each rule's edits are merged into the map in one pass, so the
+change map costs time linear in the number of edits and unchanged runs.
+
+Edits can be attributed to pages (by their original offsets) and summarized per
+rule, and per-page logs can be combined into a document log.
+
+Approach: re.subn callbacks -> (start, end, replacement) per rule -> run-map update
+          -> edits in original coordinates
+"""
+
+import bisect
+import re
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+_TEMPLATE_ESCAPE = re.compile(r"\\(?:g<([^>]+)>|(\d{1,2})|(.))", re.DOTALL)
+_CHARACTER_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "a": "\a", "b": "\b", "\\": "\\"}
+
+
+def _compile_template(template: str) -> Callable[["re.Match"], str]:
+    """
+    Turn a re.sub replacement template into a function of the match.
+
+    match.expand parses the template on every call, which dominates the cost of
+    logging rules with many matches; here it is parsed once.
+    """
+    if "\\" not in template:
+        return lambda match: template
+    parts: List[Union[str, Tuple[Union[int, str]]]] = []
+    position = 0
+    for escape in _TEMPLATE_ESCAPE.finditer(template):
+        parts.append(template[position:escape.start()])
+        name, number, character = escape.groups()
+        if (character is not None and character not in _CHARACTER_ESCAPES) or (number or "").startswith("0"):
+            # Octal and other rare escapes: leave them to match.expand
+            return lambda match: match.expand(template)
+        if character is not None:
+            parts.append(_CHARACTER_ESCAPES[character])
+        else:
+            group = number if number is not None else name
+            parts.append((int(group) if group.isdigit() else group,))
+        position = escape.end()
+    parts.append(template[position:])
+
+    def expand(match):
+        return "".join(part if isinstance(part, str) else (match.group(part[0]) or "") for part in parts)
+    return expand
+
+
+class Edit(NamedTuple):
+    """One replacement, located in the original text."""
+    stage: str
+    rule: str
+    start: int          # original offsets of the text the replacement covers
+    end: int
+    replacement: str
+
+
+class EditLog:
+    """
+    Records the edits made to one text and maps them to original offsets.
+
+    Usage:
+        log = EditLog(text)
+        text, count = log.sub(r"rn([a-z])", r"m\\1", text, rule="rn->m", stage="fix")
+        log.by_rule(), log.change_map()
+    """
+
+    def __init__(self, text: str, page_starts: Optional[Sequence[int]] = None,
+                 page_numbers: Optional[Sequence[int]] = None):
+        """
+        Initialize an empty log for a text.
+
+        Args:
+            text: Original text, before any edit
+            page_starts: Original offset where each page starts (for by_page)
+            page_numbers: Page number reported for each page (defaults to 1, 2, ...)
+        """
+        self.original_length = len(text)
+        self.page_starts = list(page_starts) if page_starts is not None else [0]
+        self.page_numbers = list(page_numbers) if page_numbers is not None \
+            else list(range(1, len(self.page_starts) + 1))
+        self.edits: List[Edit] = []
+        # Unchanged runs of the current text: (current start, original start, length)
+        self._runs: List[Tuple[int, int, int]] = [(0, 0, len(text))] if text else []
+        self.current_length = len(text)
+        # Current offsets of the separator before each page break, then of each
+        # page start after the first, and whether an edit has covered them
+        breaks = self.page_starts[1:]
+        self._marks = [start - 1 for start in breaks] + list(breaks)
+        self._intact = [True] * len(self._marks)
+
+    def __len__(self) -> int:
+        return len(self.edits)
+
+    def _to_original(self, start: int, end: int, run_starts: List[int]) -> Tuple[int, int]:
+        """Map a current range to the smallest original range that covers it."""
+        runs = self._runs
+        i = bisect.bisect_right(run_starts, start) - 1
+        if i >= 0 and start < runs[i][0] + runs[i][2]:
+            original_start = runs[i][1] + start - runs[i][0]
+        else:
+            # Inside inserted text: from the end of the previous unchanged run
+            original_start = runs[i][1] + runs[i][2] if i >= 0 else 0
+
+        j = bisect.bisect_left(run_starts, end) - 1
+        if j >= 0 and end <= runs[j][0] + runs[j][2]:
+            original_end = runs[j][1] + end - runs[j][0]
+        else:
+            # Inside inserted text: up to the start of the next unchanged run
+            original_end = runs[j + 1][1] if j + 1 < len(runs) else self.original_length
+        return original_start, max(original_start, original_end)
+
+    def record(self, edits: Sequence[Tuple[int, int, str]], rule: str, stage: str = "") -> None:
+        """
+        Record one rule's edits and update the run map.
+
+        Args:
+            edits: (start, end, replacement) in the coordinates of the text the rule
+                was applied to; sorted and non-overlapping
+            rule: Rule name
+            stage: Stage name, e.g. "clean" or "fix"
+        """
+        if not edits:
+            return
+        run_starts = [run[0] for run in self._runs]
+        for start, end, replacement in edits:
+            original_start, original_end = self._to_original(start, end, run_starts)
+            self.edits.append(Edit(stage, rule, original_start, original_end, replacement))
+
+        # One sweep over runs and edits: keep the parts of runs no edit covers, shifted
+        new_runs = []
+        shift = 0
+        covered = 0
+        j = 0
+        for run_start, original_start, length in self._runs:
+            run_end = run_start + length
+            position = max(run_start, covered)
+            while position < run_end:
+                if j == len(edits) or edits[j][0] >= run_end:
+                    new_runs.append((position + shift, original_start + position - run_start, run_end - position))
+                    break
+                start, end, replacement = edits[j]
+                if start > position:
+                    new_runs.append((position + shift, original_start + position - run_start, start - position))
+                    position = start
+                shift += len(replacement) - (end - start)
+                covered = max(covered, end)
+                position = max(position, end)
+                j += 1
+        self._runs = new_runs
+        self._move_marks(edits)
+        self.current_length += sum(len(replacement) - (end - start) for start, end, replacement in edits)
+
+    def _move_marks(self, edits: Sequence[Tuple[int, int, str]]) -> None:
+        """Move the page break marks through one rule's edits (in current coordinates)."""
+        edit_starts = [start for start, _, _ in edits]
+        shifts = [0]
+        for start, end, replacement in edits:
+            shifts.append(shifts[-1] + len(replacement) - (end - start))
+        for k, mark in enumerate(self._marks):
+            i = bisect.bisect_right(edit_starts, mark) - 1
+            if i < 0:
+                continue
+            start, end, replacement = edits[i]
+            if start == mark:
+                # An edit starting at the mark belongs to the text after it
+                self._marks[k] = mark + shifts[i]
+                self._intact[k] = self._intact[k] and end == start
+            elif mark < end:
+                # An edit across the mark belongs to the text before it
+                self._marks[k] = start + shifts[i] + len(replacement)
+                self._intact[k] = False
+            else:
+                self._marks[k] = mark + shifts[i + 1]
+
+    def page_spans(self) -> List[Tuple[int, int]]:
+        """
+        Locate each page of the original text in the current text.
+
+        Pages are the stretches between page_starts, joined by one separator
+        character (as in OCR.page_edit_log). The spans cover the current text in
+        order, except for separators left unchanged. An edit belongs to the page
+        where it starts, so text rewritten across a page break stays whole.
+
+        Returns:
+            (start, end) in the current text per page
+        """
+        breaks = len(self.page_starts) - 1
+        spans = []
+        start = 0
+        for k in range(breaks):
+            separator, next_start = self._marks[k], self._marks[breaks + k]
+            end = separator if self._intact[k] and next_start == separator + 1 else next_start
+            spans.append((start, max(start, end)))
+            start = next_start
+        spans.append((start, max(start, self.current_length)))
+        return spans
+
+    def apply(self, text: str, edits: Sequence[Tuple[int, int, str]], rule: str, stage: str = "") -> str:
+        """
+        Apply and record edits computed outside a regex substitution.
+
+        Args:
+            text: Current text
+            edits: Sorted, non-overlapping (start, end, replacement) in text coordinates
+            rule: Rule name
+            stage: Stage name
+
+        Returns:
+            Edited text
+        """
+        pieces = []
+        position = 0
+        for start, end, replacement in edits:
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(text[position:])
+        self.record(edits, rule, stage)
+        return "".join(pieces)
+
+    def sub(self, pattern: Union[str, "re.Pattern"], repl: Union[str, Callable], text: str,
+            rule: Optional[str] = None, stage: str = "", flags: int = 0) -> Tuple[str, int]:
+        """
+        re.subn that records every replacement that changes the text.
+
+        Args:
+            pattern: Regular expression
+            repl: Replacement template or function, as for re.sub
+            text: Current text
+            rule: Rule name (defaults to the pattern)
+            stage: Stage name
+            flags: Regular expression flags
+
+        Returns:
+            Tuple of (new text, number of substitutions)
+        """
+        compiled = re.compile(pattern, flags)
+        expand = _compile_template(repl) if isinstance(repl, str) else repl
+        edits = []
+
+        def replace(match):
+            replacement = expand(match)
+            if replacement != match.group():
+                edits.append((match.start(), match.end(), replacement))
+            return replacement
+
+        new_text, count = compiled.subn(replace, text)
+        self.record(edits, rule or compiled.pattern, stage)
+        return new_text, count
+
+    def strip(self, text: str, stage: str = "") -> str:
+        """
+        str.strip that records the removed leading and trailing whitespace.
+
+        Args:
+            text: Current text
+            stage: Stage name
+
+        Returns:
+            Stripped text
+        """
+        stripped = text.strip()
+        if len(stripped) == len(text):
+            return text
+        start = len(text) - len(text.lstrip())
+        edits = [(0, start, "")] if start else []
+        if start + len(stripped) < len(text):
+            edits.append((start + len(stripped), len(text), ""))
+        return self.apply(text, edits, "strip", stage)
+
+    def extend(self, other: "EditLog", offset: int = 0) -> None:
+        """
+        Add another log's edits, shifted by offset (e.g. a page log into a document log).
+
+        Args:
+            other: Log of a part of this log's text
+            offset: Original offset of that part
+        """
+        self.extend_records(other.to_records(), offset)
+
+    def to_records(self) -> List[List[Any]]:
+        """Edits as JSON-serializable lists [stage, rule, start, end, replacement]."""
+        return [list(edit) for edit in self.edits]
+
+    def extend_records(self, records: Iterable[Sequence[Any]], offset: int = 0) -> None:
+        """
+        Add edits from to_records() output, shifted by offset.
+
+        Args:
+            records: Edit records
+            offset: Original offset added to each record
+        """
+        for stage, rule, start, end, replacement in records:
+            self.edits.append(Edit(stage, rule, start + offset, end + offset, replacement))
+
+    @staticmethod
+    def rule_key(edit: Edit) -> str:
+        return f"{edit.stage}:{edit.rule}" if edit.stage else edit.rule
+
+    def by_rule(self) -> Dict[str, Dict[str, int]]:
+        """
+        Summarize edits per rule.
+
+        Returns:
+            Dictionary mapping "stage:rule" to count, original_chars (original text
+            covered) and replacement_chars
+        """
+        summary: Dict[str, Dict[str, int]] = {}
+        for edit in self.edits:
+            row = summary.setdefault(self.rule_key(edit), {"count": 0, "original_chars": 0, "replacement_chars": 0})
+            row["count"] += 1
+            row["original_chars"] += edit.end - edit.start
+            row["replacement_chars"] += len(edit.replacement)
+        return summary
+
+    def page_of(self, offset: int) -> int:
+        """Page number of an original offset."""
+        return self.page_numbers[max(0, bisect.bisect_right(self.page_starts, offset) - 1)]
+
+    def by_page(self) -> Dict[int, Dict[str, int]]:
+        """
+        Count edits per page and rule.
+
+        Returns:
+            Dictionary mapping page number to {"stage:rule": count}
+        """
+        summary: Dict[int, Dict[str, int]] = {}
+        for edit in self.edits:
+            page = summary.setdefault(self.page_of(edit.start), {})
+            key = self.rule_key(edit)
+            page[key] = page.get(key, 0) + 1
+        return summary
+
+    def change_map(self) -> List[Tuple[int, int]]:
+        """
+        Merged original ranges that any edit changed.
+
+        Returns:
+            Sorted, non-overlapping (start, end) ranges; touching ranges are joined and
+            pure insertions appear as empty ranges
+        """
+        merged: List[List[int]] = []
+        for start, end in sorted((edit.start, edit.end) for edit in self.edits):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return [(start, end) for start, end in merged]
+
+    def changed_characters(self) -> int:
+        """Number of original characters covered by any edit."""
+        return sum(end - start for start, end in self.change_map())
+
+
+def sub(pattern: str, repl: Union[str, Callable], text: str, edit_log: Optional[EditLog] = None,
+        rule: Optional[str] = None, stage: str = "", flags: int = 0) -> Tuple[str, int]:
+    """
+    re.subn, recording the edits when an edit log is given.
+
+    Args:
+        pattern: Regular expression
+        repl: Replacement template or function
+        text: Current text
+        edit_log: Optional log to record into
+        rule: Rule name (defaults to the pattern)
+        stage: Stage name
+        flags: Regular expression flags
+
+    Returns:
+        Tuple of (new text, number of substitutions)
+    """
+    if edit_log is None:
+        return re.subn(pattern, repl, text, flags=flags)
+    return edit_log.sub(pattern, repl, text, rule=rule, stage=stage, flags=flags)
@@ -0,0 +1,358 @@
+"""
+Concurrent Gutenberg Fetcher using asyncio
+
+This module downloads many Project Gutenberg texts concurrently over plain asyncio
+streams. Connections are kept alive and pooled per host, the number of in-flight
+requests is bounded by a semaphore, failed requests are retried with exponential
+backoff, and response bodies are decoded incrementally as they stream in.
+
+Approach: standard library only (asyncio streams + HTTP/1.1 keep-alive)
+"""
+
+import asyncio
+import codecs
+import concurrent.futures
+import random
+import ssl
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class _StaleConnection(Exception):
+    """Raised when a pooled keep-alive connection was closed by the server."""
+
+
+class _RetryableStatus(Exception):
+    """Raised for HTTP statuses that are worth retrying (429 and 5xx)."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class GutenbergFetcher:
+    """
+    Download Gutenberg texts concurrently with connection reuse and retries.
+
+    This class handles:
+    - Bounded concurrency (asyncio semaphore)
+    - Keep-alive connection pooling per host
+    - Retry with exponential backoff for network errors and 429/5xx responses
+    - Streaming, incremental decoding of response bodies
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        chunk_size: int = 64 * 1024,
+        encoding: str = "utf-8",
+        max_idle_per_host: int = 8,
+        max_redirects: int = 5,
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at once
+            timeout: Seconds allowed for a single request attempt
+            max_retries: Number of retries after the first failed attempt
+            backoff: Base delay in seconds, doubled on each retry
+            chunk_size: Number of bytes read from the socket at a time
+            encoding: Fallback encoding when the response does not declare one
+            max_idle_per_host: Maximum number of idle connections kept per host
+            max_redirects: Maximum number of redirects followed per request
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.max_idle_per_host = max_idle_per_host
+        self.max_redirects = max_redirects
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[Any, Any]]] = {}
+        self.stats = {
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "retries": 0,
+            "bytes_received": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Synchronous entry points
+    # ------------------------------------------------------------------
+
+    def fetch_text(self, url: str) -> Optional[str]:
+        """
+        Download a single text. Blocking wrapper around fetch().
+
+        Args:
+            url: URL of the text to download
+
+        Returns:
+            Decoded text, or None if the download failed
+        """
+        return self.fetch_many([url])[url]
+
+    def fetch_many(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Download many texts concurrently. Blocking wrapper around fetch_all().
+
+        asyncio.run() cannot be called while an event loop is running, as in a
+        Jupyter notebook, so in that case the download runs on its own loop in a
+        helper thread and this call blocks until it finishes. Async code that
+        should not block its loop can await fetch_all() directly instead.
+
+        Args:
+            urls: URLs of the texts to download
+
+        Returns:
+            Dictionary mapping each URL to its decoded text (None on failure)
+        """
+
+        async def run():
+            try:
+                return await self.fetch_all(urls)
+            finally:
+                await self.close()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run()).result()
+
+    # ------------------------------------------------------------------
+    # Asynchronous API
+    # ------------------------------------------------------------------
+
+    async def fetch_all(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Download many texts concurrently on the running event loop.
+
+        Args:
+            urls: URLs of the texts to download
+
+        Returns:
+            Dictionary mapping each URL to its decoded text (None on failure)
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        texts = await asyncio.gather(*(self.fetch(url) for url in unique_urls))
+        return dict(zip(unique_urls, texts))
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """
+        Download and decode a single text, retrying transient failures.
+
+        Args:
+            url: URL of the text to download
+
+        Returns:
+            Decoded text, or None if every attempt failed
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await asyncio.wait_for(self._get(url), self.timeout)
+                except _RetryableStatus as e:
+                    error = e
+                except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                    error = e
+                except ValueError as e:
+                    print(f"Error fetching {url}: {e}")
+                    return None
+
+                if attempt < self.max_retries:
+                    self.stats["retries"] += 1
+                    delay = self.backoff * (2 ** attempt)
+                    await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+            print(f"Error fetching {url} after {self.max_retries + 1} attempts: {error!r}")
+            return None
+
+    async def close(self) -> None:
+        """
+        Close every pooled connection.
+        """
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                writer.close()
+        for connections in idle.values():
+            for _, writer in connections:
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+        self._semaphore = None
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1 internals
+    # ------------------------------------------------------------------
+
+    async def _get(self, url: str) -> str:
+        """Perform a GET request, following redirects."""
+        for _ in range(self.max_redirects + 1):
+            status, headers, text = await self._request(url)
+            if status in REDIRECT_STATUSES and "location" in headers:
+                url = urljoin(url, headers["location"])
+                continue
+            if status in RETRY_STATUSES:
+                raise _RetryableStatus(status)
+            if status >= 400:
+                raise ValueError(f"HTTP {status}")
+            return text
+        raise ValueError(f"Too many redirects (>{self.max_redirects})")
+
+    async def _request(self, url: str) -> Tuple[int, Dict[str, str], str]:
+        """Send one request, retrying once on a fresh socket if a pooled one went stale."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        try:
+            return await self._request_on(key, path, self._take_idle(key))
+        except _StaleConnection:
+            return await self._request_on(key, path, None)
+
+    async def _request_on(self, key, path: str, connection) -> Tuple[int, Dict[str, str], str]:
+        reused = connection is not None
+        if connection is None:
+            connection = await self._open(key)
+        reader, writer = connection
+        self.stats["requests"] += 1
+
+        try:
+            host_header = key[1] if key[2] in (80, 443) else f"{key[1]}:{key[2]}"
+            writer.write(
+                (
+                    f"GET {path} HTTP/1.1\r\n"
+                    f"Host: {host_header}\r\n"
+                    "User-Agent: nlp-methods-fetcher/1.0\r\n"
+                    "Accept-Encoding: identity\r\n"
+                    "Connection: keep-alive\r\n\r\n"
+                ).encode("latin-1")
+            )
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                if reused:
+                    raise _StaleConnection()
+                raise EOFError("Server closed connection without a response")
+
+            version, status, _ = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+            status = int(status)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            decoder = codecs.getincrementaldecoder(self._charset(headers))(errors="strict")
+            pieces = []
+            async for chunk in self._iter_body(reader, headers):
+                self.stats["bytes_received"] += len(chunk)
+                pieces.append(decoder.decode(chunk))
+            pieces.append(decoder.decode(b"", final=True))
+        except BaseException:
+            writer.close()
+            raise
+
+        keep_alive = (
+            version == "HTTP/1.1"
+            and headers.get("connection", "").lower() != "close"
+            and ("content-length" in headers or "chunked" in headers.get("transfer-encoding", "").lower())
+        )
+        if keep_alive:
+            self._release(key, connection)
+        else:
+            writer.close()
+
+        return status, headers, "".join(pieces)
+
+    async def _iter_body(self, reader, headers: Dict[str, str]):
+        """Yield raw body chunks for Content-Length, chunked or read-until-close bodies."""
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    # Skip optional trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                remaining = size
+                while remaining:
+                    chunk = await reader.readexactly(min(remaining, self.chunk_size))
+                    remaining -= len(chunk)
+                    yield chunk
+                await reader.readexactly(2)  # CRLF after each chunk
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining:
+                chunk = await reader.readexactly(min(remaining, self.chunk_size))
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            while True:
+                chunk = await reader.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def _charset(self, headers: Dict[str, str]) -> str:
+        """Pick the response charset from Content-Type, falling back to self.encoding."""
+        for param in headers.get("content-type", "").split(";")[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "charset" and value:
+                try:
+                    return codecs.lookup(value.strip('"')).name
+                except LookupError:
+                    break
+        return self.encoding
+
+    async def _open(self, key):
+        scheme, host, port = key
+        context = ssl.create_default_context() if scheme == "https" else None
+        connection = await asyncio.open_connection(host, port, ssl=context)
+        self.stats["connections_opened"] += 1
+        return connection
+
+    def _take_idle(self, key):
+        connections = self._idle.get(key, [])
+        while connections:
+            reader, writer = connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.stats["connections_reused"] += 1
+                return reader, writer
+            writer.close()
+        return None
+
+    def _release(self, key, connection) -> None:
+        connections = self._idle.setdefault(key, [])
+        if len(connections) < self.max_idle_per_host:
+            connections.append(connection)
+        else:
+            connection[1].close()
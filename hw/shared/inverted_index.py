@@ -0,0 +1,398 @@
+"""
+Inverted Index and Concordance Search over Processed Texts
+
+Finding every occurrence of a word or phrase used to mean running a regex over
+each whole text again. InvertedIndexBuilder indexes the tokens that
+get_processed_text finds once. For every token it stores its byte offsets in the
+text, its sentence id and whether it lies inside a quote, and it groups token
+ids by term into CSR postings lists. Keyword-in-context (KWIC), phrase and
+quote-only queries then touch only the postings of the query terms, across any
+number of books.
+
+Index directory layout (written by InvertedIndexBuilder.write):
+    meta.json            documents, terms and array lengths
+    term_offsets.bin     int64, term t's postings are posting_tokens[term_offsets[t]:term_offsets[t + 1]]
+    posting_tokens.bin   int64 global token ids, sorted within each term
+    token_start.bin      int64 byte offset of each token in text.bin
+    token_end.bin        int64
+    token_sentence.bin   int32 sentence id within the document
+    token_quote.bin      uint8, 1 if the token lies inside a quote
+    doc_tokens.bin       int64, tokens of document d are doc_tokens[d]:doc_tokens[d + 1]
+    text.bin             UTF-8 text of every document, concatenated
+
+Approach: get_processed_text(as_spans=True) -> token term ids -> stable argsort -> memory-mapped CSR postings
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .nlp_methods import NLPMethods, TOKEN_PATTERN
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from nlp_methods import NLPMethods, TOKEN_PATTERN
+
+
+ARRAYS = {
+    "term_offsets": np.int64,
+    "posting_tokens": np.int64,
+    "token_start": np.int64,
+    "token_end": np.int64,
+    "token_sentence": np.int32,
+    "token_quote": np.uint8,
+    "doc_tokens": np.int64,
+    "text": np.uint8,
+}
+QUOTE_CHARACTERS = "'\""
+
+
+def normalize_term(token: str) -> str:
+    """
+    Map a token to its index term: lowercased, without trailing quote characters.
+
+    Args:
+        token: Token from get_processed_text
+
+    Returns:
+        Term (empty for tokens that are only quote characters)
+    """
+    return token.rstrip(QUOTE_CHARACTERS).lower()
+
+
+def _utf8_offsets(text: str) -> np.ndarray:
+    """Byte offset in text.encode("utf-8") of every character offset 0..len(text)."""
+    code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    widths = 1 + (code_points >= 0x80) + (code_points >= 0x800) + (code_points >= 0x10000)
+    offsets = np.zeros(len(text) + 1, dtype=np.int64)
+    np.cumsum(widths, out=offsets[1:])
+    return offsets
+
+
+class Hit(NamedTuple):
+    """One query match."""
+    document: str
+    token: int        # token position within the document
+    sentence: int     # sentence id within the document
+    in_quote: bool
+
+
+class Concordance(NamedTuple):
+    """One keyword-in-context line."""
+    document: str
+    left: str
+    match: str
+    right: str
+
+
+class InvertedIndexBuilder:
+    """
+    Builds an inverted index from texts or get_processed_text results.
+
+    Usage:
+        builder = InvertedIndexBuilder()
+        builder.add_text("siddhartha", text)
+        index = builder.build()              # in memory
+        index = builder.write("index_dir")   # on disk, memory-mapped
+    """
+
+    def __init__(self, nlp: Optional[NLPMethods] = None):
+        """
+        Initialize the builder.
+
+        Args:
+            nlp: NLPMethods used to process added texts (its segmenter defines sentence ids)
+        """
+        self.nlp = nlp if nlp is not None else NLPMethods(None)
+        self.documents: List[str] = []
+        self.terms: Dict[str, int] = {}
+        self._term_ids = []
+        self._starts = []
+        self._ends = []
+        self._sentences = []
+        self._quotes = []
+        self._texts = []
+        self._doc_tokens = [0]
+        self._text_bytes = 0
+
+    def add_text(self, name: str, text: str) -> None:
+        """
+        Process a text with get_processed_text and add it.
+
+        Args:
+            name: Document name
+            text: Text to index
+        """
+        # Indexing a corpus stays quiet instead of reporting each book's quotes
+        processed = self.nlp.get_processed_text(text, as_spans=True, verbose=False)
+        self.add_processed(name, processed)
+
+    def add_processed(self, name: str, processed) -> None:
+        """
+        Add a get_processed_text(..., as_spans=True) result.
+
+        Args:
+            name: Document name
+            processed: ProcessedText over the document's text
+        """
+        text = processed.source
+        tokens = processed.all_tokens
+        sentence_offsets = np.frombuffer(processed.tokenized_sentences.offsets, dtype=np.int64)
+        sentence_ids = np.repeat(np.arange(len(sentence_offsets) - 1, dtype=np.int32), np.diff(sentence_offsets))
+
+        term_ids = np.fromiter(
+            (self.terms.setdefault(term, len(self.terms)) if term else -1
+             for term in map(normalize_term, tokens)),
+            dtype=np.int64, count=len(tokens),
+        )
+        keep = term_ids >= 0
+        starts = np.frombuffer(tokens.starts, dtype=np.int64)[keep]
+        ends = np.frombuffer(tokens.ends, dtype=np.int64)[keep]
+
+        # Quotes can nest or overlap (the patterns are matched separately), so merge them
+        quote_spans = sorted(processed.quotes.spans())
+        merged_starts, merged_ends = [], []
+        for start, end in quote_spans:
+            if merged_ends and start <= merged_ends[-1]:
+                merged_ends[-1] = max(merged_ends[-1], end)
+            else:
+                merged_starts.append(start)
+                merged_ends.append(end)
+        inside = np.searchsorted(merged_starts, starts, side="right") - 1
+        in_quote = (inside >= 0) & (starts < np.asarray(merged_ends, dtype=np.int64)[np.maximum(inside, 0)]) \
+            if merged_starts else np.zeros(len(starts), dtype=bool)
+
+        byte_offsets = _utf8_offsets(text)
+        self._term_ids.append(term_ids[keep])
+        self._starts.append(byte_offsets[starts] + self._text_bytes)
+        self._ends.append(byte_offsets[ends] + self._text_bytes)
+        self._sentences.append(sentence_ids[keep])
+        self._quotes.append(in_quote.astype(np.uint8))
+        encoded = text.encode("utf-8")
+        self._texts.append(np.frombuffer(encoded, dtype=np.uint8))
+        self._text_bytes += len(encoded)
+        self._doc_tokens.append(self._doc_tokens[-1] + int(keep.sum()))
+        self.documents.append(name)
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        def concatenate(parts, dtype):
+            return np.concatenate(parts).astype(dtype, copy=False) if parts else np.zeros(0, dtype=dtype)
+
+        term_ids = concatenate(self._term_ids, np.int64)
+        counts = np.bincount(term_ids, minlength=len(self.terms))
+        term_offsets = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(counts, out=term_offsets[1:])
+        return {
+            "term_offsets": term_offsets,
+            # A stable sort keeps each term's token ids in text order
+            "posting_tokens": np.argsort(term_ids, kind="stable").astype(np.int64),
+            "token_start": concatenate(self._starts, np.int64),
+            "token_end": concatenate(self._ends, np.int64),
+            "token_sentence": concatenate(self._sentences, np.int32),
+            "token_quote": concatenate(self._quotes, np.uint8),
+            "doc_tokens": np.asarray(self._doc_tokens, dtype=np.int64),
+            "text": concatenate(self._texts, np.uint8),
+        }
+
+    def build(self) -> "InvertedIndex":
+        """
+        Build the index in memory.
+
+        Returns:
+            InvertedIndex
+        """
+        return InvertedIndex(self._arrays(), list(self.documents), list(self.terms))
+
+    def write(self, output_dir: Union[str, Path]) -> "InvertedIndex":
+        """
+        Write the index to a directory and open it memory-mapped.
+
+        Args:
+            output_dir: Index directory (created if missing)
+
+        Returns:
+            InvertedIndex backed by the files
+        """
+        path = Path(output_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        arrays = self._arrays()
+        for name, values in arrays.items():
+            values.tofile(path / f"{name}.bin")
+        meta = {
+            "documents": self.documents,
+            "terms": list(self.terms),
+            "lengths": {name: len(values) for name, values in arrays.items()},
+        }
+        # Metadata is written last, so a partly written directory is not mistaken for an index
+        (path / "meta.json").write_text(json.dumps(meta))
+        return InvertedIndex.open(path)
+
+
+class InvertedIndex:
+    """
+    Token-level inverted index over one or more documents.
+
+    Queries are case-insensitive. A phrase matches consecutive tokens of one
+    sentence (punctuation between them is ignored).
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], documents: List[str], terms: List[str]):
+        """
+        Initialize the index (use InvertedIndexBuilder or InvertedIndex.open).
+
+        Args:
+            arrays: Index arrays, as described in the module docstring
+            documents: Document names
+            terms: Terms, in term id order
+        """
+        for name, values in arrays.items():
+            setattr(self, name, values)
+        self.documents = documents
+        self.terms = terms
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+
+    @classmethod
+    def open(cls, index_dir: Union[str, Path]) -> "InvertedIndex":
+        """
+        Open an index directory written by InvertedIndexBuilder.write.
+
+        Args:
+            index_dir: Index directory
+
+        Returns:
+            InvertedIndex backed by memory-mapped files
+        """
+        path = Path(index_dir)
+        meta = json.loads((path / "meta.json").read_text())
+        arrays = {}
+        for name, dtype in ARRAYS.items():
+            length = meta["lengths"][name]
+            arrays[name] = (np.memmap(path / f"{name}.bin", dtype=dtype, mode="r", shape=(length,))
+                            if length else np.zeros(0, dtype=dtype))
+        return cls(arrays, meta["documents"], meta["terms"])
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def postings(self, term: str) -> np.ndarray:
+        """
+        Global token ids of a term, in text order.
+
+        Args:
+            term: Word (normalized like the indexed tokens)
+
+        Returns:
+            int64 array (empty if the term is not indexed)
+        """
+        term_id = self.term_ids.get(normalize_term(term))
+        if term_id is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.posting_tokens[self.term_offsets[term_id]:self.term_offsets[term_id + 1]]
+
+    def count(self, term: str) -> int:
+        """Number of occurrences of a term."""
+        return len(self.postings(term))
+
+    def document_frequency(self, term: str) -> int:
+        """Number of documents containing a term."""
+        return len(np.unique(self._documents_of(self.postings(term))))
+
+    def _documents_of(self, token_ids: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.doc_tokens, token_ids, side="right") - 1
+
+    def _query_terms(self, query: Union[str, Iterable[str]]) -> List[str]:
+        words = TOKEN_PATTERN.findall(query) if isinstance(query, str) else list(query)
+        return [term for term in map(normalize_term, words) if term]
+
+    def search(self, query: Union[str, Iterable[str]], quotes: Optional[bool] = None) -> Tuple[np.ndarray, int]:
+        """
+        Find the tokens where a word or phrase starts.
+
+        Args:
+            query: Word, phrase string, or list of words
+            quotes: True for matches inside quotes only, False for matches outside
+                quotes only, None for all
+
+        Returns:
+            Tuple of (global token ids of the first matching token, phrase length)
+        """
+        terms = self._query_terms(query)
+        if not terms:
+            return np.zeros(0, dtype=np.int64), 0
+        # Start from the rarest term and check the others at their offsets
+        lists = [np.asarray(self.postings(term)) for term in terms]
+        rarest = min(range(len(terms)), key=lambda i: len(lists[i]))
+        candidates = lists[rarest] - rarest
+        candidates = candidates[(candidates >= 0) & (candidates + len(terms) <= len(self.token_sentence))]
+
+        for i, postings in enumerate(lists):
+            if i == rarest or not len(candidates):
+                continue
+            positions = candidates + i
+            found = np.searchsorted(postings, positions)
+            found[found == len(postings)] = 0
+            candidates = candidates[(postings[found] == positions) if len(postings) else np.zeros(0, bool)]
+
+        if len(terms) > 1 and len(candidates):
+            last = candidates + len(terms) - 1
+            same = (self.token_sentence[candidates] == self.token_sentence[last]) \
+                & (self._documents_of(candidates) == self._documents_of(last))
+            candidates = candidates[same]
+        if quotes is not None and len(candidates):
+            flags = self.token_quote[candidates].astype(bool)
+            if len(terms) > 1:
+                flags &= self.token_quote[candidates + len(terms) - 1].astype(bool)
+            candidates = candidates[flags if quotes else ~flags]
+        return candidates, len(terms)
+
+    def hits(self, query: Union[str, Iterable[str]], quotes: Optional[bool] = None) -> List[Hit]:
+        """
+        Find a word or phrase and describe each match.
+
+        Args:
+            query: Word, phrase string, or list of words
+            quotes: Quote filter, as in search
+
+        Returns:
+            List of Hit tuples in document and text order
+        """
+        token_ids, _ = self.search(query, quotes)
+        documents = self._documents_of(token_ids)
+        return [
+            Hit(self.documents[d], int(t - self.doc_tokens[d]), int(self.token_sentence[t]), bool(self.token_quote[t]))
+            for t, d in zip(token_ids, documents)
+        ]
+
+    def _decode(self, start: int, end: int) -> str:
+        return " ".join(bytes(self.text[start:end]).decode("utf-8", "replace").split())
+
+    def kwic(self, query: Union[str, Iterable[str]], window: int = 5, quotes: Optional[bool] = None,
+             limit: Optional[int] = None) -> List[Concordance]:
+        """
+        Keyword-in-context lines for a word or phrase.
+
+        Args:
+            query: Word, phrase string, or list of words
+            window: Tokens of context on each side (within the same document)
+            quotes: Quote filter, as in search
+            limit: Maximum number of lines
+
+        Returns:
+            List of Concordance tuples with whitespace-normalized context
+        """
+        token_ids, length = self.search(query, quotes)
+        token_ids = token_ids[:limit]
+        lines = []
+        for t, d in zip(token_ids, self._documents_of(token_ids)):
+            first, last = int(t), int(t) + length - 1
+            doc_first, doc_last = self.doc_tokens[d], self.doc_tokens[d + 1] - 1
+            left = self.token_start[max(doc_first, first - window)]
+            right = self.token_end[min(doc_last, last + window)]
+            lines.append(Concordance(
+                self.documents[d],
+                self._decode(left, self.token_start[first]),
+                self._decode(self.token_start[first], self.token_end[last]),
+                self._decode(self.token_end[last], right),
+            ))
+        return lines
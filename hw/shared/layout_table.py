@@ -0,0 +1,239 @@
+"""
+Columnar Span Table for PDF Layout Analysis
+
+A SpanTable stores every text span of a document as columns instead of one dict
+per span: page numbers, bounding boxes, font sizes and flags are NumPy arrays and
+font names are dictionary-encoded as integer ids. Font histograms, header
+detection and page filtering become vectorized array operations, which keeps
+layout analysis fast for documents with hundreds of thousands of spans.
+
+Approach: NumPy columns + dictionary-encoded fonts (built by OCR.extract_layout_table)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .lazy_imports import lazy_import
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+class SpanTable:
+    """
+    Columnar table of PDF text spans.
+
+    Columns:
+    - page: int32 page number (0-indexed)
+    - bbox: float64 array of shape (n, 4) holding x0, y0, x1, y1
+    - size: float64 font size
+    - flags: int32 PyMuPDF font flags
+    - font_id: int32 index into fonts
+    - text: object array of span text
+    """
+
+    def __init__(self, page: np.ndarray, bbox: np.ndarray, size: np.ndarray, flags: np.ndarray,
+                 font_id: np.ndarray, fonts: List[str], text: np.ndarray):
+        """
+        Initialize a table from its columns.
+
+        Args:
+            page: Page number per span
+            bbox: Bounding box per span, shape (n, 4)
+            size: Font size per span
+            flags: Font flags per span
+            font_id: Font id per span (index into fonts)
+            fonts: Font names, indexed by font_id
+            text: Span text
+        """
+        self.page = np.asarray(page, dtype=np.int32)
+        self.bbox = np.asarray(bbox, dtype=np.float64).reshape(-1, 4)
+        self.size = np.asarray(size, dtype=np.float64)
+        self.flags = np.asarray(flags, dtype=np.int32)
+        self.font_id = np.asarray(font_id, dtype=np.int32)
+        self.fonts = list(fonts)
+        self.text = np.asarray(text, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.size)
+
+    @classmethod
+    def from_records(cls, elements: List[Dict[str, Any]], page: int = 0) -> "SpanTable":
+        """
+        Build a table from per-span dicts as returned by OCR.extract_with_layout.
+
+        Args:
+            elements: List of span dicts with text, bbox, font, size and flags
+            page: Page number to assign when the dicts carry none
+
+        Returns:
+            SpanTable holding the same spans
+        """
+        builder = SpanTableBuilder()
+        for element in elements:
+            builder.add(element.get("page", page), element)
+        return builder.build()
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert back to per-span dicts (same keys as extract_with_layout, plus page).
+
+        Returns:
+            List of span dicts
+        """
+        fonts = self.font_names()
+        return [
+            {
+                "page": int(self.page[i]),
+                "text": self.text[i],
+                "bbox": tuple(self.bbox[i].tolist()),
+                "font": fonts[i],
+                "size": float(self.size[i]),
+                "flags": int(self.flags[i]),
+            }
+            for i in range(len(self))
+        ]
+
+    def select(self, mask: np.ndarray) -> "SpanTable":
+        """
+        Return the spans selected by a boolean mask or index array.
+
+        Args:
+            mask: Boolean mask or integer indices
+
+        Returns:
+            New SpanTable sharing the font dictionary
+        """
+        return SpanTable(self.page[mask], self.bbox[mask], self.size[mask], self.flags[mask],
+                         self.font_id[mask], self.fonts, self.text[mask])
+
+    def pages(self, start: int, stop: Optional[int] = None) -> "SpanTable":
+        """
+        Return the spans on pages [start, stop).
+
+        Args:
+            start: First page (0-indexed)
+            stop: One past the last page (defaults to start + 1)
+
+        Returns:
+            New SpanTable
+        """
+        stop = start + 1 if stop is None else stop
+        return self.select((self.page >= start) & (self.page < stop))
+
+    def font_names(self) -> np.ndarray:
+        """Font name per span, decoded from the font dictionary."""
+        return np.asarray(self.fonts, dtype=object)[self.font_id] if len(self) else np.zeros(0, dtype=object)
+
+    def size_histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count spans per font size.
+
+        Returns:
+            Tuple of (sizes ascending, counts)
+        """
+        return np.unique(self.size, return_counts=True)
+
+    def font_histogram(self) -> Dict[str, int]:
+        """
+        Count spans per font.
+
+        Returns:
+            Dictionary mapping font name to span count
+        """
+        counts = np.bincount(self.font_id, minlength=len(self.fonts))
+        return {font: int(count) for font, count in zip(self.fonts, counts)}
+
+    def header_mask(self, ratio: float = 1.2) -> np.ndarray:
+        """
+        Flag spans whose font size exceeds the average size by ratio.
+
+        Args:
+            ratio: Multiple of the average font size above which a span counts as a header
+
+        Returns:
+            Boolean mask
+        """
+        if len(self) == 0:
+            return np.zeros(0, dtype=bool)
+        return self.size > self.size.mean() * ratio
+
+    def headers(self, ratio: float = 1.2) -> "SpanTable":
+        """
+        Return the likely header spans (see header_mask).
+
+        Args:
+            ratio: Multiple of the average font size above which a span counts as a header
+
+        Returns:
+            New SpanTable
+        """
+        return self.select(self.header_mask(ratio))
+
+
+class SpanTableBuilder:
+    """
+    Accumulates spans column by column and builds a SpanTable.
+    """
+
+    def __init__(self):
+        self._page = []
+        self._bbox = []
+        self._size = []
+        self._flags = []
+        self._font_id = []
+        self._text = []
+        self._font_ids: Dict[str, int] = {}
+
+    def add(self, page: int, span: Dict[str, Any]) -> None:
+        """
+        Add one span.
+
+        Args:
+            page: Page number (0-indexed)
+            span: Span dict with text, bbox, font, size and flags
+        """
+        font_id = self._font_ids.get(span["font"])
+        if font_id is None:
+            font_id = self._font_ids[span["font"]] = len(self._font_ids)
+        self._page.append(page)
+        self._bbox.extend(span["bbox"])
+        self._size.append(span["size"])
+        self._flags.append(span["flags"])
+        self._font_id.append(font_id)
+        self._text.append(span["text"])
+
+    def add_page(self, page: int, page_dict: Dict[str, Any]) -> None:
+        """
+        Add every text span of a page.get_text("dict") result.
+
+        Args:
+            page: Page number (0-indexed)
+            page_dict: Output of PyMuPDF page.get_text("dict")
+        """
+        for block in page_dict["blocks"]:
+            for line in block.get("lines", ()):  # image blocks have no lines
+                for span in line["spans"]:
+                    self.add(page, span)
+
+    def build(self) -> SpanTable:
+        """
+        Build the table.
+
+        Returns:
+            SpanTable holding every added span
+        """
+        text = np.empty(len(self._text), dtype=object)
+        text[:] = self._text
+        return SpanTable(
+            np.array(self._page, dtype=np.int32),
+            np.array(self._bbox, dtype=np.float64).reshape(-1, 4),
+            np.array(self._size, dtype=np.float64),
+            np.array(self._flags, dtype=np.int32),
+            np.array(self._font_id, dtype=np.int32),
+            list(self._font_ids),
+            text,
+        )
@@ -0,0 +1,109 @@
+"""
+Lazy Module Loading and One-Time Resource Checks
+
+Heavy dependencies (pandas, nltk, numpy, pymupdf) take most of the startup time of
+a short-lived CLI or worker process, even when the task at hand (extracting quotes,
+fixing OCR errors) never touches them. Modules in this folder bind those
+dependencies to LazyModule proxies that import the real module on first attribute
+access, and check NLTK data once per process instead of once per object.
+
+Approach: module proxy with deferred importlib.import_module + lru_cache'd resource lookups
+"""
+
+import importlib
+import sys
+import types
+from functools import lru_cache
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Usage:
+        pd = LazyModule("pandas")
+        pd.DataFrame(...)  # pandas is imported here
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the proxy.
+
+        Args:
+            name: Fully qualified module name, e.g. "nltk.tokenize"
+        """
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded(self.__name__) else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+    @staticmethod
+    def is_loaded(name: str) -> bool:
+        """
+        Check whether a module has actually been imported in this process.
+
+        Args:
+            name: Fully qualified module name
+
+        Returns:
+            True if the module is in sys.modules
+        """
+        return name in sys.modules
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Return a proxy for a module, or the module itself if it is already imported.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        Module or LazyModule proxy
+    """
+    return sys.modules.get(name) or LazyModule(name)
+
+
+@lru_cache(maxsize=None)
+def ensure_nltk_resource(resource: str, package: str = None, download: bool = False) -> bool:
+    """
+    Check (once per process) that an NLTK data resource is available.
+
+    Args:
+        resource: Resource path for nltk.data.find, e.g. "corpora/stopwords"
+        package: Package name to download when missing (defaults to the last path part)
+        download: Try to download the package quietly when it is missing
+
+    Returns:
+        True if the resource is available
+    """
+    nltk = importlib.import_module("nltk")
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        if not download:
+            return False
+    package = package or resource.rsplit("/", 1)[-1]
+    print(f"Downloading NLTK {package}...")
+    nltk.download(package, quiet=True)
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        return False
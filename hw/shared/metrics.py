@@ -0,0 +1,372 @@
+"""
+In-Process Metrics for Text Processing Throughput
+
+MetricsRegistry holds labeled counters and histograms and writes them as a
+Prometheus text-format file (for the node exporter's textfile collector or any
+scraper) or as JSON. The instrument decorator adds per-method metrics to
+NLPMethods when it is given a registry. Without one, the only cost is one
+attribute check per call.
+
+Recorded per method (label "method"):
+    <prefix>_calls_total, <prefix>_errors_total, <prefix>_input_bytes_total
+    <prefix>_tokens_total, <prefix>_sentences_total, <prefix>_quotes_total
+    <prefix>_latency_seconds (histogram), <prefix>_throughput_mb_per_second (histogram)
+    <prefix>_slow_calls_total, plus the most recent slow calls in slow_calls
+
+Slow calls are calls on inputs of at least min_slow_bytes that run below
+slow_mb_per_second. Keeping them makes inputs such as deeply nested or
+unbalanced quotes easy to find.
+
+Approach: decorator -> perf_counter timing + result measures -> locked label maps
+          -> Prometheus text / JSON snapshots (written atomically)
+"""
+
+import bisect
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+THROUGHPUT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 500.0)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = "", labels: Sequence[str] = ()):
+        """
+        Initialize the counter.
+
+        Args:
+            name: Metric name (Prometheus naming, ending in _total)
+            help: Help text
+            labels: Label names
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Add to the counter.
+
+        Args:
+            amount: Non-negative increment
+            **labels: Label values
+        """
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value for a label set (0 if never incremented)."""
+        return self._values.get(tuple(str(labels[name]) for name in self.labels), 0)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(sample name, labels, value) for every label set."""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, dict(zip(self.labels, key)), value) for key, value in items]
+
+
+class Histogram:
+    """Observations counted into cumulative buckets per label set, with sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            help: Help text
+            labels: Label names
+            buckets: Increasing upper bounds (+Inf is added)
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        key = tuple(str(labels[name]) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        """Number of observations for a label set."""
+        entry = self._values.get(tuple(str(labels[name]) for name in self.labels))
+        return sum(entry[0]) if entry else 0
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """
+        Estimate a quantile from the buckets (upper bound of the bucket holding it).
+
+        Args:
+            q: Quantile between 0 and 1
+            **labels: Label values
+
+        Returns:
+            Bucket upper bound (inf past the last bucket, nan without observations)
+        """
+        entry = self._values.get(tuple(str(labels[name]) for name in self.labels))
+        if not entry or not sum(entry[0]):
+            return math.nan
+        counts = entry[0]
+        rank = q * sum(counts)
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return math.inf
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Bucket, sum and count samples in Prometheus order."""
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        samples = []
+        for key, (counts, total) in items:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", dict(labels, le=_format_value(bound)), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms with Prometheus text and JSON output.
+
+    Usage:
+        metrics = MetricsRegistry()
+        nlp = NLPMethods(url, metrics=metrics)
+        nlp.get_processed_text(text)
+        metrics.write_prometheus("nlp.prom")
+        metrics.write_json("nlp_metrics.json")
+    """
+
+    def __init__(self, slow_mb_per_second: Optional[float] = 0.5, min_slow_bytes: int = 64 * 1024,
+                 slow_log_size: int = 100):
+        """
+        Initialize an empty registry.
+
+        Args:
+            slow_mb_per_second: Instrumented calls below this throughput are logged as
+                slow (None disables the slow-call log)
+            min_slow_bytes: Smallest input considered for the slow-call log
+            slow_log_size: Number of most recent slow calls kept
+        """
+        self.slow_mb_per_second = slow_mb_per_second
+        self.min_slow_bytes = min_slow_bytes
+        self.slow_calls: deque = deque(maxlen=slow_log_size)
+        self._metrics: Dict[str, Union[Counter, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, labels: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labels, **kwargs)
+            elif not isinstance(metric, cls) or metric.labels != tuple(labels):
+                raise ValueError(f"metric {name} already registered with another type or labels")
+            return metric
+
+    def counter(self, name: str, help: str = "", labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, help, labels, buckets=buckets)
+
+    def get(self, name: str) -> Union[Counter, Histogram]:
+        """Registered metric by name (KeyError if missing)."""
+        return self._metrics[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._metrics
+
+    def to_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            Text with HELP and TYPE lines followed by the samples of each metric
+        """
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of every metric and the slow-call log as JSON-serializable data.
+
+        Returns:
+            {"metrics": {name: {"type", "help", "samples": [...]}}, "slow_calls": [...]}
+        """
+        metrics = {}
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            metrics[name] = {
+                "type": metric.kind,
+                "help": metric.help,
+                "samples": [{"name": sample_name, "labels": labels, "value": value}
+                            for sample_name, labels, value in metric.samples()],
+            }
+        return {"metrics": metrics, "slow_calls": list(self.slow_calls)}
+
+    @staticmethod
+    def _write(path: Union[str, Path], text: str) -> None:
+        # Written to a temporary file first, so scrapers never read a partial file
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def write_prometheus(self, path: Union[str, Path]) -> None:
+        """
+        Write the Prometheus text format to a file.
+
+        Args:
+            path: Output file (e.g. a textfile collector directory entry ending in .prom)
+        """
+        self._write(path, self.to_prometheus())
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        """
+        Write the to_dict() snapshot as JSON.
+
+        Args:
+            path: Output file
+        """
+        self._write(path, json.dumps(self.to_dict(), indent=2, default=str))
+
+
+def _input_bytes(text: Any) -> int:
+    if not isinstance(text, str):
+        return 0
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def instrument(measure: Optional[Callable[[Any], Dict[str, int]]] = None, text_arg: str = "text",
+               prefix: str = "nlp") -> Callable:
+    """
+    Decorate a method to record metrics into self.metrics when it is a MetricsRegistry.
+
+    Args:
+        measure: Function of the method's result returning counts for any of
+            "tokens", "sentences" and "quotes"
+        text_arg: Name of the parameter holding the input text (for input bytes)
+        prefix: Metric name prefix
+
+    Returns:
+        Decorator
+    """
+    def decorator(method):
+        position = list(inspect.signature(method).parameters).index(text_arg)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, "metrics", None)
+            if metrics is None:
+                return method(self, *args, **kwargs)
+
+            text = args[position - 1] if len(args) >= position else kwargs.get(text_arg)
+            name = method.__name__
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception:
+                metrics.counter(f"{prefix}_errors_total", "Calls that raised", ["method"]).inc(method=name)
+                raise
+            seconds = time.perf_counter() - start
+            _record_call(metrics, prefix, name, _input_bytes(text), seconds,
+                         measure(result) if measure is not None and result is not None else {}, text)
+            return result
+        return wrapper
+    return decorator
+
+
+def _record_call(metrics: MetricsRegistry, prefix: str, method: str, size: int, seconds: float,
+                 counts: Dict[str, int], text: Any) -> None:
+    metrics.counter(f"{prefix}_calls_total", "Calls", ["method"]).inc(method=method)
+    metrics.counter(f"{prefix}_input_bytes_total", "UTF-8 bytes of input text", ["method"]).inc(size, method=method)
+    for unit in ("tokens", "sentences", "quotes"):
+        if unit in counts:
+            metrics.counter(f"{prefix}_{unit}_total", f"{unit.capitalize()} processed",
+                            ["method"]).inc(counts[unit], method=method)
+    metrics.histogram(f"{prefix}_latency_seconds", "Call latency in seconds", ["method"],
+                      LATENCY_BUCKETS).observe(seconds, method=method)
+    if not size:
+        return
+    mb_per_second = size / 1e6 / max(seconds, 1e-9)
+    metrics.histogram(f"{prefix}_throughput_mb_per_second", "Input megabytes per second", ["method"],
+                      THROUGHPUT_BUCKETS).observe(mb_per_second, method=method)
+
+    if (metrics.slow_mb_per_second is not None and size >= metrics.min_slow_bytes
+            and mb_per_second < metrics.slow_mb_per_second):
+        metrics.counter(f"{prefix}_slow_calls_total", "Calls below the slow throughput threshold",
+                        ["method"]).inc(method=method)
+        metrics.slow_calls.append({
+            "method": method,
+            "input_bytes": size,
+            "seconds": round(seconds, 6),
+            "mb_per_second": round(mb_per_second, 4),
+            **counts,
+            "preview": text[:80],
+        })
@@ -0,0 +1,316 @@
+"""
+Near-Duplicate Detection with MinHash and LSH
+
+Exact drop_duplicates on the email Body misses forwarded and lightly edited
+newsletters. This module estimates Jaccard similarity between documents' token
+shingles with MinHash signatures and finds candidate pairs with banded
+locality-sensitive hashing, so the work grows roughly linearly with the corpus
+instead of comparing every pair. Per-document state is a fixed number of bytes
+(band hashes plus, optionally, the signature) and can be kept on disk.
+
+Approach: k-token shingles -> MinHash signatures -> LSH band hashes -> sort-based
+bucket grouping -> verification against one representative per group in a bucket
+-> union-find clusters
+"""
+
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    from .lazy_imports import lazy_import
+    from .term_frequency import tokenize_document
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from lazy_imports import lazy_import
+    from term_frequency import tokenize_document
+
+pd = lazy_import("pandas")
+
+
+EMPTY_BAND = np.uint64(0)
+
+
+class _AppendArray:
+    """Append-only 2D array kept in memory or in a flat file on disk."""
+
+    def __init__(self, width: int, dtype, path: Optional[Path] = None):
+        self.width = width
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        self.rows = 0
+        self._chunks = []
+        if path is not None:
+            path.write_bytes(b"")
+
+    def append(self, block: np.ndarray) -> None:
+        block = np.ascontiguousarray(block, dtype=self.dtype).reshape(-1, self.width)
+        if self.path is not None:
+            with open(self.path, "ab") as f:
+                block.tofile(f)
+        else:
+            self._chunks.append(block)
+        self.rows += len(block)
+
+    def view(self) -> np.ndarray:
+        if self.rows == 0:
+            return np.zeros((0, self.width), dtype=self.dtype)
+        if self.path is not None:
+            return np.memmap(self.path, dtype=self.dtype, mode="r", shape=(self.rows, self.width))
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0]
+
+
+class MinHashLSH:
+    """
+    MinHash/LSH near-duplicate detector for document corpora.
+
+    This class handles:
+    - Shingling documents into k-token windows of the existing tokenization
+    - Computing MinHash signatures with vectorized universal hashing
+    - Banded LSH with sort-based bucket grouping (no per-bucket dictionaries)
+    - Optional verification of candidates against the estimated Jaccard similarity
+    - Returning duplicate clusters
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 5,
+                 threshold: float = 0.8, tokenizer: Optional[Callable[[str], List[str]]] = None,
+                 verify: bool = True, storage_dir: Optional[str] = None, seed: int = 1):
+        """
+        Initialize the detector.
+
+        Args:
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; num_perm must be divisible by bands
+            shingle_size: Number of consecutive tokens per shingle
+            threshold: Minimum estimated Jaccard similarity for verified duplicates
+            tokenizer: Function mapping a document to a list of tokens (defaults to tokenize_document)
+            verify: Keep signatures and check candidates against threshold. Without
+                verification only band hashes are stored (8 * bands bytes per document)
+            storage_dir: Keep per-document arrays in files under this directory instead of RAM
+            seed: Seed for the hash permutations
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.tokenizer = tokenizer if tokenizer is not None else tokenize_document
+        self.verify = verify
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 2 ** 63, size=self.rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+        directory = None
+        if storage_dir is not None:
+            directory = Path(storage_dir)
+            directory.mkdir(parents=True, exist_ok=True)
+        self._band_hashes = _AppendArray(bands, np.uint64, directory / "bands.bin" if directory else None)
+        self._signatures = (
+            _AppendArray(num_perm, np.uint32, directory / "signatures.bin" if directory else None)
+            if verify else None
+        )
+        self._pending_bands = []
+        self._pending_signatures = []
+        self._flush_every = 10_000
+
+    def __len__(self) -> int:
+        return self._band_hashes.rows + len(self._pending_bands)
+
+    def _shingles(self, tokens: List[str]) -> np.ndarray:
+        """Hash each k-token window to a 32-bit value."""
+        k = self.shingle_size
+        if len(tokens) <= k:
+            windows = [" ".join(tokens)] if tokens else []
+        else:
+            windows = {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+        return np.fromiter((zlib.crc32(w.encode("utf-8")) for w in windows), dtype=np.uint64)
+
+    def signature(self, tokens: List[str]) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a token sequence.
+
+        Args:
+            tokens: Document tokens
+
+        Returns:
+            uint32 array of length num_perm, or None for documents without tokens
+        """
+        shingles = self._shingles(tokens)
+        if len(shingles) == 0:
+            return None
+        # Multiply-shift hashing: wraps mod 2**64 and keeps the high 32 bits
+        hashed = (shingles[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+        return hashed.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature: Optional[np.ndarray]) -> np.ndarray:
+        if signature is None:
+            return np.full(self.bands, EMPTY_BAND, dtype=np.uint64)
+        rows = signature.astype(np.uint64).reshape(self.bands, self.rows_per_band)
+        keys = (rows * self._band_mix[None, :]).sum(axis=1, dtype=np.uint64)
+        # Reserve 0 for documents without tokens
+        keys[keys == EMPTY_BAND] = np.uint64(1)
+        return keys
+
+    def add_tokens(self, tokens: List[str]) -> int:
+        """
+        Add one tokenized document.
+
+        Args:
+            tokens: Document tokens
+
+        Returns:
+            Index of the document
+        """
+        signature = self.signature(tokens)
+        self._pending_bands.append(self._band_keys(signature))
+        if self.verify:
+            self._pending_signatures.append(
+                signature if signature is not None else np.zeros(self.num_perm, dtype=np.uint32)
+            )
+        if len(self._pending_bands) >= self._flush_every:
+            self._flush()
+        return len(self) - 1
+
+    def add_document(self, text: str) -> int:
+        """
+        Tokenize and add one document.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Index of the document
+        """
+        return self.add_tokens(self.tokenizer(text))
+
+    def add_documents(self, documents: Iterable[str]) -> "MinHashLSH":
+        """
+        Tokenize and add many documents.
+
+        Args:
+            documents: Iterable of document texts
+
+        Returns:
+            self, to allow chaining
+        """
+        for text in documents:
+            self.add_document(text)
+        return self
+
+    def _flush(self) -> None:
+        if self._pending_bands:
+            self._band_hashes.append(np.stack(self._pending_bands))
+            self._pending_bands = []
+        if self._pending_signatures:
+            self._signatures.append(np.stack(self._pending_signatures))
+            self._pending_signatures = []
+
+    @staticmethod
+    def _buckets(order: np.ndarray, same: np.ndarray) -> Iterator[np.ndarray]:
+        """Yield the members of every bucket with at least two documents."""
+        boundaries = np.flatnonzero(np.diff(np.concatenate(([False], same, [False])).astype(np.int8)))
+        for start, stop in zip(boundaries[0::2].tolist(), (boundaries[1::2] + 1).tolist()):
+            yield order[start:stop]
+
+    def clusters(self) -> List[List[int]]:
+        """
+        Group near-duplicate documents.
+
+        Returns:
+            List of clusters (sorted lists of document indices) with at least two members
+        """
+        self._flush()
+        n = len(self)
+        if n == 0:
+            return []
+
+        band_hashes = self._band_hashes.view()
+        signatures = self._signatures.view() if self.verify else None
+        parent = np.arange(n, dtype=np.int64)
+
+        def find(x):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        def union(left, right):
+            for a, b in zip(left.tolist(), right.tolist()):
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        for band in range(self.bands):
+            keys = np.asarray(band_hashes[:, band])
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            # Neighbouring documents in sorted order that share a bucket
+            same = (sorted_keys[1:] == sorted_keys[:-1]) & (sorted_keys[1:] != EMPTY_BAND)
+            if signatures is None:
+                # Linking neighbours joins each bucket into one cluster
+                union(order[:-1][same], order[1:][same])
+                continue
+            # A dissimilar document can sort between two duplicates, so members are
+            # checked against one representative per group found in the bucket
+            # rather than against their neighbours
+            for members in self._buckets(order, same):
+                representatives = []
+                for member in members.tolist():
+                    root = find(member)
+                    if any(find(rep) == root for rep in representatives):
+                        continue
+                    if representatives:
+                        agreement = (signatures[representatives] == signatures[member]).mean(axis=1)
+                        matches = [rep for rep, ok in zip(representatives, agreement >= self.threshold) if ok]
+                    else:
+                        matches = []
+                    if matches:
+                        union(np.array(matches), np.full(len(matches), member))
+                    else:
+                        representatives.append(member)
+
+        # Roots are the smallest member, so clusters come out ordered by first member
+        groups = {}
+        for index in range(n):
+            groups.setdefault(find(index), []).append(index)
+        return [members for members in groups.values() if len(members) > 1]
+
+    def duplicate_mask(self) -> np.ndarray:
+        """
+        Flag every document that is a near-duplicate of an earlier one.
+
+        Returns:
+            Boolean array, True for documents to drop (the first member of each cluster is kept)
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        for members in self.clusters():
+            mask[members[1:]] = True
+        return mask
+
+
+def drop_near_duplicates(df: pd.DataFrame, column_name: str, **kwargs) -> pd.DataFrame:
+    """
+    Drop rows whose text is a near-duplicate of an earlier row.
+
+    Args:
+        df: Input DataFrame
+        column_name: Name of the text column
+        **kwargs: Arguments passed to MinHashLSH
+
+    Returns:
+        DataFrame keeping the first row of every near-duplicate cluster
+    """
+    detector = MinHashLSH(**kwargs).add_documents(df[column_name])
+    return df[~detector.duplicate_mask()]
@@ -0,0 +1,307 @@
+"""
+Memory-Bounded N-Gram Counting with Count-Min Sketch Fallback
+
+NGramCounter counts n-grams (n = 1 to 5) from token streams such as the
+tokenized sentences of get_processed_text. Tokens are mapped to uint32 ids and
+each n-gram is stored as n ids in one fixed-width key, so exact counts take
+4n + 8 bytes per distinct n-gram instead of a tuple of strings in a dict.
+N-grams are collected in batches and merged into a sorted key table.
+
+Once the table would exceed the memory budget, the counter switches to a
+count-min sketch of the same size. The sketch gives estimates that never
+undercount. Heavy-hitter candidates (the most frequent n-grams so far) are kept
+alongside it, so most_common still works. count_dialogue_and_narrative keeps
+separate counts for quoted and narrative text.
+
+Approach: token ids -> sliding windows -> sorted void-keyed table (exact)
+          -> multiply-shift hashed count-min sketch + top-K candidates (bounded)
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .nlp_methods import TOKEN_PATTERN
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from nlp_methods import TOKEN_PATTERN
+
+
+MAX_N = 5
+BOUNDARY = 0xFFFFFFFF  # token id that separates sequences
+_HASH_PRIME = np.uint64(0x9E3779B97F4A7C15)
+
+
+class NGramCounter:
+    """
+    Counts n-grams exactly until a memory budget is reached, then with a count-min sketch.
+
+    Usage:
+        counter = NGramCounter(n=2, max_memory=64 * 2 ** 20)
+        counter.add_token_lists(processed["tokenized_sentences"])
+        counter.most_common(20)
+        counter.count(("the", "river"))
+    """
+
+    def __init__(self, n: int = 2, max_memory: int = 256 * 2 ** 20, depth: int = 4,
+                 heavy_hitters: int = 1000, batch_size: int = 1_000_000, lower: bool = True,
+                 seed: int = 0):
+        """
+        Initialize the counter.
+
+        Args:
+            n: N-gram length (1 to 5)
+            max_memory: Byte budget for the exact table; the sketch uses the same budget
+            depth: Number of count-min sketch rows
+            heavy_hitters: Number of most frequent n-grams tracked in sketch mode
+            batch_size: N-grams collected before they are merged into the counts
+            lower: Lowercase tokens before counting
+            seed: Seed for the sketch hash functions
+        """
+        if not 1 <= n <= MAX_N:
+            raise ValueError(f"n must be between 1 and {MAX_N}")
+        self.n = n
+        self.max_memory = max_memory
+        self.depth = depth
+        self.heavy_hitters = heavy_hitters
+        self.batch_size = batch_size
+        self.lower = lower
+        self.seed = seed
+
+        self.vocabulary: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        self.total = 0
+        self._key_dtype = np.dtype((np.void, 4 * n))
+        self._keys = np.zeros(0, dtype=self._key_dtype)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._pending: List[np.ndarray] = []
+        self._pending_rows = 0
+        self._sketch: Optional[np.ndarray] = None
+        self._candidates = np.zeros((0, n), dtype=np.uint32)
+
+    @property
+    def exact(self) -> bool:
+        """True while counts are exact (the sketch has not been used)."""
+        return self._sketch is None
+
+    def memory_usage(self) -> int:
+        """Bytes held by the count table or sketch and the pending batch (vocabulary excluded)."""
+        table = self._sketch.nbytes if self._sketch is not None else self._keys.nbytes + self._counts.nbytes
+        return table + self._pending_rows * 4 * self.n
+
+    def _ids(self, tokens: Iterable[str]) -> Iterator[int]:
+        vocabulary = self.vocabulary
+        for token in tokens:
+            if self.lower:
+                token = token.lower()
+            token_id = vocabulary.get(token)
+            if token_id is None:
+                token_id = vocabulary[token] = len(self.tokens)
+                self.tokens.append(token)
+            yield token_id
+
+    def add_tokens(self, tokens: Sequence[str]) -> None:
+        """
+        Count the n-grams of one token sequence.
+
+        Args:
+            tokens: Tokens in order
+        """
+        self.add_token_lists([tokens])
+
+    def add_token_lists(self, token_lists: Iterable[Sequence[str]]) -> None:
+        """
+        Count the n-grams of many token sequences; no n-gram spans two sequences.
+
+        Args:
+            token_lists: Token sequences, e.g. tokenized sentences
+        """
+        # Sequences are joined with a boundary id, and windows containing it are dropped
+        ids = array("I")
+        for tokens in token_lists:
+            ids.extend(self._ids(tokens))
+            ids.append(BOUNDARY)
+        if len(ids) < self.n:
+            return
+        windows = np.lib.stride_tricks.sliding_window_view(np.frombuffer(ids, dtype=np.uint32), self.n)
+        windows = windows[~(windows == BOUNDARY).any(axis=1)]
+        if not len(windows):
+            return
+        self._pending.append(np.ascontiguousarray(windows))
+        self._pending_rows += len(windows)
+        self.total += len(windows)
+        if self._pending_rows >= self.batch_size:
+            self._flush()
+
+    def add_text(self, text: str) -> None:
+        """
+        Tokenize text with the get_processed_text token pattern and count it as one sequence.
+
+        Args:
+            text: Text to count
+        """
+        self.add_tokens(TOKEN_PATTERN.findall(text))
+
+    def _as_keys(self, rows: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(rows, dtype=np.uint32).view(self._key_dtype).ravel()
+
+    def _as_rows(self, keys: np.ndarray) -> np.ndarray:
+        return keys.view(np.uint32).reshape(-1, self.n)
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        rows = np.concatenate(self._pending)
+        self._pending = []
+        self._pending_rows = 0
+        keys, counts = np.unique(self._as_keys(rows), return_counts=True)
+
+        if self._sketch is not None:
+            self._add_to_sketch(self._as_rows(keys), counts)
+            return
+
+        if len(self._keys):
+            keys, inverse = np.unique(np.concatenate([self._keys, keys]), return_inverse=True)
+            counts = np.bincount(inverse, weights=np.concatenate([self._counts, counts])).astype(np.int64)
+        self._keys, self._counts = keys, counts.astype(np.int64)
+        if self.memory_usage() > self.max_memory:
+            self._switch_to_sketch()
+
+    def _switch_to_sketch(self) -> None:
+        width_bits = max(4, int(np.log2(max(1, self.max_memory // (8 * self.depth)))))
+        self._width_bits = width_bits
+        rng = np.random.default_rng(self.seed)
+        # Odd multipliers for multiply-shift hashing, one per sketch row
+        self._multipliers = rng.integers(1, 2 ** 63, size=self.depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._sketch = np.zeros((self.depth, 2 ** width_bits), dtype=np.uint64)
+
+        rows, counts = self._as_rows(self._keys), self._counts
+        self._keys = np.zeros(0, dtype=self._key_dtype)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._add_to_sketch(rows, counts)
+
+    def _hash(self, rows: np.ndarray) -> np.ndarray:
+        h = np.zeros(len(rows), dtype=np.uint64)
+        for column in range(self.n):
+            h = (h ^ rows[:, column].astype(np.uint64)) * _HASH_PRIME
+        return h
+
+    def _buckets(self, rows: np.ndarray) -> np.ndarray:
+        h = self._hash(rows)
+        shift = np.uint64(64 - self._width_bits)
+        return np.stack([(h * multiplier) >> shift for multiplier in self._multipliers])
+
+    def _estimate_rows(self, rows: np.ndarray) -> np.ndarray:
+        buckets = self._buckets(rows)
+        return np.min([self._sketch[d][buckets[d]] for d in range(self.depth)], axis=0).astype(np.int64)
+
+    def _add_to_sketch(self, rows: np.ndarray, counts: np.ndarray) -> None:
+        buckets = self._buckets(rows)
+        width = self._sketch.shape[1]
+        for d in range(self.depth):
+            self._sketch[d] += np.bincount(buckets[d], weights=counts, minlength=width).astype(np.uint64)
+
+        # Keep the heavy-hitter candidates with the highest current estimates
+        candidates = self._as_rows(np.unique(self._as_keys(np.concatenate([self._candidates, rows]))))
+        if len(candidates) > self.heavy_hitters:
+            estimates = self._estimate_rows(candidates)
+            candidates = candidates[np.argpartition(-estimates, self.heavy_hitters - 1)[:self.heavy_hitters]]
+        self._candidates = np.ascontiguousarray(candidates)
+
+    def _lookup_rows(self, ngrams: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        known = []
+        rows = []
+        for ngram in ngrams:
+            if len(ngram) != self.n:
+                raise ValueError(f"expected {self.n} tokens, got {len(ngram)}")
+            ids = [self.vocabulary.get(token.lower() if self.lower else token) for token in ngram]
+            known.append(None not in ids)
+            rows.append([i if i is not None else 0 for i in ids])
+        return np.asarray(rows, dtype=np.uint32).reshape(-1, self.n), np.asarray(known, dtype=bool)
+
+    def counts(self, ngrams: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Counts of many n-grams (estimates that never undercount once the sketch is used).
+
+        Args:
+            ngrams: Sequences of n tokens
+
+        Returns:
+            int64 array of counts
+        """
+        self._flush()
+        rows, known = self._lookup_rows(ngrams)
+        result = np.zeros(len(rows), dtype=np.int64)
+        if not known.any():
+            return result
+        if self._sketch is not None:
+            result[known] = self._estimate_rows(rows[known])
+            return result
+        keys = self._as_keys(rows[known])
+        positions = np.searchsorted(self._keys, keys)
+        positions[positions == len(self._keys)] = 0
+        found = self._keys[positions] == keys if len(self._keys) else np.zeros(len(keys), dtype=bool)
+        result[known] = np.where(found, self._counts[positions] if len(self._keys) else 0, 0)
+        return result
+
+    def count(self, ngram: Sequence[str]) -> int:
+        """
+        Count of one n-gram.
+
+        Args:
+            ngram: Sequence of n tokens (a string is split on whitespace)
+
+        Returns:
+            Count, or an upper-bound estimate once the sketch is used
+        """
+        if isinstance(ngram, str):
+            ngram = ngram.split()
+        return int(self.counts([ngram])[0])
+
+    def most_common(self, k: int = 20) -> List[Tuple[Tuple[str, ...], int]]:
+        """
+        The k most frequent n-grams.
+
+        In sketch mode, only heavy-hitter candidates are considered and the counts
+        are sketch estimates.
+
+        Args:
+            k: Number of n-grams
+
+        Returns:
+            List of (n-gram tuple, count), most frequent first
+        """
+        self._flush()
+        if self._sketch is not None:
+            rows, counts = self._candidates, self._estimate_rows(self._candidates)
+        else:
+            rows, counts = self._as_rows(self._keys), self._counts
+        if not len(counts):
+            return []
+        top = np.argsort(-counts, kind="stable")[:k]
+        return [(tuple(self.tokens[i] for i in rows[j]), int(counts[j])) for j in top]
+
+
+def count_dialogue_and_narrative(processed, n: int = 2, **kwargs) -> Dict[str, NGramCounter]:
+    """
+    Count n-grams separately in dialogue (quoted text) and narrative.
+
+    Dialogue n-grams come from each extracted quote, narrative n-grams from each
+    stretch of text left after quote removal; no n-gram spans a quote boundary.
+
+    Args:
+        processed: get_processed_text(text, as_spans=True) result
+        n: N-gram length
+        **kwargs: NGramCounter options (memory budget and so on)
+
+    Returns:
+        Dictionary with "dialogue" and "narrative" counters
+    """
+    dialogue = NGramCounter(n, **kwargs)
+    narrative = NGramCounter(n, **kwargs)
+    dialogue.add_token_lists(TOKEN_PATTERN.findall(quote) for quote in processed.quotes)
+    narrative.add_token_lists(TOKEN_PATTERN.findall(span) for span in processed.non_quote_spans)
+    return {"dialogue": dialogue, "narrative": narrative}
@@ -1,11 +1,60 @@
-import urllib.request
-import nltk
-from nltk.tokenize import RegexpTokenizer
-import re
-import pandas as pd
+import bisect
 import random
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from pprint import pprint
 
+try:
+    from .lazy_imports import lazy_import
+    from .metrics import instrument
+    from .sampling import ChapterTable, RandomSampler, SystematicSampler
+    from .sentence_segmenter import SentenceSegmenter
+    from .text_spans import ChapterView, NestedSpanList, ProcessedText, SpanList
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from lazy_imports import lazy_import
+    from metrics import instrument
+    from sampling import ChapterTable, RandomSampler, SystematicSampler
+    from sentence_segmenter import SentenceSegmenter
+    from text_spans import ChapterView, NestedSpanList, ProcessedText, SpanList
+
+# Heavy dependencies are imported on first use, so quote extraction and other
+# plain-regex methods start fast in short-lived workers
+urllib_request = lazy_import("urllib.request")
+pd = lazy_import("pandas")
+
+# Offset-based equivalents of a piece of str.split() and a RegexpTokenizer token
+WORD_PATTERN = re.compile(r"\S+")
+TOKEN_PATTERN = re.compile(r"\w+[\'\"]*|\'|\"")
+NON_SPACE_PATTERN = re.compile(r"\S")
+
+
+def _measure_processed(result):
+    return {"tokens": len(result["all_tokens"]), "sentences": len(result["sentences"]),
+            "quotes": len(result["quotes"])}
+
+
+def _measure_chapters(chapters_data):
+    return {"tokens": sum(chapter["token_count"] for chapter in chapters_data),
+            "sentences": sum(chapter["sentence_count"] for chapter in chapters_data)}
+
+
+def _measure_dialogue(dialogue):
+    return {"quotes": dialogue["quote_count"], "sentences": dialogue["total_sentence_count"]}
+
+
+def _analyze_shared_segment(cls, segmenter, shm_name, start, end):
+    """
+    Worker entry point: decode bytes [start, end) of a shared memory block and analyze them.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        text = bytes(shm.buf[start:end]).decode("utf-8")
+    finally:
+        shm.close()
+    return cls._analyze_segment(text, segmenter)
+
 
 class NLPMethods:
     """
@@ -25,25 +74,61 @@ class NLPMethods:
         r"'[^']*'",  # Unicode left/right single quotes (8216, 8217) - multiline
     ]
 
-    def __init__(self, url):
+    def __init__(self, url, source=None, segmenter=None, metrics=None):
         """
         Initialize the NLPMethods class.
+        source: optional text source with a fetch_text(url) method (e.g. GutenbergFetcher).
+        When omitted, texts are downloaded with a blocking urllib request.
+        segmenter: optional SentenceSegmenter shared by every method that splits sentences.
+        Defaults to an abbreviation-aware Punkt segmenter; SentenceSegmenter("regex")
+        restores the earlier split at every run of ".", "!" or "?".
+        metrics: optional MetricsRegistry (see metrics.py). When given, the text-processing
+        methods record calls, input bytes, tokens, sentences, quotes, latency and MB/s.
         """
-        try:
-            nltk.data.find("tokenizers/punkt")
-        except LookupError:
-            print("Downloading NLTK Punkt tokenizer...")
-            nltk.download("punkt", quiet=True)
-
         self.url = url
+        self.source = source
+        self.segmenter = segmenter if segmenter is not None else SentenceSegmenter()
+        self.metrics = metrics
+
+    def fetch_text(self, url=None):
+        """
+        Download the raw text at url (defaults to the URL given at initialization).
+        Uses the configured source when one was provided.
+        """
+        url = url or self.url
+        if self.source is not None:
+            return self.source.fetch_text(url)
+
+        with urllib_request.urlopen(url, timeout=30) as response:
+            return response.read().decode("utf-8")
 
-    def remove_gutenberg_header(self):
+    def fetch_texts(self, urls):
+        """
+        Download many raw texts. Uses the source's concurrent fetch_many when available.
+        Returns a dictionary mapping each URL to its text (None if the download failed).
+        """
+        if self.source is not None and hasattr(self.source, "fetch_many"):
+            return self.source.fetch_many(urls)
+        texts = {}
+        for url in urls:
+            try:
+                texts[url] = self.fetch_text(url)
+            except (OSError, ValueError) as e:  # URLError and timeouts are OSErrors
+                print(f"Error fetching {url}: {e}")
+                texts[url] = None
+        return texts
+
+    def remove_gutenberg_header(self, text=None):
         """
         Extract text between Gutenberg start and end markers.
         Returns only the actual book content, removing headers and footers.
+        If text is None, the text at self.url is downloaded first.
         """
-        response = urllib.request.urlopen(self.url)
-        text = response.read().decode("utf-8")
+        if text is None:
+            text = self.fetch_text()
+            if text is None:
+                print(f"Error: could not download {self.url}")
+                return None
 
         start_marker = "*** START OF THE PROJECT GUTENBERG EBOOK SIDDHARTHA ***"
         end_marker = "*** END OF THE PROJECT GUTENBERG EBOOK SIDDHARTHA ***"
@@ -59,23 +144,139 @@ class NLPMethods:
             print("Warning: Gutenberg markers not found, returning original text")
             return text
 
-    def get_processed_text(self, text):
+    @instrument(_measure_processed)
+    def get_processed_text(self, text, workers=None, min_segment_chars=1_000_000, as_spans=False, verbose=True):
         """
         Process text and return sentences, tokens, quotes, and non-quotes.
+        With workers > 1, a large text is placed in shared memory, cut at sentence
+        boundaries that no quote spans, and the segments are processed in worker
+        processes. The result is identical to the serial path.
+        min_segment_chars: smallest segment worth handing to a worker.
+        With as_spans=True, returns a ProcessedText whose fields are offset views into
+        text (materialized on access) instead of copied strings; workers is ignored.
+        verbose: print the number of quotes and the longest one (False stays silent).
         """
-        content = text
-        quotes = self.extract_quotes(content)
-        content = " ".join(content.split())
-        non_quote_content = self.remove_quotes(content)
-        sentences = re.split(r"[.!?]+", content)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        if as_spans:
+            result = self._processed_spans(text, self.segmenter)
+            quote_lengths = [end - start for start, end in result.quotes.spans()]
+            quotes = result.quotes
+        else:
+            segments = []
+            if workers and workers > 1 and len(text) >= 2 * min_segment_chars:
+                segments = self._process_parallel(text, min(workers, len(text) // min_segment_chars))
+            if not segments:
+                segments = [self._analyze_segment(text, self.segmenter)]
+            result = self._merge_segments(segments)
+            quotes = result["quotes"]
+            quote_lengths = [len(quote) for quote in quotes]
+
+        if verbose:
+            print(f"Number of quotes found: {len(quotes)}")
+            longest_quote = quotes[quote_lengths.index(max(quote_lengths))] if quotes else None
+            if longest_quote:
+                print(f"Longest dialogue instance ({len(longest_quote)} characters):")
+                print(f'"{longest_quote}"')
+            else:
+                print("No quotes found")
+
+        return result
+
+    @classmethod
+    def _processed_spans(cls, text, segmenter):
+        """
+        Build the get_processed_text result as offset views into text.
+        Sentences come from the segmenter's offsets into the raw text, as in
+        _analyze_segment; tokens are located within each sentence.
+        """
+        quote_searches = [re.compile(pattern).search for pattern in cls.QUOTE_EXTRACTION_PATTERNS]
+
+        quote_starts, quote_ends = array("q"), array("q")
+        for pattern in cls.QUOTE_EXTRACTION_PATTERNS:
+            for match in re.finditer(pattern, text, re.DOTALL):
+                start, end = match.span(1)
+                first = NON_SPACE_PATTERN.search(text, start, end)
+                if first is None:
+                    continue
+                while text[end - 1].isspace():
+                    end -= 1
+                quote_starts.append(first.start())
+                quote_ends.append(end)
+
+        # Spans left after remove_quotes, in raw text coordinates
+        quote_positions = array("q")
+        quote_kinds = []
+        for match in re.finditer(r"[\"'“”]", text):
+            quote_positions.append(match.start())
+            quote_kinds.append(match.group())
+        removed = sorted(
+            (quote_positions[open_index], quote_positions[close_index] + 1)
+            for open_index, close_index in cls._removal_pairs(quote_kinds)
+        )
+        kept_starts, kept_ends = array("q"), array("q")
+        position = 0
+        for start, end in removed:
+            if start > position:
+                kept_starts.append(position)
+                kept_ends.append(start)
+            position = max(position, end)
+        if position < len(text):
+            kept_starts.append(position)
+            kept_ends.append(len(text))
+
+        sentences = segmenter.spans(text)
+        token_starts, token_ends = array("q"), array("q")
+        token_offsets = array("q", [0])
+        quote_sentence_mask = bytearray()
+        quote_token_mask = bytearray()
+        for start, end in sentences.spans():
+            quote_sentence_mask.append(any(search(text, start, end) for search in quote_searches))
+            for token in TOKEN_PATTERN.finditer(text, start, end):
+                token_start, token_end = token.span()
+                token_starts.append(token_start)
+                token_ends.append(token_end)
+                # A token can only hold a quote if it ends with a quote character
+                quote_token_mask.append(
+                    text[token_end - 1] in "\"'" and any(search(text, token_start, token_end) for search in quote_searches)
+                )
+            token_offsets.append(len(token_starts))
+
+        return ProcessedText(
+            text,
+            sentences=SpanList(text, sentences.starts, sentences.ends, normalize=True),
+            tokenized_sentences=NestedSpanList(SpanList(text, token_starts, token_ends), token_offsets),
+            quotes=SpanList(text, quote_starts, quote_ends),
+            non_quote_spans=SpanList(text, kept_starts, kept_ends),
+            quote_sentence_mask=quote_sentence_mask,
+            quote_token_mask=quote_token_mask,
+        )
+
+    @classmethod
+    def _analyze_segment(cls, text, segmenter):
+        """
+        Run the get_processed_text analysis on one segment of text.
+        Quotes are kept per extraction pattern so segments can be merged in order.
+        Sentences are whitespace-normalized copies of the segmenter's sentences.
+        """
+        quotes_by_pattern = []
+        for pattern in cls.QUOTE_EXTRACTION_PATTERNS:
+            quotes = re.findall(pattern, text, re.DOTALL)
+            quotes_by_pattern.append([quote.strip() for quote in quotes if quote.strip()])
+
+        content = " ".join(text.split())
+        non_quote_content = content
+        for pattern in cls.QUOTE_REMOVAL_PATTERNS:
+            non_quote_content = re.sub(pattern, "", non_quote_content, flags=re.DOTALL)
+        non_quote_content = " ".join(non_quote_content.split())
+
+        sentences = [" ".join(sentence.split()) for sentence in segmenter.spans(text)]
         quote_sentences = []
         non_quote_sentences = []
+        quote_searches = [re.compile(pattern).search for pattern in cls.QUOTE_EXTRACTION_PATTERNS]
 
         for sentence in sentences:
             has_quotes = False
-            for pattern in self.QUOTE_EXTRACTION_PATTERNS:
-                if re.search(pattern, sentence):
+            for search in quote_searches:
+                if search(sentence):
                     has_quotes = True
                     break
 
@@ -84,16 +285,15 @@ class NLPMethods:
             else:
                 non_quote_sentences.append(sentence)
 
-        tokenizer = RegexpTokenizer(r"\w+[\'\"]*|\'|\"")
-        tokenized_sentences = [tokenizer.tokenize(sentence) for sentence in sentences]
+        tokenized_sentences = [TOKEN_PATTERN.findall(sentence) for sentence in sentences]
 
         all_tokens = [token for sentence in tokenized_sentences for token in sentence]
         quote_tokens = []
         non_quote_tokens = []
         for token in all_tokens:
             is_quote_token = False
-            for pattern in self.QUOTE_EXTRACTION_PATTERNS:
-                if re.search(pattern, token):
+            for search in quote_searches:
+                if search(token):
                     is_quote_token = True
                     break
 
@@ -102,19 +302,11 @@ class NLPMethods:
             else:
                 non_quote_tokens.append(token)
 
-        print(f"Number of quotes found: {len(quotes)}")
-        longest_quote = max(quotes, key=len) if quotes else None
-        if longest_quote:
-            print(f"Longest dialogue instance ({len(longest_quote)} characters):")
-            print(f'"{longest_quote}"')
-        else:
-            print("No quotes found")
-
         return {
             "sentences": sentences,
             "tokenized_sentences": tokenized_sentences,
             "all_tokens": all_tokens,
-            "quotes": quotes,
+            "quotes_by_pattern": quotes_by_pattern,
             "non_quotes": non_quote_content,
             "quote_sentences": quote_sentences,
             "non_quote_sentences": non_quote_sentences,
@@ -122,6 +314,155 @@ class NLPMethods:
             "non_quote_tokens": non_quote_tokens,
         }
 
+    @staticmethod
+    def _merge_segments(segments):
+        """
+        Merge per-segment analyses (in text order) into the get_processed_text result.
+        """
+        quotes = []
+        for pattern_index in range(len(segments[0]["quotes_by_pattern"])):
+            for segment in segments:
+                quotes.extend(segment["quotes_by_pattern"][pattern_index])
+
+        merged = {"quotes": quotes}
+        for key in ["sentences", "tokenized_sentences", "all_tokens", "quote_sentences",
+                    "non_quote_sentences", "quote_tokens", "non_quote_tokens"]:
+            merged[key] = [item for segment in segments for item in segment[key]]
+        merged["non_quotes"] = " ".join(segment["non_quotes"] for segment in segments if segment["non_quotes"])
+
+        return {
+            key: merged[key]
+            for key in ["sentences", "tokenized_sentences", "all_tokens", "quotes", "non_quotes",
+                        "quote_sentences", "non_quote_sentences", "quote_tokens", "non_quote_tokens"]
+        }
+
+    @staticmethod
+    def _pair_curly(kinds, indices):
+        """
+        Pair curly quotes the way “[^“”]*” matches: a “ directly followed, among the
+        curly quotes at indices, by a ”. Returns (open_index, close_index) pairs.
+        """
+        pairs = []
+        previous = None
+        for index in indices:
+            if kinds[index] == "”" and previous is not None and kinds[previous] == "“":
+                pairs.append((previous, index))
+            previous = index
+        return pairs
+
+    @classmethod
+    def _removal_pairs(cls, kinds):
+        """
+        Find the quote pairs that remove_quotes deletes: "..." first, then “...” in
+        what is left, then '...' in the rest.
+        kinds: the quote characters of the text in order ('"', "'", "“" or "”").
+        Returns (open_index, close_index) pairs of indices into kinds.
+        """
+        removed = [False] * len(kinds)
+        pairs = []
+
+        double_indices = [i for i, kind in enumerate(kinds) if kind == '"']
+        stage_pairs = list(zip(double_indices[0::2], double_indices[1::2]))
+        for stage in range(3):
+            if stage == 1:
+                remaining = [i for i, kind in enumerate(kinds) if kind in "“”" and not removed[i]]
+                stage_pairs = cls._pair_curly(kinds, remaining)
+            elif stage == 2:
+                remaining = [i for i, kind in enumerate(kinds) if kind == "'" and not removed[i]]
+                stage_pairs = list(zip(remaining[0::2], remaining[1::2]))
+            for open_index, close_index in stage_pairs:
+                for index in range(open_index, close_index + 1):
+                    removed[index] = True
+            pairs.extend(stage_pairs)
+        return pairs
+
+    @classmethod
+    def _unsafe_quote_gaps(cls, kinds):
+        """
+        Mark the gaps between quote characters that a segment cut must not fall into.
+        kinds: the quote characters of the text in order ('"', "'", "“" or "”").
+        Returns a list of len(kinds) + 1 flags; flag k is the gap after the first k quote
+        characters. A gap is unsafe when it lies inside a match of any extraction pattern
+        (applied to the raw text) or of the removal patterns (applied one after another).
+        """
+        unsafe = [False] * (len(kinds) + 1)
+
+        # Extraction: straight quotes pair up in order, curly quotes as in _pair_curly
+        pairs = []
+        for quote in ['"', "'"]:
+            indices = [i for i, kind in enumerate(kinds) if kind == quote]
+            pairs.extend(zip(indices[0::2], indices[1::2]))
+        pairs.extend(cls._pair_curly(kinds, [i for i, kind in enumerate(kinds) if kind in "“”"]))
+        pairs.extend(cls._removal_pairs(kinds))
+
+        for open_index, close_index in pairs:
+            for gap in range(open_index + 1, close_index + 1):
+                unsafe[gap] = True
+        return unsafe
+
+    def _segment_bounds(self, data, n_segments, window=256):
+        """
+        Choose byte offsets that cut UTF-8 encoded text into about n_segments pieces.
+        Cuts fall on whitespace right after a sentence terminator, outside every quote,
+        where the segmenter also ends a sentence (checked on the window bytes around it).
+        Returns a list of (start, end) byte ranges covering data.
+        """
+        quote_positions = []
+        quote_kinds = []
+        for match in re.finditer(rb'["\']|\xe2\x80[\x9c\x9d]', data):  # ", ', “ and ” in UTF-8
+            quote_positions.append(match.start())
+            quote_kinds.append(match.group().decode("utf-8"))
+        unsafe = self._unsafe_quote_gaps(quote_kinds)
+
+        def sentence_ends_at(cut):
+            before = data[max(0, cut - window):cut].decode("utf-8", "ignore")
+            after = data[cut:cut + window].decode("utf-8", "ignore")
+            return self.segmenter.is_boundary(before + after, len(before))
+
+        candidate = re.compile(rb"[.!?]\s")
+        bounds = []
+        start = 0
+        for i in range(1, n_segments):
+            position = max(start, len(data) * i // n_segments)
+            while True:
+                match = candidate.search(data, position)
+                if match is None:
+                    break
+                cut = match.start() + 1
+                if not unsafe[bisect.bisect_left(quote_positions, cut)] and sentence_ends_at(cut):
+                    break
+                position = cut
+            if match is None:
+                break
+            bounds.append((start, cut))
+            start = cut
+        bounds.append((start, len(data)))
+        return bounds
+
+    def _process_parallel(self, text, n_segments):
+        """
+        Process text in n_segments worker processes, sharing the text through shared memory.
+        Returns the per-segment analyses in text order, or an empty list if no cut was found.
+        """
+        data = text.encode("utf-8")
+        bounds = self._segment_bounds(data, n_segments)
+        if len(bounds) < 2:
+            return []
+
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            shm.buf[:len(data)] = data
+            with ProcessPoolExecutor(max_workers=len(bounds)) as executor:
+                futures = [
+                    executor.submit(_analyze_shared_segment, type(self), self.segmenter, shm.name, start, end)
+                    for start, end in bounds
+                ]
+                return [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    @instrument(lambda quotes: {"quotes": len(quotes)})
     def extract_quotes(self, text):
         """
         Extract anything between double quotes.
@@ -135,6 +476,7 @@ class NLPMethods:
 
         return all_quotes
 
+    @instrument()
     def remove_quotes(self, text):
         """
         Remove all quoted text from the content, leaving only narrative/non-dialogue.
@@ -148,97 +490,145 @@ class NLPMethods:
 
         return non_quote_text
 
-    def get_chapter_data(self, chapters, text):
+    @instrument(_measure_chapters)
+    def get_chapter_data(self, chapters, text, as_spans=False):
         """
         Extract chapter data from text using a list of chapter titles.
         Returns a list of dictionaries containing chapter content and length metrics.
+        With as_spans=True, returns ChapterView objects instead: they behave like the
+        dictionaries but share one copy of the text and slice "content" on access.
+        sentence_count is the number of the text's sentences (segmented once) that
+        overlap the chapter content.
+        """
+        source, located = self._locate_chapters(chapters, text)
+        chapters_data = []
+        sentences = None  # segmenter.spans(source), looked up once for all chapters
+
+        for chapter in located:
+            start, end = chapter.pop("content_start"), chapter.pop("content_end")
+            if end - start > 100:
+                if sentences is None:
+                    sentences = self.segmenter.spans(source)
+                chapter.update(
+                    {
+                        "sentence_count": self.segmenter.count(source, start, end, spans=sentences),
+                        "word_count": sum(1 for _ in WORD_PATTERN.finditer(source, start, end)),
+                        "token_count": sum(1 for _ in TOKEN_PATTERN.finditer(source, start, end)),
+                        "character_count": end - start,
+                    }
+                )
+                if as_spans:
+                    chapters_data.append(ChapterView(source, start, end, **chapter))
+                else:
+                    chapter["content"] = source[start:end]
+                    chapters_data.append(chapter)
+
+        return chapters_data
+
+    def _locate_chapters(self, chapters, text):
+        """
+        Find where each chapter's content starts and ends, as offsets into the cleaned text.
+        Returns (source, chapters) where source is the text after table-of-contents and
+        carriage-return removal, and each chapter is a dictionary with its title, number,
+        1-indexed start line, end line and content_start/content_end offsets.
         """
         # Remove table of contents by finding the dedication line
         dedication_marker = "To Romain Rolland, my dear friend"
         dedication_index = text.find(dedication_marker)
-        
+
         if dedication_index != -1:
-            # Find the start of the actual content after the dedication
-            lines = text[dedication_index:].split("\n")
-            # Skip the dedication line and any empty lines after it
-            content_start = 0
-            for i, line in enumerate(lines):
-                clean_line = line.strip().replace('\r', '')
+            # Start at the first non-empty line after the dedication line
+            content_offset = dedication_index
+            line_start = dedication_index
+            while True:
+                newline = text.find("\n", line_start)
+                line_end = newline if newline != -1 else len(text)
+                clean_line = text[line_start:line_end].strip().replace('\r', '')
                 if clean_line and clean_line != dedication_marker:
-                    content_start = i
+                    content_offset = line_start
+                    break
+                if newline == -1:
                     break
-            # Reconstruct text starting from actual content
-            text = "\n".join(lines[content_start:])
-        
+                line_start = newline + 1
+            text = text[content_offset:]
+
         # Clean up carriage returns from the text
-        text = text.replace('\r', '')
-        lines = text.split("\n")
-        chapters_data = []
+        source = text.replace('\r', '')
+        line_starts = array("q", [0])
+        line_starts.extend(match.end() for match in re.finditer("\n", source))
+        line_count = len(line_starts)
+
+        def line(index):
+            end = line_starts[index + 1] - 1 if index + 1 < line_count else len(source)
+            return source[line_starts[index]:end]
+
+        # One pass finds every line whose stripped text is a chapter title
+        titles = [title for title in dict.fromkeys(chapters) if title == title.strip()]
+        if not titles:
+            return source, []
+        title_pattern = re.compile(
+            r"^[^\S\n]*(" + "|".join(re.escape(title) for title in titles) + r")[^\S\n]*$", re.MULTILINE
+        )
+        title_lines = {}
+        heading_lines = []
         chapter_headers = ["FIRST PART", "SECOND PART"]
-
+        for match in title_pattern.finditer(source):
+            index = bisect.bisect_right(line_starts, match.start()) - 1
+            title = match.group(1)
+            title_lines.setdefault(title, []).append(index)
+            if re.match(r"^[A-Z\s]+$", title) and len(title) > 2 and title not in chapter_headers:
+                heading_lines.append(index)
+
+        located = []
         for i, chapter_title in enumerate(chapters):
             chapter_start = -1
-            for j, line in enumerate(lines):
-                if line.strip() == chapter_title:
-                    content_found = False
-                    for k in range(j + 1, min(j + 11, len(lines))):
-                        next_line = lines[k].strip()
-                        if (
-                            next_line
-                            and not re.match(r"^[A-Z\s]+$", next_line)
-                            and len(next_line) > 20
-                        ):
-                            content_found = True
-                            break
-
-                    if content_found:
-                        chapter_start = j
+            for j in title_lines.get(chapter_title, []):
+                content_found = False
+                for k in range(j + 1, min(j + 11, line_count)):
+                    next_line = line(k).strip()
+                    if (
+                        next_line
+                        and not re.match(r"^[A-Z\s]+$", next_line)
+                        and len(next_line) > 20
+                    ):
+                        content_found = True
                         break
 
+                if content_found:
+                    chapter_start = j
+                    break
+
             if chapter_start == -1:
                 continue
 
-            chapter_end = len(lines)
-            for j in range(chapter_start + 1, len(lines)):
-                next_line = lines[j].strip()
-                if re.match(r"^[A-Z\s]+$", next_line) and len(next_line) > 2:
-                    if next_line not in chapter_headers and next_line in chapters:
-                        chapter_end = j
-                        break
-
-            chapter_lines = lines[chapter_start:chapter_end]
-            content_lines = chapter_lines[1:]  # Skip the title line
-            content = "\n".join(content_lines).strip()
-
-            if len(content) > 100:
-                sentences = re.split(r"[.!?]+", content)
-                sentences = [s.strip() for s in sentences if s.strip()]
-
-                words = content.split()
-                word_count = len(words)
-
-                tokenizer = RegexpTokenizer(r"\w+[\'\"]*|\'|\"")
-                tokens = tokenizer.tokenize(content)
-                token_count = len(tokens)
-
-                char_count = len(content)
-
-                chapters_data.append(
-                    {
-                        "chapter_title": chapter_title,
-                        "chapter_number": i + 1,
-                        "start_line": chapter_start + 1,  # 1-indexed
-                        "end_line": chapter_end,
-                        "sentence_count": len(sentences),
-                        "word_count": word_count,
-                        "token_count": token_count,
-                        "character_count": char_count,
-                        "content": content,
-                    }
-                )
+            # The next chapter title (other than a part header) ends the chapter
+            next_heading = bisect.bisect_right(heading_lines, chapter_start)
+            chapter_end = heading_lines[next_heading] if next_heading < len(heading_lines) else line_count
+
+            # Content is the lines after the title line, stripped
+            content_start = content_end = 0
+            if chapter_start + 1 < chapter_end:
+                region_end = line_starts[chapter_end] - 1 if chapter_end < line_count else len(source)
+                first = NON_SPACE_PATTERN.search(source, line_starts[chapter_start + 1], region_end)
+                if first is not None:
+                    content_start, content_end = first.start(), region_end
+                    while source[content_end - 1].isspace():
+                        content_end -= 1
+
+            located.append(
+                {
+                    "chapter_title": chapter_title,
+                    "chapter_number": i + 1,
+                    "start_line": chapter_start + 1,  # 1-indexed
+                    "end_line": chapter_end,
+                    "content_start": content_start,
+                    "content_end": content_end,
+                }
+            )
 
-        return chapters_data
+        return source, located
 
+    @instrument()
     def get_chapters(self, text, shuffle=False):
         """
         Extract chapters from text using regex to find all-caps chapter titles.
@@ -265,8 +655,9 @@ class NLPMethods:
         Convert chapters data to a pandas DataFrame.
         Returns a DataFrame with chapter information.
         """
-        return pd.DataFrame(chapters_data)
+        return pd.DataFrame([dict(chapter) for chapter in chapters_data])
 
+    @instrument(_measure_dialogue)
     def get_longest_dialogue(self, text, distance_threshold=500):
         """
         Find the longest dialogue exchange (consecutive quotes) in the text.
@@ -322,15 +713,23 @@ class NLPMethods:
             "quote_count": len(longest_exchange),
             "total_character_count": len(all_content),
             "total_word_count": len(all_content.split()),
-            "total_sentence_count": len(re.split(r"[.!?]+", all_content)),
+            "total_sentence_count": self.segmenter.count(all_content),
             "exchange_content": all_content,
         }
 
-    # TODO: Create sampling classes for each sampling method
-    def get_random_sample_chapter_data(self, chapters, text, sample_size=10):
+    def get_chapter_table(self, chapters, text):
+        """
+        Compute chapter statistics once and index them for sampling.
+        Returns a ChapterTable that any sampler in sampling.py can draw from.
+        """
+        return ChapterTable(self.get_chapter_data(chapters, text))
+
+    def get_random_sample_chapter_data(self, chapters, text, sample_size=10, seed=None, table=None):
         """
         Implement random sampling to extract random chapters from the corpus.
-        Returns a list of chapter data dictionaries for the randomly selected chapters.
+        Returns a list of sample_size chapter data dictionaries, in book order.
+        seed: optional seed for a reproducible sample.
+        table: optional ChapterTable from get_chapter_table, to avoid recomputing statistics.
         """
         if len(chapters) < sample_size:
             print(
@@ -338,51 +737,24 @@ class NLPMethods:
             )
             return self.get_chapter_data(chapters, text)
 
-        random_chapters = self.get_chapters(text, True)
-
-        all_chapter_data = self.get_chapter_data(chapters, text)
+        table = table if table is not None else self.get_chapter_table(chapters, text)
+        return RandomSampler(seed).sample(table, sample_size)
 
-        random_chapter_data = [
-            chapter
-            for chapter in all_chapter_data
-            if chapter["chapter_title"] in random_chapters
-        ]
-
-        return random_chapter_data
-
-    # TODO: Create sampling classes for each sampling method
-    def get_systematic_sample_chapter_data(self, chapters, text, step_size=None, sample_size=10):
+    def get_systematic_sample_chapter_data(self, chapters, text, step_size=None, sample_size=10, seed=None,
+                                           table=None):
         """
         Implement systematic sampling to extract every nth chapter starting from a random point.
         If step_size is None, it will be calculated to get approximately sample_size chapters.
         Returns a list of chapter data dictionaries for the systematically selected chapters.
+        seed and table are as in get_random_sample_chapter_data.
+        Chapters are drawn from the table, i.e. only chapters with more than 100
+        characters of content, and the default step is computed from that count.
+        Before the table, positions were drawn over the full chapters list and
+        chapters too short for statistics were dropped afterwards, which could
+        return fewer than sample_size chapters.
         """
-        if step_size is None:
-            step_size = max(1, len(chapters) // sample_size)
-        
-        # Randomly select starting point for systematic sampling
-        # If step_size is 1, we can start from any position
-        if step_size == 1:
-            start_index = random.randint(0, len(chapters) - 1)
-        else:
-            start_index = random.randint(0, step_size - 1)
-        
-        # Select chapters using systematic sampling with random start
-        systematic_chapters = []
-        current_index = start_index
-        while current_index < len(chapters) and len(systematic_chapters) < sample_size:
-            systematic_chapters.append(chapters[current_index])
-            current_index += step_size
-
-        all_chapter_data = self.get_chapter_data(chapters, text)
-
-        systematic_chapter_data = [
-            chapter
-            for chapter in all_chapter_data
-            if chapter["chapter_title"] in systematic_chapters
-        ]
-
-        return systematic_chapter_data
+        table = table if table is not None else self.get_chapter_table(chapters, text)
+        return SystematicSampler(step_size, seed).sample(table, sample_size)
 
     def compare_sample_lengths(self, random_sample, systematic_sample):
         """
@@ -7,11 +7,29 @@ PyMuPDF is fast, reliable, and preserves formatting while handling most PDF type
 Approach: PyMuPDF only (fast, reliable, preserves formatting, handles most PDFs)
 """
 
-import pymupdf
 import re
 from pathlib import Path
-from collections import Counter
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any, Union
+
+try:
+    from .columnar_io import write_pages, write_spans
+    from .doc_classifier import DocumentTypeClassifier
+    from .edit_log import EditLog, sub as logged_sub
+    from .layout_table import SpanTable, SpanTableBuilder
+    from .lazy_imports import lazy_import
+    from .page_cache import PageCache
+    from .page_store import PageStoreWriter
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from columnar_io import write_pages, write_spans
+    from doc_classifier import DocumentTypeClassifier
+    from edit_log import EditLog, sub as logged_sub
+    from layout_table import SpanTable, SpanTableBuilder
+    from lazy_imports import lazy_import
+    from page_cache import PageCache
+    from page_store import PageStoreWriter
+
+# Imported on first PDF access, so text-only methods such as fix_ocr_errors start fast
+pymupdf = lazy_import("pymupdf")
 
 
 class OCR:
@@ -24,33 +42,53 @@ class OCR:
     - Error detection and correction
     - Quality assessment and validation
     - Document structure analysis
+    - Incremental reprocessing through a page-level cache
     """
     
-    def __init__(self):
+    # Bump when cleaning or fixing rules change, so cached page results are not reused
+    PIPELINE_VERSION = 1
+    
+    def __init__(self, classifier: Optional[DocumentTypeClassifier] = None):
         """
         Initialize the PDF processor.
+        
+        Args:
+            classifier: Document type classifier (defaults to the academic/legal keyword
+                rules, stopping once one type leads by three keywords)
         """
-        pass
+        self.classifier = classifier if classifier is not None else DocumentTypeClassifier()
         
-    def extract_text_from_pdf(self, pdf_path: str) -> Optional[List[Dict[str, Any]]]:
+    def extract_text_from_pdf(self, pdf_path: str, cache: Optional[PageCache] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Extract text from PDF using PyMuPDF.
         
         Args:
             pdf_path: Path to the PDF file
+            cache: Optional page cache; pages whose content hash is cached are not re-extracted
             
         Returns:
-            List of dictionaries containing page data, or None if extraction fails
+            List of dictionaries containing page data, or None if extraction fails.
+            With a cache, each page also carries its 'content_hash'.
         """
         print(f"Opening PDF: {pdf_path}")
         
         try:
             doc = pymupdf.open(pdf_path)
             pages_data = []
+            # Digests of objects shared between pages (fonts, images)
+            object_digests = {}
             
             for page_num in range(len(doc)):
                 page = doc.load_page(page_num)
-                text = page.get_text()
+                
+                if cache is not None:
+                    content_hash = cache.page_key(page, object_digests)
+                    text = cache.get_text(content_hash)
+                    if text is None:
+                        text = page.get_text()
+                        cache.put_text(content_hash, text)
+                else:
+                    text = page.get_text()
                 
                 page_data = {
                     'page': page_num + 1,
@@ -58,6 +96,8 @@ class OCR:
                     'char_count': len(text),
                     'word_count': len(text.split())
                 }
+                if cache is not None:
+                    page_data['content_hash'] = content_hash
                 pages_data.append(page_data)
                 
                 print(f"   Page {page_num + 1}: {len(text)} characters, {len(text.split())} words")
@@ -114,35 +154,70 @@ class OCR:
             print(f"Error extracting layout: {e}")
             return None
     
-    def analyze_document_structure(self, elements: List[Dict[str, Any]]) -> None:
+    def extract_layout_table(self, pdf_path: str,
+                             page_range: Optional[Union[Tuple[int, int], Iterable[int]]] = None) -> Optional[SpanTable]:
+        """
+        Extract every text span of a document (or a page range) into a columnar table.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            page_range: (start, stop) tuple of 0-indexed pages, an iterable of page
+                numbers, or None for every page
+            
+        Returns:
+            SpanTable with NumPy columns and dictionary-encoded fonts, or None if extraction fails
+        """
+        try:
+            doc = pymupdf.open(pdf_path)
+            if page_range is None:
+                page_numbers = range(len(doc))
+            elif isinstance(page_range, tuple) and len(page_range) == 2:
+                page_numbers = range(page_range[0], min(page_range[1], len(doc)))
+            else:
+                page_numbers = page_range
+            
+            builder = SpanTableBuilder()
+            for page_num in page_numbers:
+                page = doc.load_page(page_num)
+                builder.add_page(page_num, page.get_text("dict"))
+            
+            doc.close()
+            return builder.build()
+            
+        except Exception as e:
+            print(f"Error extracting layout table: {e}")
+            return None
+    
+    def analyze_document_structure(self, elements: Union[SpanTable, List[Dict[str, Any]]]) -> None:
         """
         Analyze document structure based on formatting elements.
         
         Args:
-            elements: List of formatted elements from extract_with_layout
+            elements: SpanTable from extract_layout_table, or list of formatted
+                elements from extract_with_layout
         """
-        if not elements:
+        if elements is None or len(elements) == 0:
             return
         
+        table = elements if isinstance(elements, SpanTable) else SpanTable.from_records(elements)
+        
         # Group by font size to identify headers
-        font_sizes = [elem['size'] for elem in elements]
-        size_counts = Counter(font_sizes)
+        sizes, counts = table.size_histogram()
         
         print("Font size distribution:")
-        for size, count in sorted(size_counts.items(), reverse=True):
+        for size, count in zip(sizes[::-1], counts[::-1]):
             print(f"   Size {size:.1f}: {count} elements")
         
         # Find likely headers (larger font sizes)
-        avg_size = sum(font_sizes) / len(font_sizes)
-        headers = [elem for elem in elements if elem['size'] > avg_size * 1.2]
+        headers = table.headers(1.2)
         
         print(f"\nLikely headers ({len(headers)} found):")
-        for header in headers[:5]:  # Show first 5
-            text_preview = header['text'][:50].replace('\n', ' ')
-            print(f"   '{text_preview}' (size: {header['size']:.1f})")
+        for text, size in zip(headers.text[:5], headers.size[:5]):  # Show first 5
+            text_preview = text[:50].replace('\n', ' ')
+            print(f"   '{text_preview}' (size: {size:.1f})")
         
         # Identify fonts used
-        fonts = set(elem['font'] for elem in elements)
+        fonts = [font for font, count in table.font_histogram().items() if count]
         print(f"\nFonts detected: {len(fonts)}")
         for font in sorted(fonts)[:5]:  # Show first 5
             print(f"   {font}")
@@ -155,35 +230,32 @@ class OCR:
             text: Document text to analyze
             
         Returns:
-            Document type: 'academic', 'legal', or 'general'
+            Document type: 'academic', 'legal', or 'general' with the default rules
+            ('unknown' for empty text)
         """
-        if not text:
-            return "unknown"
-        
-        text_lower = text.lower()
-        
-        # Academic document indicators
-        academic_keywords = ['university', 'course', 'credit', 'prerequisite', 'professor', 'department']
-        academic_score = sum(1 for keyword in academic_keywords if keyword in text_lower)
-        
-        # Legal document indicators
-        legal_keywords = ['county', 'state of', 'notary', 'acknowledged', 'sworn', 'witness']
-        legal_score = sum(1 for keyword in legal_keywords if keyword in text_lower)
+        return self.classifier.classify(text)
+    
+    def detect_document_type_from_pages(self, pages: Iterable[str]) -> str:
+        """
+        Detect document type from page texts, reading pages only until the result is decided.
         
-        if academic_score > legal_score:
-            return "academic"
-        elif legal_score > academic_score:
-            return "legal"
-        else:
-            return "general"
+        Args:
+            pages: Iterable of page texts
+            
+        Returns:
+            Document type, as for detect_document_type
+        """
+        return self.classifier.classify_pages(pages)
     
-    def clean_academic_document(self, text: str, remove_headers: bool = True) -> str:
+    def clean_academic_document(self, text: str, remove_headers: bool = True,
+                                edit_log: Optional[EditLog] = None) -> str:
         """
         Clean academic documents by removing headers, footers, and standardizing format.
         
         Args:
             text: Raw text to clean
             remove_headers: Whether to remove common headers/footers
+            edit_log: Optional edit log that records each rule's changes
             
         Returns:
             Cleaned text
@@ -191,7 +263,7 @@ class OCR:
         print("Applying academic document cleaning...")
         
         # Remove URLs
-        text = re.sub(r'http[s]?://[^\s]+', '[URL]', text)
+        text, _ = logged_sub(r'http[s]?://[^\s]+', '[URL]', text, edit_log, 'urls', 'clean')
         
         if remove_headers:
             # Remove common university headers
@@ -205,6 +277,7 @@ class OCR:
             
             lines = text.split('\n')
             filtered_lines = []
+            removed = []
             
             for line in lines:
                 line_stripped = line.strip()
@@ -225,30 +298,72 @@ class OCR:
                 
                 if not is_header:
                     filtered_lines.append(line)
+                removed.append(is_header)
             
-            text = '\n'.join(filtered_lines)
+            if edit_log is not None:
+                text = edit_log.apply(text, self._removed_line_edits(lines, removed), 'headers', 'clean')
+            else:
+                text = '\n'.join(filtered_lines)
         
         # Standardize course codes (CMPE 5220. -> CMPE 5220:)
-        text = re.sub(r'([A-Z]{2,4}\s+\d{4})\.\s*', r'\1: ', text)
+        text, _ = logged_sub(r'([A-Z]{2,4}\s+\d{4})\.\s*', r'\1: ', text, edit_log, 'course_codes', 'clean')
         
         # Clean up credit formatting
-        text = re.sub(r'(\d+)\s+Credits?\.\s*', r'\1 Credits. ', text)
+        text, _ = logged_sub(r'(\d+)\s+Credits?\.\s*', r'\1 Credits. ', text, edit_log, 'credits', 'clean')
         
         # Fix broken faculty names (often split across lines)
-        text = re.sub(r'([A-Z][a-z]+),\s*([A-Z][a-z]+);\s*', r'\1, \2; ', text)
+        text, _ = logged_sub(r'([A-Z][a-z]+),\s*([A-Z][a-z]+);\s*', r'\1, \2; ', text, edit_log, 'faculty_names', 'clean')
         
         # Remove excessive whitespace but preserve structure
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
+        text, _ = logged_sub(r'\n\s*\n\s*\n+', '\n\n', text, edit_log, 'blank_lines', 'clean')
+        text, _ = logged_sub(r' +', ' ', text, edit_log, 'spaces', 'clean')
         
-        return text.strip()
+        return edit_log.strip(text, 'clean') if edit_log is not None else text.strip()
     
-    def clean_legal_document(self, text: str) -> str:
+    @staticmethod
+    def _removed_line_edits(lines: List[str], removed: List[bool]) -> List[Tuple[int, int, str]]:
+        """
+        Turn removed lines of text.split('\\n') into deletions that give '\\n'.join(kept lines).
+        
+        Args:
+            lines: Lines of the text
+            removed: Whether each line is removed
+            
+        Returns:
+            Sorted (start, end, '') deletions in text coordinates
+        """
+        starts = []
+        position = 0
+        for line in lines:
+            starts.append(position)
+            position += len(line) + 1
+        end_of_text = position - 1
+        
+        edits = []
+        i = 0
+        while i < len(lines):
+            if not removed[i]:
+                i += 1
+                continue
+            j = i
+            while j + 1 < len(lines) and removed[j + 1]:
+                j += 1
+            if j + 1 < len(lines):
+                # Removed lines followed by a kept line: drop them with their newlines
+                edits.append((starts[i], starts[j + 1], ''))
+            else:
+                # Removed lines at the end: drop the newline before them instead
+                edits.append((max(starts[i] - 1, 0), end_of_text, ''))
+            i = j + 1
+        return edits
+    
+    def clean_legal_document(self, text: str, edit_log: Optional[EditLog] = None) -> str:
         """
         Clean legal documents by standardizing formatting.
         
         Args:
             text: Raw text to clean
+            edit_log: Optional edit log that records each rule's changes
             
         Returns:
             Cleaned text
@@ -256,20 +371,20 @@ class OCR:
         print("Applying legal document cleaning...")
         
         # Standardize legal formatting
-        text = re.sub(r'STATE\s+OF\s+([A-Z]+)\s*\)', r'STATE OF \1)', text)
-        text = re.sub(r'\)\s*\n\s*\)\s*ss:', r')\n) ss:', text)
+        text, _ = logged_sub(r'STATE\s+OF\s+([A-Z]+)\s*\)', r'STATE OF \1)', text, edit_log, 'state_of', 'clean')
+        text, _ = logged_sub(r'\)\s*\n\s*\)\s*ss:', r')\n) ss:', text, edit_log, 'venue', 'clean')
         
         # Fix date formatting
-        text = re.sub(r'(\d{1,2})\w*\s+day\s+of\s+([A-Z][a-z]+)\s*,?\s*(\d{4})',
-                      r'\1 day of \2, \3', text)
+        text, _ = logged_sub(r'(\d{1,2})\w*\s+day\s+of\s+([A-Z][a-z]+)\s*,?\s*(\d{4})',
+                             r'\1 day of \2, \3', text, edit_log, 'dates', 'clean')
         
         # Clean up signature formatting
-        text = re.sub(r'\[Signature\]', '[SIGNATURE]', text)
+        text, _ = logged_sub(r'\[Signature\]', '[SIGNATURE]', text, edit_log, 'signatures', 'clean')
         
         # Fix page references
-        text = re.sub(r'Page\s+(\d+)\s+of\s+(\d+)', r'Page \1 of \2', text)
+        text, _ = logged_sub(r'Page\s+(\d+)\s+of\s+(\d+)', r'Page \1 of \2', text, edit_log, 'page_references', 'clean')
         
-        return text.strip()
+        return edit_log.strip(text, 'clean') if edit_log is not None else text.strip()
     
     def find_ocr_errors(self, text: str) -> Tuple[Dict[str, int], List[str], List[str], List[str]]:
         """
@@ -302,12 +417,13 @@ class OCR:
         
         return errors, char_errors, broken_words, suspicious_numbers
     
-    def fix_ocr_errors(self, text: str) -> str:
+    def fix_ocr_errors(self, text: str, edit_log: Optional[EditLog] = None) -> str:
         """
         Fix common OCR errors in text.
         
         Args:
             text: Text to fix
+            edit_log: Optional edit log that records each fix's changes
             
         Returns:
             Fixed text
@@ -338,8 +454,7 @@ class OCR:
         ]
         
         for pattern, replacement in fixes:
-            before_count = len(re.findall(pattern, text))
-            text = re.sub(pattern, replacement, text)
+            text, before_count = logged_sub(pattern, replacement, text, edit_log, pattern, 'fix')
             if before_count > 0:
                 print(f"   Fixed {before_count} instances of '{pattern}' pattern")
         
@@ -431,7 +546,8 @@ class OCR:
         
         return issues, issues_with_content
     
-    def compare_versions(self, original: str, cleaned: str, fixed: str, doc_name: str) -> Dict[str, Any]:
+    def compare_versions(self, original: str, cleaned: str, fixed: str, doc_name: str,
+                         edit_log: Optional[EditLog] = None) -> Dict[str, Any]:
         """
         Compare different versions of processed text.
         
@@ -440,6 +556,9 @@ class OCR:
             cleaned: Cleaned text
             fixed: OCR-fixed text
             doc_name: Document name for reporting
+            edit_log: Optional edit log recorded while cleaning and fixing original.
+                Adds per-rule and per-page edit counts and the changed spans of the
+                original text, without diffing the versions.
             
         Returns:
             Dictionary with comparison statistics
@@ -454,20 +573,140 @@ class OCR:
         total_remaining = sum(remaining_errors.values())
         print(f"   Remaining potential errors: {total_remaining}")
         
-        return {
+        comparison = {
             'original_len': len(original),
             'cleaned_len': len(cleaned),
             'fixed_len': len(fixed),
             'remaining_errors': total_remaining
         }
+        
+        if edit_log is not None:
+            edits_by_rule = edit_log.by_rule()
+            comparison['edits'] = len(edit_log)
+            comparison['changed_chars'] = edit_log.changed_characters()
+            comparison['edits_by_rule'] = edits_by_rule
+            comparison['edits_by_page'] = edit_log.by_page()
+            comparison['change_map'] = edit_log.change_map()
+            print(f"   Edits: {len(edit_log)} ({comparison['changed_chars']} original characters changed)")
+            for rule, stats in edits_by_rule.items():
+                print(f"      • {rule}: {stats['count']}")
+        
+        return comparison
+    
+    def clean_document(self, text: str, doc_type: str, edit_log: Optional[EditLog] = None) -> str:
+        """
+        Apply the cleaning routine that matches a document type.
+        
+        Args:
+            text: Raw text to clean
+            doc_type: Document type from detect_document_type
+            edit_log: Optional edit log that records each rule's changes
+            
+        Returns:
+            Cleaned text (unchanged for general documents)
+        """
+        if doc_type == "academic":
+            return self.clean_academic_document(text, remove_headers=True, edit_log=edit_log)
+        elif doc_type == "legal":
+            return self.clean_legal_document(text, edit_log=edit_log)
+        return text
     
-    def process_pdf_complete(self, pdf_path: str, output_dir: str = "processed_pdfs") -> Dict[str, Any]:
+    def _processing_config(self, doc_type: str, edits: bool = False) -> Dict[str, Any]:
+        """Pipeline configuration that cached cleaning and fixing results depend on."""
+        config = {'pipeline_version': self.PIPELINE_VERSION, 'doc_type': doc_type}
+        if edits:
+            config['edits'] = True
+        return config
+    
+    def process_pages(self, pages_data: List[Dict[str, Any]], doc_type: str,
+                      cache: Optional[PageCache] = None,
+                      edit_log: Optional[EditLog] = None) -> Tuple[List[str], List[str]]:
+        """
+        Clean and fix each page separately, reusing cached results for unchanged pages.
+        
+        Matches that span a page boundary are not seen, so the joined pages can
+        differ from cleaning and fixing the whole document. process_pdf_complete
+        does not use this method; it always cleans and fixes the whole document.
+        
+        Args:
+            pages_data: Page dictionaries from extract_text_from_pdf
+            doc_type: Document type from detect_document_type
+            cache: Optional page cache (pages need a 'content_hash' to be cached)
+            edit_log: Optional edit log for the pages joined with newlines (see
+                page_edit_log); cached pages keep their recorded edits
+            
+        Returns:
+            Tuple of (cleaned_pages, fixed_pages)
+        """
+        config = self._processing_config(doc_type, edits=edit_log is not None)
+        cleaned_pages = []
+        fixed_pages = []
+        offset = 0
+        
+        for page in pages_data:
+            content_hash = page.get('content_hash') if cache is not None else None
+            cached = cache.get_processed(content_hash, config) if content_hash else None
+            
+            if cached is not None:
+                cleaned, fixed = cached['cleaned'], cached['fixed']
+                if edit_log is not None:
+                    edit_log.extend_records(cached['edits'], offset)
+            else:
+                page_log = EditLog(page['text']) if edit_log is not None else None
+                cleaned = self.clean_document(page['text'], doc_type, edit_log=page_log)
+                fixed = self.fix_ocr_errors(cleaned, edit_log=page_log)
+                if page_log is not None:
+                    edit_log.extend(page_log, offset)
+                if content_hash:
+                    cache.put_processed(content_hash, config, cleaned, fixed,
+                                        edits=page_log.to_records() if page_log is not None else None)
+            
+            cleaned_pages.append(cleaned)
+            fixed_pages.append(fixed)
+            offset += len(page['text']) + 1
+        
+        return cleaned_pages, fixed_pages
+    
+    @staticmethod
+    def page_edit_log(pages_data: List[Dict[str, Any]]) -> EditLog:
+        """
+        Create an edit log for the pages joined with newlines, with page boundaries.
+        
+        Args:
+            pages_data: Page dictionaries from extract_text_from_pdf
+            
+        Returns:
+            Empty edit log whose by_page() reports the pages' 'page' numbers
+        """
+        starts = []
+        offset = 0
+        for page in pages_data:
+            starts.append(offset)
+            offset += len(page['text']) + 1
+        numbers = [page.get('page', i + 1) for i, page in enumerate(pages_data)]
+        return EditLog("\n".join(page['text'] for page in pages_data), page_starts=starts, page_numbers=numbers)
+    
+    def process_pdf_complete(self, pdf_path: str, output_dir: str = "processed_pdfs",
+                             cache: Optional[PageCache] = None, save_tables: bool = False,
+                             page_store: bool = False) -> Dict[str, Any]:
         """
         Complete PDF processing pipeline using PyMuPDF exclusively.
         
         Args:
             pdf_path: Path to PDF file
             output_dir: Directory to save processed files
+            cache: Optional page cache. Unchanged pages are not extracted again, and a
+                document whose pages are all unchanged is not cleaned and fixed again.
+                Cleaning and fixing are not incremental: if any page changed, the
+                whole document is cleaned and fixed again, because rules can match
+                across page breaks. The results are the same as without a cache.
+            save_tables: Also save page statistics and layout spans as Parquet tables
+                (see columnar_io) in <output_dir>/<pdf name>_tables
+            page_store: Also save the original, cleaned and fixed text of every page to a
+                random-access page store (see page_store) at <output_dir>/<pdf name>.pages.
+                Stored pages are slices of cleaned_text and fixed_text at the page
+                breaks (see EditLog.page_spans); text edited across a page break is
+                stored with the earlier page.
             
         Returns:
             Dictionary with processing results
@@ -483,7 +722,9 @@ class OCR:
         
         # Step 1: Extract text using PyMuPDF
         print("\nStep 1: Extracting text with PyMuPDF...")
-        pages_data = self.extract_text_from_pdf(pdf_path)
+        if cache is not None:
+            hits_before, misses_before = cache.hits, cache.misses
+        pages_data = self.extract_text_from_pdf(pdf_path, cache=cache)
         
         if pages_data and any(page['text'].strip() for page in pages_data):
             # PyMuPDF extraction successful
@@ -493,21 +734,35 @@ class OCR:
             
             # Analyze document structure
             print("\nStep 2: Analyzing document structure...")
-            layout_elements = self.extract_with_layout(pdf_path, 0)
-            if layout_elements:
-                self.analyze_document_structure(layout_elements)
+            layout_table = self.extract_layout_table(pdf_path)
+            if layout_table is not None:
+                self.analyze_document_structure(layout_table)
             
             # Detect document type and clean
             print("\nStep 3: Cleaning and processing text...")
-            doc_type = self.detect_document_type(full_text)
+            doc_type = self.detect_document_type_from_pages(page['text'] for page in pages_data)
             print(f"Document detected as: {doc_type}")
             
-            if doc_type == "academic":
-                cleaned_text = self.clean_academic_document(full_text, remove_headers=True)
-            elif doc_type == "legal":
-                cleaned_text = self.clean_legal_document(full_text)
+            edit_log = self.page_edit_log(pages_data)
+            cached = None
+            if cache is not None:
+                # The whole document is cleaned and fixed at once, so results are
+                # reused only when no page changed
+                config = self._processing_config(doc_type, edits=True)
+                document_key = cache.document_key([page['content_hash'] for page in pages_data])
+                cached = cache.get_processed(document_key, config)
+            if cached is not None and 'page_spans' in cached:
+                cleaned_text, fixed_text = cached['cleaned'], cached['fixed']
+                edit_log.extend_records(cached['edits'])
+                cleaned_spans = [tuple(span) for span in cached['page_spans']['cleaned']]
+                fixed_spans = [tuple(span) for span in cached['page_spans']['fixed']]
             else:
-                cleaned_text = full_text
+                cleaned_text = self.clean_document(full_text, doc_type, edit_log=edit_log)
+                # Where each page ended up, so the page store holds slices of this result
+                cleaned_spans = edit_log.page_spans()
+                fixed_text = None
+            if cache is not None:
+                print(f"Page cache: {cache.hits - hits_before} hits, {cache.misses - misses_before} misses")
             
             # Find and fix potential errors
             print("\nStep 4: Error detection and correction...")
@@ -516,11 +771,16 @@ class OCR:
             for error_type, count in errors.items():
                 print(f"   • {error_type.replace('_', ' ').title()}: {count}")
             
-            fixed_text = self.fix_ocr_errors(cleaned_text)
+            if fixed_text is None:
+                fixed_text = self.fix_ocr_errors(cleaned_text, edit_log=edit_log)
+                fixed_spans = edit_log.page_spans()
+                if cache is not None:
+                    cache.put_processed(document_key, config, cleaned_text, fixed_text, edits=edit_log.to_records(),
+                                        page_spans={'cleaned': cleaned_spans, 'fixed': fixed_spans})
             
             # Compare versions
             print("\nStep 5: Quality assessment...")
-            comparison = self.compare_versions(full_text, cleaned_text, fixed_text, "PDF Document")
+            comparison = self.compare_versions(full_text, cleaned_text, fixed_text, "PDF Document", edit_log)
             
             # Save processed text
             output_file = output_path / f"{Path(pdf_path).stem}_processed.txt"
@@ -528,6 +788,25 @@ class OCR:
                 f.write(fixed_text)
             print(f"Saved: {output_file}")
             
+            tables_dir = None
+            if save_tables:
+                tables_dir = output_path / f"{Path(pdf_path).stem}_tables"
+                write_pages(pages_data, tables_dir)
+                if layout_table is not None:
+                    write_spans(layout_table, tables_dir)
+                print(f"Saved tables: {tables_dir}")
+            
+            store_file = None
+            if page_store:
+                store_file = output_path / f"{Path(pdf_path).stem}.pages"
+                metadata = {'source': str(pdf_path), 'doc_type': doc_type}
+                with PageStoreWriter(store_file, metadata=metadata) as writer:
+                    for page, (cleaned_start, cleaned_end), (fixed_start, fixed_end) in zip(
+                            pages_data, cleaned_spans, fixed_spans):
+                        writer.add_page(original=page['text'], cleaned=cleaned_text[cleaned_start:cleaned_end],
+                                        fixed=fixed_text[fixed_start:fixed_end])
+                print(f"Saved page store: {store_file} ({writer.deduplicated} duplicate page texts shared)")
+            
             results = {
                 'method': 'pymupdf_extraction',
                 'original_text': full_text,
@@ -537,6 +816,13 @@ class OCR:
                 'output_file': str(output_file),
                 'pages_processed': len(pages_data)
             }
+            if tables_dir is not None:
+                results['tables_dir'] = str(tables_dir)
+            if store_file is not None:
+                results['page_store'] = str(store_file)
+            if cache is not None:
+                results['cache_hits'] = cache.hits - hits_before
+                results['cache_misses'] = cache.misses - misses_before
             
         else:
             # PyMuPDF extraction failed or returned empty text
@@ -0,0 +1,223 @@
+"""
+Page-Level Content-Hash Cache for Incremental PDF Reprocessing
+
+Course catalogs are republished every semester with only a few pages changed.
+This cache keys each page by a SHA-256 hash of its content stream, page size and
+every object its resources reference (fonts, images, Form XObjects), and stores the
+extracted text for that key. Unchanged pages are served from the cache, so
+re-extracting a revised document costs only as much as its changed pages.
+
+Cleaned and OCR-fixed text is stored per pipeline configuration for whole
+documents, keyed by their page keys. Cleaning and fixing are not incremental:
+their rules can match across page breaks, so a document with any changed page is
+cleaned and fixed again in full (OCR.process_pages can store single pages, for
+callers that accept per-page results).
+
+Approach: one JSON record per content hash, sharded into subdirectories
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_REFERENCE = re.compile(r'(\d+) \d+ R\b')
+_PARENT = re.compile(r'/Parent\s+\d+ \d+ R')
+
+
+class PageCache:
+    """
+    Disk cache of per-page extraction and processing results.
+
+    Record layout (one JSON file per page or document key):
+    {
+        "text": "<extracted page text>",
+        "processed": {"<config hash>": {"cleaned": "...", "fixed": "..."}}
+    }
+    """
+
+    def __init__(self, cache_dir: str = ".page_cache"):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache records (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def page_key(page, memo: Optional[Dict[int, str]] = None) -> str:
+        """
+        Hash a PyMuPDF page's content stream, size and resources.
+
+        Resources are hashed with every object they reference, so text drawn from a
+        Form XObject, or a font or image replaced behind an unchanged content
+        stream, changes the key.
+
+        Args:
+            page: pymupdf.Page
+            memo: Optional dictionary of object digests shared by the pages of one
+                document, so shared fonts and images are hashed only once
+
+        Returns:
+            Hex digest identifying the page content
+        """
+        doc = page.parent
+        memo = {} if memo is None else memo
+        digest = hashlib.sha256()
+        digest.update(page.read_contents())
+        digest.update(repr(tuple(page.rect)).encode())
+        
+        # Resources can be inherited from the page tree
+        xref = page.xref
+        kind, value = doc.xref_get_key(xref, "Resources")
+        while kind == "null":
+            kind, parent = doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                break
+            xref = int(parent.split()[0])
+            kind, value = doc.xref_get_key(xref, "Resources")
+        digest.update(PageCache._source_digest(doc, value, memo).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _source_digest(doc, source: str, memo: Dict[int, str]) -> str:
+        """Hash a PDF object's source with the digests of the objects it references."""
+        digest = hashlib.sha256(source.encode())
+        # /Parent links lead back up the page tree, not into the resources
+        for ref in _REFERENCE.findall(_PARENT.sub("", source)):
+            digest.update(PageCache._object_digest(doc, int(ref), memo).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _object_digest(doc, xref: int, memo: Dict[int, str]) -> str:
+        if xref in memo:
+            return memo[xref]
+        memo[xref] = f"cycle:{xref}"
+        digest = hashlib.sha256(PageCache._source_digest(doc, doc.xref_object(xref, compressed=True), memo).encode())
+        if doc.xref_is_stream(xref):
+            digest.update(doc.xref_stream_raw(xref))
+        memo[xref] = digest.hexdigest()
+        return memo[xref]
+
+    @staticmethod
+    def document_key(page_keys: List[str]) -> str:
+        """
+        Hash a document's page keys in order.
+
+        Args:
+            page_keys: Page keys from page_key(), one per page
+
+        Returns:
+            Hex digest identifying the document content
+        """
+        return hashlib.sha256("\n".join(["document"] + list(page_keys)).encode()).hexdigest()
+
+    @staticmethod
+    def config_key(config: Dict[str, Any]) -> str:
+        """
+        Hash a pipeline configuration.
+
+        Args:
+            config: JSON-serializable settings that affect cleaning and fixing
+
+        Returns:
+            Short hex digest of the configuration
+        """
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, key: str, record: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Write then rename, so readers never see a partial record
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(record), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def get_text(self, key: str) -> Optional[str]:
+        """
+        Look up a page's extracted text.
+
+        Args:
+            key: Page key from page_key()
+
+        Returns:
+            Cached text, or None on a miss
+        """
+        record = self._read(key)
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record["text"]
+
+    def put_text(self, key: str, text: str) -> None:
+        """
+        Store a page's extracted text.
+
+        Args:
+            key: Page key from page_key()
+            text: Extracted text
+        """
+        record = self._read(key) or {"processed": {}}
+        record["text"] = text
+        self._write(key, record)
+
+    def get_processed(self, key: str, config: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Look up a page's or document's cleaned and fixed text for a pipeline configuration.
+
+        Args:
+            key: Page key from page_key() or document key from document_key()
+            config: Pipeline configuration
+
+        Returns:
+            Dictionary with 'cleaned' and 'fixed' text (and 'edits' and 'page_spans'
+            if they were stored), or None on a miss
+        """
+        record = self._read(key)
+        processed = record["processed"].get(self.config_key(config)) if record else None
+        if processed is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return processed
+
+    def put_processed(self, key: str, config: Dict[str, Any], cleaned: str, fixed: str,
+                      edits: Optional[List[List[Any]]] = None,
+                      page_spans: Optional[Dict[str, List[Tuple[int, int]]]] = None) -> None:
+        """
+        Store a page's or document's cleaned and fixed text for a pipeline configuration.
+
+        Args:
+            key: Page key from page_key() or document key from document_key()
+            config: Pipeline configuration
+            cleaned: Cleaned text
+            fixed: OCR-fixed text
+            edits: Optional edit records (EditLog.to_records) stored alongside the text
+            page_spans: Optional (start, end) of every page in the cleaned and fixed
+                text, keyed by "cleaned" and "fixed"
+        """
+        record = self._read(key) or {"text": None, "processed": {}}
+        processed = {"cleaned": cleaned, "fixed": fixed}
+        if edits is not None:
+            processed["edits"] = edits
+        if page_spans is not None:
+            processed["page_spans"] = page_spans
+        record["processed"][self.config_key(config)] = processed
+        self._write(key, record)
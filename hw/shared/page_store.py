@@ -0,0 +1,275 @@
+"""
+Random-Access Compressed Page Store
+
+A page store keeps the pages of one processed document in a single file, with
+several text variants per page (by default original, cleaned and fixed). Every
+distinct page text is compressed separately and stored once, so identical
+variants, such as a page that needed no cleaning, cost no extra space. A fixed-width
+index at the end of the file maps (page, variant) to a compressed blob. Readers
+memory-map the file, so fetching any page or range of pages touches only those
+blobs and takes constant time regardless of document size.
+
+File layout (little-endian):
+    b"PGSTORE\\x01"
+    compressed blobs (zlib), padded to 8 bytes
+    blob table: n_blobs x (offset uint64, compressed length uint64)
+    page index: n_pages x n_variants uint32 blob ids (MISSING_BLOB when absent), padded to 8 bytes
+    metadata: UTF-8 JSON with the variant names and user metadata
+    footer: b"PGSTEND\\x01", n_pages, n_variants, n_blobs, blob table offset,
+            page index offset, metadata offset (uint64 each)
+
+Approach: per-page zlib blobs + content-hash dedup + mmap'd offset index
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+
+HEADER_MAGIC = b"PGSTORE\x01"
+FOOTER_MAGIC = b"PGSTEND\x01"
+FOOTER = struct.Struct("<8s6Q")
+MISSING_BLOB = 0xFFFFFFFF
+DEFAULT_VARIANTS = ("original", "cleaned", "fixed")
+
+
+def _pad(f) -> None:
+    """Pad the file to a multiple of 8 bytes so the tables can be viewed as uint64."""
+    remainder = f.tell() % 8
+    if remainder:
+        f.write(b"\0" * (8 - remainder))
+
+
+class PageStoreWriter:
+    """
+    Writes a page store file one page at a time.
+
+    Usage:
+        with PageStoreWriter("doc.pages") as writer:
+            writer.add_page(original=raw, cleaned=cleaned, fixed=fixed)
+    """
+
+    def __init__(self, path: Union[str, Path], variants: Sequence[str] = DEFAULT_VARIANTS,
+                 level: int = 6, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Output file; written to a temporary file and renamed on close
+            variants: Names of the text variants stored per page
+            level: zlib compression level
+            metadata: JSON-serializable metadata stored with the pages
+        """
+        self.path = Path(path)
+        self.variants = list(variants)
+        self.level = level
+        self.metadata = dict(metadata or {})
+
+        self._tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(HEADER_MAGIC)
+        self._blob_table = array("Q")
+        self._blob_ids: Dict[bytes, int] = {}
+        self._index = array("I")
+        self.raw_bytes = 0
+        self.deduplicated = 0
+
+    def __enter__(self) -> "PageStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            self._tmp_path.unlink(missing_ok=True)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._index) // len(self.variants)
+
+    def _blob(self, text: Optional[str]) -> int:
+        if text is None:
+            return MISSING_BLOB
+        data = text.encode("utf-8")
+        self.raw_bytes += len(data)
+        digest = hashlib.sha256(data).digest()
+        blob_id = self._blob_ids.get(digest)
+        if blob_id is not None:
+            self.deduplicated += 1
+            return blob_id
+
+        compressed = zlib.compress(data, self.level)
+        blob_id = len(self._blob_table) // 2
+        self._blob_table.extend((self._file.tell(), len(compressed)))
+        self._file.write(compressed)
+        self._blob_ids[digest] = blob_id
+        return blob_id
+
+    def add_page(self, texts: Optional[Dict[str, Optional[str]]] = None, **kwargs: Optional[str]) -> int:
+        """
+        Add one page.
+
+        Args:
+            texts: Mapping of variant name to page text (variants left out are stored as missing)
+            **kwargs: Variant texts given as keyword arguments
+
+        Returns:
+            Index of the page
+        """
+        texts = {**(texts or {}), **kwargs}
+        unknown = set(texts) - set(self.variants)
+        if unknown:
+            raise ValueError(f"Unknown page variants: {sorted(unknown)}")
+        self._index.extend(self._blob(texts.get(variant)) for variant in self.variants)
+        return self.page_count - 1
+
+    def close(self) -> Path:
+        """
+        Write the tables and footer and move the file into place.
+
+        Returns:
+            Path of the page store
+        """
+        f = self._file
+        _pad(f)
+        blob_table_offset = f.tell()
+        self._blob_table.tofile(f)
+        index_offset = f.tell()
+        self._index.tofile(f)
+        _pad(f)
+        metadata_offset = f.tell()
+        f.write(json.dumps({"variants": self.variants, "metadata": self.metadata}).encode("utf-8"))
+        f.write(FOOTER.pack(FOOTER_MAGIC, self.page_count, len(self.variants), len(self._blob_table) // 2,
+                            blob_table_offset, index_offset, metadata_offset))
+        f.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+
+class PageStore:
+    """
+    Memory-mapped reader for page store files.
+
+    Usage:
+        with PageStore("doc.pages") as store:
+            store.page(12)                          # fixed text of page 12 (0-indexed)
+            store.pages(10, 20, variant="original")
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a page store.
+
+        Args:
+            path: Page store file
+
+        Raises:
+            ValueError: If the file is not a page store
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._mmap[:len(HEADER_MAGIC)] != HEADER_MAGIC or len(self._mmap) < len(HEADER_MAGIC) + FOOTER.size:
+                raise ValueError(f"{self.path} is not a page store")
+            (magic, self._page_count, variant_count, blob_count, blob_table_offset, index_offset,
+             metadata_offset) = FOOTER.unpack_from(self._mmap, len(self._mmap) - FOOTER.size)
+            if magic != FOOTER_MAGIC:
+                raise ValueError(f"{self.path} is not a complete page store")
+        except ValueError:
+            self.close()
+            raise
+
+        info = json.loads(self._mmap[metadata_offset:len(self._mmap) - FOOTER.size].decode("utf-8"))
+        self.variants: List[str] = info["variants"]
+        self.metadata: Dict[str, Any] = info["metadata"]
+        self._variant_index = {variant: i for i, variant in enumerate(self.variants)}
+
+        view = memoryview(self._mmap)
+        self._blobs = view[blob_table_offset:blob_table_offset + blob_count * 16].cast("Q")
+        self._index = view[index_offset:index_offset + self._page_count * variant_count * 4].cast("I")
+        view.release()
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._page_count
+
+    def close(self) -> None:
+        """Release the memory map and close the file."""
+        for name in ("_blobs", "_index"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def _blob_id(self, index: int, variant: str) -> int:
+        if not 0 <= index < self._page_count:
+            raise IndexError(f"page {index} out of range (0-{self._page_count - 1})")
+        try:
+            variant_index = self._variant_index[variant]
+        except KeyError:
+            raise KeyError(f"Unknown variant {variant!r}; available: {self.variants}") from None
+        return self._index[index * len(self.variants) + variant_index]
+
+    def page(self, index: int, variant: str = "fixed") -> Optional[str]:
+        """
+        Fetch one page.
+
+        Args:
+            index: Page index (0-indexed)
+            variant: Text variant
+
+        Returns:
+            Page text, or None if the variant was not stored for this page
+        """
+        blob_id = self._blob_id(index, variant)
+        if blob_id == MISSING_BLOB:
+            return None
+        offset, length = self._blobs[2 * blob_id], self._blobs[2 * blob_id + 1]
+        return zlib.decompress(self._mmap[offset:offset + length]).decode("utf-8")
+
+    def pages(self, start: int = 0, stop: Optional[int] = None, variant: str = "fixed") -> List[Optional[str]]:
+        """
+        Fetch the pages [start, stop).
+
+        Args:
+            start: First page (0-indexed)
+            stop: One past the last page (defaults to the end)
+            variant: Text variant
+
+        Returns:
+            List of page texts
+        """
+        stop = self._page_count if stop is None else min(stop, self._page_count)
+        return [self.page(index, variant) for index in range(start, stop)]
+
+    def text(self, variant: str = "fixed", separator: str = "\n") -> str:
+        """
+        Join every page of a variant.
+
+        Args:
+            variant: Text variant
+            separator: String placed between pages
+
+        Returns:
+            Full document text
+        """
+        return separator.join(page or "" for page in self.pages(variant=variant))
+
+    def blob_count(self) -> int:
+        """Number of distinct compressed page texts in the file."""
+        return len(self._blobs) // 2
@@ -0,0 +1,548 @@
+"""
+Lazy, Memoized DAG Pipeline from PDFs to NLP Analysis
+
+Pipeline declares processing steps as nodes. Each node has a function, named
+inputs from earlier nodes and parameters, and results are content-addressed.
+A node's recipe key hashes its name, its function (code, defaults and closure
+values), version and parameters together with the content hashes of its input
+values. Its result is stored under the
+hash of its own output. Running a target therefore:
+
+- computes only the nodes the target depends on (lazy evaluation);
+- skips every node whose recipe was computed before (memoization, optionally on
+  disk so it survives restarts);
+- reruns only the nodes downstream of a changed parameter or input file, and
+  stops early when a rerun node produces the same output as before;
+- runs nodes whose inputs are ready at the same time on a thread or process pool.
+
+pdf_pipeline connects OCR.process_pdf_complete to get_processed_text,
+get_chapters, get_chapter_data and extract_quotes.
+
+Approach: recipe key = sha256(name, function, version, params, input content hashes)
+          -> recipe store -> output content hash -> object store (memory + pickle files)
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import threading
+import types
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    from .nlp_methods import NLPMethods
+    from .ocr import OCR
+    from .sentence_segmenter import SentenceSegmenter
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from nlp_methods import NLPMethods
+    from ocr import OCR
+    from sentence_segmenter import SentenceSegmenter
+
+
+class PipelineError(Exception):
+    """Raised when a node fails; the node's exception is chained."""
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_hash(value: Any) -> str:
+    """
+    Hash a value by its pickled content.
+
+    Args:
+        value: Any picklable value
+
+    Returns:
+        Hex sha256 digest
+    """
+    return _sha256(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _value_identity(value: Any) -> str:
+    try:
+        return content_hash(value)
+    except Exception:  # unpicklable values (locks, lambdas) are only stable within a process
+        return repr(value)
+
+
+def _code_identity(code: types.CodeType) -> Tuple:
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            consts.append(_code_identity(const))
+        elif isinstance(const, frozenset):
+            consts.append(sorted(map(repr, const)))
+        else:
+            consts.append(repr(const))
+    return code.co_name, code.co_code.hex(), consts, code.co_names
+
+
+def function_hash(func: Callable) -> str:
+    """
+    Hash a function by its code, defaults and closure values.
+
+    Different lambdas, and closures made by one factory with different values,
+    get different hashes. Callables without Python code (builtins, callable
+    objects) are identified by name.
+
+    Args:
+        func: Function, bound method or functools.partial
+
+    Returns:
+        Hex sha256 digest
+    """
+    if isinstance(func, functools.partial):
+        parts = (function_hash(func.func), _value_identity(func.args), _value_identity(sorted(func.keywords.items())))
+        return _sha256(repr(parts).encode("utf-8"))
+    target = getattr(func, "__func__", func)
+    # Last module component only, so "hw.shared.x" and "x" imports share results
+    name = f"{getattr(target, '__module__', '').rsplit('.', 1)[-1]}.{getattr(target, '__qualname__', repr(target))}"
+    code = getattr(target, "__code__", None)
+    if code is None:
+        return _sha256(name.encode("utf-8"))
+    closure = []
+    for cell in target.__closure__ or ():
+        try:
+            closure.append(_value_identity(cell.cell_contents))
+        except ValueError:  # empty cell
+            closure.append(None)
+    parts = (name, _code_identity(code), _value_identity(target.__defaults__),
+             _value_identity(target.__kwdefaults__), closure)
+    if target is not func:
+        parts += (_value_identity(func.__self__),)
+    return _sha256(repr(parts).encode("utf-8"))
+
+
+def file_hash(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Hash a file's bytes.
+
+    Args:
+        path: File path
+        chunk_size: Bytes read at a time
+
+    Returns:
+        Hex sha256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Node:
+    """One pipeline step: a value, an input file, or a function of other nodes."""
+
+    def __init__(self, name: str, kind: str, func: Optional[Callable] = None,
+                 inputs: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None,
+                 version: Union[int, str] = 1, value: Any = None,
+                 check: Optional[Callable[[Any], bool]] = None):
+        self.name = name
+        self.kind = kind            # "value", "file" or "task"
+        self.func = func
+        self.inputs = dict(inputs or {})
+        self.params = dict(params or {})
+        self.version = version
+        self.value = value
+        self.check = check
+
+    def __repr__(self) -> str:
+        return f"Node({self.name!r}, {self.kind}, inputs={self.inputs}, params={self.params})"
+
+
+def _call(func: Callable, kwargs: Dict[str, Any]) -> Any:
+    """Run a node function (module-level so process pools can pickle it)."""
+    return func(**kwargs)
+
+
+class Pipeline:
+    """
+    Declarative DAG of memoized steps, evaluated lazily and in parallel.
+
+    Usage:
+        pipeline = Pipeline(cache_dir=".pipeline_cache", workers=4)
+        pipeline.file("pdf", "catalog.pdf")
+        pipeline.node("ocr", run_ocr, inputs={"pdf_path": "pdf"})
+        pipeline.node("text", select_fixed_text, inputs={"results": "ocr"})
+        pipeline.get("text")
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, workers: int = 4,
+                 processes: bool = False):
+        """
+        Initialize an empty pipeline.
+
+        Args:
+            cache_dir: Directory for the recipe and object stores (None keeps results
+                in memory only)
+            workers: Nodes run at the same time
+            processes: Run nodes in worker processes instead of threads (node functions
+                must then be module-level functions)
+        """
+        self.nodes: Dict[str, Node] = {}
+        self.workers = workers
+        self.processes = processes
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            (self.cache_dir / "recipes").mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / "objects").mkdir(parents=True, exist_ok=True)
+
+        self._recipes: Dict[str, str] = {}      # recipe key -> output content hash
+        self._objects: Dict[str, Any] = {}      # content hash -> value
+        self._file_hashes: Dict[Tuple[str, int, int], str] = {}
+        self.executed: List[str] = []           # nodes computed by the last run
+        self.reused: List[str] = []             # task nodes served from memoized results
+
+    # Declaration
+
+    def _add(self, node: Node) -> "Pipeline":
+        missing = [source for source in node.inputs.values() if source not in self.nodes]
+        if missing:
+            raise KeyError(f"node {node.name!r} uses undeclared inputs {missing}")
+        self.nodes[node.name] = node
+        return self
+
+    def value(self, name: str, value: Any) -> "Pipeline":
+        """
+        Declare (or replace) a constant input.
+
+        Args:
+            name: Node name
+            value: Picklable value
+
+        Returns:
+            The pipeline
+        """
+        return self._add(Node(name, "value", value=value))
+
+    def file(self, name: str, path: Union[str, Path]) -> "Pipeline":
+        """
+        Declare an input file; its value is the path, its content hash is the file's.
+
+        Args:
+            name: Node name
+            path: File path (re-hashed when its size or modification time changes)
+
+        Returns:
+            The pipeline
+        """
+        return self._add(Node(name, "file", value=str(path)))
+
+    def node(self, name: str, func: Callable, inputs: Optional[Dict[str, str]] = None,
+             params: Optional[Dict[str, Any]] = None, version: Union[int, str] = 1,
+             check: Optional[Callable[[Any], bool]] = None) -> "Pipeline":
+        """
+        Declare (or replace) a computed node.
+
+        Args:
+            name: Node name
+            func: Function called as func(**inputs, **params)
+            inputs: Argument name -> name of an already declared node
+            params: Keyword arguments, part of the recipe key (JSON-serializable)
+            version: Bump when code that func calls changes, so earlier results are
+                not reused (changes to func itself are detected)
+            check: Called with a memoized result before it is reused; returning
+                False reruns the node (for example when files it wrote are gone)
+
+        Returns:
+            The pipeline
+        """
+        return self._add(Node(name, "task", func=func, inputs=inputs, params=params, version=version,
+                              check=check))
+
+    def set_params(self, name: str, **params: Any) -> "Pipeline":
+        """
+        Update some parameters of a node; only it and its dependents rerun.
+
+        Args:
+            name: Node name
+            **params: Parameters to change
+
+        Returns:
+            The pipeline
+        """
+        self.nodes[name].params.update(params)
+        return self
+
+    def dependencies(self, targets: Iterable[str]) -> List[str]:
+        """
+        Nodes needed for the targets, in declaration (topological) order.
+
+        Args:
+            targets: Node names
+
+        Returns:
+            Node names
+        """
+        needed: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.nodes:
+                raise KeyError(f"unknown node {name!r}")
+            needed.add(name)
+            stack.extend(self.nodes[name].inputs.values())
+        return [name for name in self.nodes if name in needed]
+
+    # Stores
+
+    def _recipe_key(self, node: Node, hashes: Dict[str, str]) -> str:
+        recipe = {
+            "node": node.name,
+            "function": function_hash(node.func),
+            "version": node.version,
+            "params": node.params,
+            "inputs": {argument: hashes[source] for argument, source in sorted(node.inputs.items())},
+        }
+        return _sha256(json.dumps(recipe, sort_keys=True, default=repr).encode("utf-8"))
+
+    def _lookup(self, recipe: str) -> Optional[str]:
+        output = self._recipes.get(recipe)
+        if output is None and self.cache_dir is not None:
+            path = self.cache_dir / "recipes" / f"{recipe}.json"
+            if path.exists():
+                stored = json.loads(path.read_text())["output"]
+                if (self.cache_dir / "objects" / f"{stored}.pkl").exists():
+                    output = self._recipes[recipe] = stored
+        return output
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _store(self, recipe: Optional[str], name: str, value: Any) -> str:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        output = _sha256(data)
+        self._objects[output] = value
+        if recipe is not None:
+            self._recipes[recipe] = output
+        if self.cache_dir is not None:
+            object_path = self.cache_dir / "objects" / f"{output}.pkl"
+            if not object_path.exists():
+                self._write_atomic(object_path, data)
+            if recipe is not None:
+                self._write_atomic(self.cache_dir / "recipes" / f"{recipe}.json",
+                                   json.dumps({"node": name, "output": output}).encode("utf-8"))
+        return output
+
+    def _load(self, output: str) -> Any:
+        if output not in self._objects:
+            with open(self.cache_dir / "objects" / f"{output}.pkl", "rb") as f:
+                self._objects[output] = pickle.load(f)
+        return self._objects[output]
+
+    def _source_hash(self, node: Node) -> str:
+        if node.kind == "file":
+            stat = os.stat(node.value)
+            key = (node.value, stat.st_size, stat.st_mtime_ns)
+            if key not in self._file_hashes:
+                self._file_hashes[key] = file_hash(node.value)
+            digest = self._file_hashes[key]
+            self._objects[digest] = node.value
+            return digest
+        digest = content_hash(node.value)
+        self._objects[digest] = node.value
+        return digest
+
+    # Evaluation
+
+    def run(self, *targets: str) -> Dict[str, Any]:
+        """
+        Compute the targets, reusing memoized results.
+
+        Args:
+            *targets: Node names
+
+        Returns:
+            Dictionary mapping each target to its value
+
+        Raises:
+            PipelineError: If a node function raises
+        """
+        order = self.dependencies(targets)
+        hashes: Dict[str, str] = {}
+        running: Dict[Future, Tuple[str, str]] = {}
+        waiting = list(order)
+        self.executed, self.reused = [], []
+
+        executor_class = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        executor: Optional[Executor] = None
+        try:
+            while waiting or running:
+                # Resolve or submit every node whose inputs are ready
+                still_waiting = []
+                for name in waiting:
+                    node = self.nodes[name]
+                    if any(source not in hashes for source in node.inputs.values()):
+                        still_waiting.append(name)
+                        continue
+                    if node.kind != "task":
+                        hashes[name] = self._source_hash(node)
+                        continue
+                    recipe = self._recipe_key(node, hashes)
+                    output = self._lookup(recipe)
+                    if output is not None and node.check is not None and not node.check(self._load(output)):
+                        output = None
+                    if output is not None:
+                        hashes[name] = output
+                        self.reused.append(name)
+                        continue
+                    if executor is None:
+                        executor = executor_class(max_workers=self.workers)
+                    kwargs = {argument: self._load(hashes[source]) for argument, source in node.inputs.items()}
+                    kwargs.update(node.params)
+                    running[executor.submit(_call, node.func, kwargs)] = (name, recipe)
+                if len(still_waiting) < len(waiting):
+                    waiting = still_waiting
+                    continue
+                waiting = still_waiting
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, recipe = running.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as error:
+                        raise PipelineError(f"node {name!r} failed: {error}") from error
+                    hashes[name] = self._store(recipe, name, value)
+                    self.executed.append(name)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return {target: self._load(hashes[target]) for target in targets}
+
+    def get(self, target: str) -> Any:
+        """
+        Compute one target.
+
+        Args:
+            target: Node name
+
+        Returns:
+            The node's value
+        """
+        return self.run(target)[target]
+
+
+# Node functions connecting OCR to NLPMethods (module-level, so process pools can run them)
+
+# One NLPMethods per thread and segmenter mode: their caches are not shared across threads
+_local = threading.local()
+
+
+def _nlp(segmenter_mode: str) -> NLPMethods:
+    instances = _local.__dict__.setdefault("nlp", {})
+    if segmenter_mode not in instances:
+        instances[segmenter_mode] = NLPMethods(None, segmenter=SentenceSegmenter(segmenter_mode))
+    return instances[segmenter_mode]
+
+
+def run_ocr(pdf_path: str, output_dir: str = "processed_pdfs", page_store: bool = False) -> Dict[str, Any]:
+    """
+    Process a PDF with OCR.process_pdf_complete.
+
+    The node is memoized on the PDF's content and the parameters, not on the files
+    it writes to output_dir. pdf_pipeline reruns it when one of those files is
+    missing (see ocr_outputs_exist), but a file edited after it was written is
+    not restored.
+    """
+    return OCR().process_pdf_complete(pdf_path, output_dir=output_dir, page_store=page_store)
+
+
+def ocr_outputs_exist(results: Dict[str, Any]) -> bool:
+    """Whether the files and directories listed in run_ocr results are all still present."""
+    return all(os.path.exists(results[key]) for key in ("output_file", "tables_dir", "page_store") if key in results)
+
+
+def select_text(results: Dict[str, Any], field: str = "fixed_text") -> str:
+    """Pick the text handed to the NLP steps from OCR results."""
+    return results.get(field) or ""
+
+
+def processed_text(text: str, segmenter_mode: str = "punkt") -> Dict[str, Any]:
+    """get_processed_text of a text."""
+    return _nlp(segmenter_mode).get_processed_text(text)
+
+
+def find_chapters(text: str, titles: Optional[List[str]] = None) -> List[str]:
+    """Chapter titles: the given list, or get_chapters of the text."""
+    return list(titles) if titles else _nlp("regex").get_chapters(text)
+
+
+def chapter_data(text: str, chapters: List[str], segmenter_mode: str = "punkt") -> List[Dict[str, Any]]:
+    """get_chapter_data of a text."""
+    return _nlp(segmenter_mode).get_chapter_data(chapters, text)
+
+
+def quotes(text: str) -> List[str]:
+    """extract_quotes of a text."""
+    return _nlp("regex").extract_quotes(text)
+
+
+def add_text_analysis(pipeline: Pipeline, text: str = "text", segmenter_mode: str = "punkt",
+                      chapter_titles: Optional[List[str]] = None) -> Pipeline:
+    """
+    Add the NLPMethods nodes that read a text node.
+
+    Nodes: "processed" (get_processed_text), "chapters" (get_chapters or the given
+    titles), "chapter_data" (get_chapter_data) and "quotes" (extract_quotes).
+
+    Args:
+        pipeline: Pipeline with a text node
+        text: Name of the text node
+        segmenter_mode: SentenceSegmenter mode for sentence-based steps
+        chapter_titles: Chapter titles to use instead of detecting them
+
+    Returns:
+        The pipeline
+    """
+    pipeline.node("processed", processed_text, inputs={"text": text}, params={"segmenter_mode": segmenter_mode})
+    pipeline.node("chapters", find_chapters, inputs={"text": text}, params={"titles": chapter_titles})
+    pipeline.node("chapter_data", chapter_data, inputs={"text": text, "chapters": "chapters"},
+                  params={"segmenter_mode": segmenter_mode})
+    pipeline.node("quotes", quotes, inputs={"text": text})
+    return pipeline
+
+
+def pdf_pipeline(pdf_path: Union[str, Path], output_dir: str = "processed_pdfs",
+                 cache_dir: Optional[Union[str, Path]] = ".pipeline_cache", workers: int = 4,
+                 segmenter_mode: str = "punkt", chapter_titles: Optional[List[str]] = None,
+                 text_field: str = "fixed_text") -> Pipeline:
+    """
+    Build the PDF-to-analysis pipeline.
+
+    Nodes: "pdf" (input file) -> "ocr" (process_pdf_complete results) -> "text"
+    (the chosen text field) -> the add_text_analysis nodes.
+
+    Args:
+        pdf_path: PDF to process
+        output_dir: process_pdf_complete output directory
+        cache_dir: Directory for memoized results (None keeps them in memory only)
+        workers: Nodes run at the same time
+        segmenter_mode: SentenceSegmenter mode for sentence-based steps
+        chapter_titles: Chapter titles to use instead of detecting them
+        text_field: OCR result field analyzed ("fixed_text", "cleaned_text" or "original_text")
+
+    Returns:
+        Pipeline; call run("chapter_data", "processed") or get(...) to evaluate
+    """
+    pipeline = Pipeline(cache_dir=cache_dir, workers=workers)
+    pipeline.file("pdf", pdf_path)
+    pipeline.node("ocr", run_ocr, inputs={"pdf_path": "pdf"}, params={"output_dir": str(output_dir)},
+                  check=ocr_outputs_exist)
+    pipeline.node("text", select_text, inputs={"results": "ocr"}, params={"field": text_field})
+    return add_text_analysis(pipeline, "text", segmenter_mode, chapter_titles)
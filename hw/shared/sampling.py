@@ -0,0 +1,410 @@
+"""
+Chapter Sampling over a Precomputed Chapter Table
+
+Chapter statistics are computed once (get_chapter_data) and held in a
+ChapterTable: numeric columns as numpy arrays plus cached prefix sums. Samplers
+draw chapter indices from the table, so a draw costs O(k) (O(k log n) for
+size-weighted draws) instead of reparsing the text, and many seeded draws can
+be made in one batch.
+
+Samplers:
+    RandomSampler       simple random sampling without replacement
+    SystematicSampler   every step-th chapter from a random start
+    StratifiedSampler   random sampling within length buckets (quantiles of a column)
+    PPSSampler          probability proportional to size (e.g. token_count)
+
+Approach: chapter records -> column arrays + prefix sums -> numpy Generator draws
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+try:
+    from .lazy_imports import lazy_import
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+NUMERIC_COLUMNS = ["chapter_number", "start_line", "end_line", "sentence_count",
+                   "word_count", "token_count", "character_count"]
+
+
+class ChapterTable:
+    """
+    Indexed chapter statistics for sampling.
+
+    Records keep their book order; numeric columns are int64 arrays and their
+    prefix sums are computed on first use.
+    """
+
+    def __init__(self, chapters_data: Iterable[Mapping[str, Any]]):
+        """
+        Initialize the table.
+
+        Args:
+            chapters_data: Chapter records from get_chapter_data (dictionaries or ChapterViews)
+        """
+        self.records = list(chapters_data)
+        self.titles = [record["chapter_title"] for record in self.records]
+        self.columns = {
+            column: np.fromiter((record[column] for record in self.records), dtype=np.int64,
+                                count=len(self.records))
+            for column in NUMERIC_COLUMNS
+            if all(column in record for record in self.records)
+        }
+        self._prefix: Dict[str, Any] = {}
+        self._strata: Dict[tuple, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, name: str):
+        """
+        Return a numeric column.
+
+        Args:
+            name: Column name, e.g. "token_count"
+
+        Returns:
+            int64 array with one value per chapter
+        """
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise KeyError(f"Unknown numeric column {name!r}; available: {sorted(self.columns)}") from None
+
+    def prefix(self, name: str):
+        """
+        Return the prefix sums of a column (length len(table) + 1, starting at 0).
+
+        Args:
+            name: Column name
+
+        Returns:
+            int64 array; prefix[j] - prefix[i] is the column total of chapters i..j-1
+        """
+        if name not in self._prefix:
+            prefix = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(self.column(name), out=prefix[1:])
+            self._prefix[name] = prefix
+        return self._prefix[name]
+
+    def range_total(self, name: str, start: int, stop: int) -> int:
+        """
+        Total of a column over chapters [start, stop) in O(1).
+
+        Args:
+            name: Column name
+            start: First chapter index
+            stop: One past the last chapter index
+
+        Returns:
+            Column total
+        """
+        prefix = self.prefix(name)
+        return int(prefix[stop] - prefix[start])
+
+    def strata(self, name: str, n_strata: int) -> List[Any]:
+        """
+        Split the chapters into length buckets at the quantiles of a column.
+
+        Args:
+            name: Column to bucket by
+            n_strata: Number of buckets
+
+        Returns:
+            List of index arrays, shortest bucket first (empty buckets are dropped)
+        """
+        key = (name, n_strata)
+        if key not in self._strata:
+            order = np.argsort(self.column(name), kind="stable")
+            self._strata[key] = [bucket for bucket in np.array_split(order, n_strata) if len(bucket)]
+        return self._strata[key]
+
+    def select(self, indices: Iterable[int]) -> List[Mapping[str, Any]]:
+        """
+        Return the records at the given indices.
+
+        Args:
+            indices: Chapter indices
+
+        Returns:
+            List of chapter records
+        """
+        return [self.records[i] for i in indices]
+
+
+class Sampler(ABC):
+    """
+    Abstract base class for chapter samplers.
+
+    Subclasses implement _draw(table, k), returning k chapter indices for one
+    draw, and may override _draw_batch for vectorized batches.
+    """
+
+    def __init__(self, seed: Union[int, "np.random.Generator", None] = None):
+        """
+        Initialize the sampler.
+
+        Args:
+            seed: Seed or numpy Generator; draws are reproducible for a given seed
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def _check(self, table: ChapterTable, k: int) -> int:
+        if k < 0:
+            raise ValueError("sample size must be non-negative")
+        if k > len(table):
+            print(f"Warning: Only {len(table)} chapters available, sampling all of them")
+            return len(table)
+        return k
+
+    @abstractmethod
+    def _draw(self, table: ChapterTable, k: int):
+        """Return k chapter indices for one draw."""
+
+    def _draw_batch(self, table: ChapterTable, k: int, n_draws: int):
+        return np.stack([self._draw(table, k) for _ in range(n_draws)]) if n_draws else np.zeros((0, k), np.int64)
+
+    def sample_indices(self, table: ChapterTable, k: int):
+        """
+        Draw one sample.
+
+        Args:
+            table: Chapter table
+            k: Sample size
+
+        Returns:
+            Sorted int64 array of chapter indices
+        """
+        k = self._check(table, k)
+        return np.sort(self._draw(table, k))
+
+    def sample(self, table: ChapterTable, k: int) -> List[Mapping[str, Any]]:
+        """
+        Draw one sample of chapter records, in book order.
+
+        Args:
+            table: Chapter table
+            k: Sample size
+
+        Returns:
+            List of chapter records
+        """
+        return table.select(self.sample_indices(table, k))
+
+    def sample_batch(self, table: ChapterTable, k: int, n_draws: int):
+        """
+        Draw many independent samples at once.
+
+        Args:
+            table: Chapter table
+            k: Sample size
+            n_draws: Number of samples
+
+        Returns:
+            (n_draws, k) int64 array; each row is sorted
+        """
+        k = self._check(table, k)
+        return np.sort(self._draw_batch(table, k, n_draws), axis=1)
+
+    def sample_means(self, table: ChapterTable, k: int, n_draws: int, column: str = "token_count"):
+        """
+        Mean of a column in each of n_draws samples, e.g. to study sampling variability.
+
+        Args:
+            table: Chapter table
+            k: Sample size
+            n_draws: Number of samples
+            column: Column to average
+
+        Returns:
+            Array of n_draws means
+        """
+        indices = self.sample_batch(table, k, n_draws)
+        return table.column(column)[indices].mean(axis=1) if k else np.full(n_draws, np.nan)
+
+
+class RandomSampler(Sampler):
+    """Simple random sampling without replacement."""
+
+    def _draw(self, table: ChapterTable, k: int):
+        return self.rng.choice(len(table), size=k, replace=False)
+
+    def _draw_batch(self, table: ChapterTable, k: int, n_draws: int):
+        # The k smallest of n random keys per row are a uniform k-subset
+        keys = self.rng.random((n_draws, len(table)))
+        return np.argpartition(keys, k - 1, axis=1)[:, :k] if k else np.zeros((n_draws, 0), np.int64)
+
+
+class SystematicSampler(Sampler):
+    """
+    Systematic sampling: every step-th chapter from a random start.
+
+    With step=None the step is len(table) // k. When the step is 1, the k
+    consecutive chapters start at a random position.
+    """
+
+    def __init__(self, step: Optional[int] = None, seed=None):
+        """
+        Initialize the sampler.
+
+        Args:
+            step: Distance between selected chapters (computed from k when None)
+            seed: Seed or numpy Generator
+        """
+        super().__init__(seed)
+        self.step = step
+
+    def _draw(self, table: ChapterTable, k: int):
+        return self._draw_batch(table, k, 1)[0]
+
+    def _draw_batch(self, table: ChapterTable, k: int, n_draws: int):
+        n = len(table)
+        if k == 0 or n == 0:
+            return np.zeros((n_draws, 0), np.int64)
+        step = self.step or max(1, n // k)
+        # A fixed step can be too large for k chapters; keep as many as fit
+        k = min(k, (n - 1) // step + 1)
+        # Random start among those that leave room for all k chapters
+        start_choices = n - k + 1 if step == 1 else min(step, n - (k - 1) * step)
+        starts = self.rng.integers(0, start_choices, size=n_draws)
+        return starts[:, None] + step * np.arange(k)
+
+
+class StratifiedSampler(Sampler):
+    """
+    Stratified sampling by length bucket.
+
+    Chapters are split into n_strata buckets at the quantiles of a column, the
+    sample size is allocated to the buckets in proportion to their sizes
+    (largest remainder), and each bucket is sampled at random.
+    """
+
+    def __init__(self, column: str = "token_count", n_strata: int = 3, seed=None):
+        """
+        Initialize the sampler.
+
+        Args:
+            column: Column defining the length buckets
+            n_strata: Number of buckets
+            seed: Seed or numpy Generator
+        """
+        super().__init__(seed)
+        self.column = column
+        self.n_strata = n_strata
+
+    def allocation(self, table: ChapterTable, k: int) -> List[int]:
+        """
+        Number of chapters drawn from each bucket.
+
+        Args:
+            table: Chapter table
+            k: Sample size
+
+        Returns:
+            One count per bucket, shortest bucket first
+        """
+        sizes = np.array([len(bucket) for bucket in table.strata(self.column, self.n_strata)])
+        quotas = sizes * k / sizes.sum()
+        counts = np.floor(quotas).astype(np.int64)
+        for i in np.argsort(-(quotas - counts), kind="stable")[:k - counts.sum()]:
+            counts[i] += 1
+        return counts.tolist()
+
+    def _draw(self, table: ChapterTable, k: int):
+        buckets = table.strata(self.column, self.n_strata)
+        return np.concatenate([np.zeros(0, np.int64)] + [
+            self.rng.choice(bucket, size=count, replace=False)
+            for bucket, count in zip(buckets, self.allocation(table, k)) if count
+        ])
+
+
+class PPSSampler(Sampler):
+    """
+    Probability-proportional-to-size sampling.
+
+    Each draw maps uniform points onto the prefix sums of the size column with a
+    binary search. Without replacement, systematic PPS is used: chapters at
+    least as large as the sampling interval are taken with certainty and the
+    rest are sampled at evenly spaced points from a random start.
+    """
+
+    def __init__(self, column: str = "token_count", replace: bool = False, seed=None):
+        """
+        Initialize the sampler.
+
+        Args:
+            column: Size column
+            replace: Sample with replacement (independent draws; indices may repeat)
+            seed: Seed or numpy Generator
+        """
+        super().__init__(seed)
+        self.column = column
+        self.replace = replace
+
+    def _certainty(self, table: ChapterTable, k: int):
+        """Split off chapters too large for systematic PPS; returns (certain, rest, rest prefix sums)."""
+        sizes = table.column(self.column)
+        certain = np.zeros(0, np.int64)
+        rest = np.arange(len(table))
+        while len(certain) < k:
+            remaining = k - len(certain)
+            total = sizes[rest].sum()
+            large = sizes[rest] * remaining >= total
+            if total == 0 or not large.any():
+                break
+            certain = np.concatenate([certain, rest[large]])[:k]
+            rest = rest[~large]
+        if len(certain) == 0:
+            return certain, rest, table.prefix(self.column)
+        prefix = np.zeros(len(rest) + 1, dtype=np.int64)
+        np.cumsum(sizes[rest], out=prefix[1:])
+        return certain, rest, prefix
+
+    def _draw_batch(self, table: ChapterTable, k: int, n_draws: int):
+        if self.replace:
+            prefix = table.prefix(self.column)
+            points = self.rng.random((n_draws, k)) * prefix[-1]
+            return np.searchsorted(prefix, points, side="right") - 1
+
+        certain, rest, prefix = self._certainty(table, k)
+        remaining = k - len(certain)
+        if remaining == 0 or prefix[-1] == 0:
+            # Nothing left to weight by: fill with a simple random sample of the rest
+            filler = np.stack([self.rng.choice(rest, size=remaining, replace=False) for _ in range(n_draws)]) \
+                if n_draws else np.zeros((0, remaining), np.int64)
+            return np.hstack([np.broadcast_to(certain, (n_draws, len(certain))), filler.reshape(n_draws, remaining)])
+
+        interval = prefix[-1] / remaining
+        points = (self.rng.random(n_draws)[:, None] + np.arange(remaining)) * interval
+        drawn = rest[np.searchsorted(prefix, points, side="right") - 1]
+        return np.hstack([np.broadcast_to(certain, (n_draws, len(certain))), drawn])
+
+    def _draw(self, table: ChapterTable, k: int):
+        return self._draw_batch(table, k, 1)[0]
+
+    def inclusion_probabilities(self, table: ChapterTable, k: int):
+        """
+        Probability that each chapter is in a sample of size k (without replacement).
+
+        Args:
+            table: Chapter table
+            k: Sample size
+
+        Returns:
+            Array of one probability per chapter
+        """
+        k = min(k, len(table))
+        certain, rest, prefix = self._certainty(table, k)
+        probabilities = np.zeros(len(table))
+        probabilities[certain] = 1.0
+        if prefix[-1]:
+            probabilities[rest] = table.column(self.column)[rest] * (k - len(certain)) / prefix[-1]
+        elif len(rest):
+            probabilities[rest] = (k - len(certain)) / len(rest)
+        return probabilities
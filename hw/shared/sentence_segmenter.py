@@ -0,0 +1,217 @@
+"""
+Shared Sentence Segmenter with Offsets
+
+Sentences are found once per text and returned as a SpanList of (start, end)
+offsets into it, so get_processed_text, get_chapter_data and get_longest_dialogue
+can share one segmentation instead of each splitting and copying the text.
+
+Two modes are available:
+    "punkt": NLTK's Punkt sentence tokenizer, which does not break after
+             abbreviations such as "Mr." or "e.g.". The trained model
+             (tokenizers/punkt_tab) is downloaded if missing and loaded once per
+             process; if it cannot be downloaded, a warning is printed and an
+             untrained tokenizer with a built-in abbreviation list is used.
+    "regex": the previous behaviour, a break after every run of ".", "!" or "?"
+             (the terminators themselves are not part of any sentence).
+
+Approach: cached Punkt model -> span_tokenize -> trimmed array('q') offsets, LRU-cached
+          by a digest of the text (the texts themselves are not kept)
+"""
+
+import bisect
+import hashlib
+import re
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+try:
+    from .lazy_imports import ensure_nltk_resource, lazy_import
+    from .text_spans import SpanList
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from lazy_imports import ensure_nltk_resource, lazy_import
+    from text_spans import SpanList
+
+punkt = lazy_import("nltk.tokenize.punkt")
+
+# A stripped, non-empty piece of re.split(r"[.!?]+", ...)
+REGEX_SENTENCE_PATTERN = re.compile(r"[^.!?\s](?:[^.!?]*[^.!?\s])?")
+NON_SPACE_PATTERN = re.compile(r"\S")
+
+# Used when the trained Punkt model is not installed (lowercase, without the final period)
+DEFAULT_ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "rev", "hon", "st", "jr", "sr", "capt", "col", "gen",
+    "lt", "sgt", "gov", "sen", "rep", "vs", "etc", "e.g", "i.e", "cf", "al", "approx",
+    "dept", "univ", "inc", "ltd", "co", "corp", "no", "nos", "vol", "fig", "ch", "pp",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+})
+
+
+@lru_cache(maxsize=None)
+def load_punkt(language: str = "english", abbreviations: frozenset = frozenset()):
+    """
+    Load a Punkt sentence tokenizer (once per process and argument set).
+
+    The trained model is downloaded when it is missing, as NLPMethods did before
+    the segmenter existed.
+
+    Args:
+        language: Punkt model language
+        abbreviations: Extra abbreviations (lowercase, without the final period)
+
+    Returns:
+        PunktSentenceTokenizer
+    """
+    if ensure_nltk_resource(f"tokenizers/punkt_tab/{language}/", package="punkt_tab", download=True):
+        tokenizer = punkt.PunktTokenizer(language)
+    else:
+        print(f"Warning: Punkt model for {language} could not be downloaded; sentences are split "
+              f"by an untrained tokenizer with the built-in abbreviation list")
+        params = punkt.PunktParameters()
+        params.abbrev_types = set(DEFAULT_ABBREVIATIONS)
+        tokenizer = punkt.PunktSentenceTokenizer(params)
+    tokenizer._params.abbrev_types.update(abbreviations)
+    return tokenizer
+
+
+class SentenceSegmenter:
+    """
+    Splits text into sentences and returns them as offsets into the text.
+
+    Results are kept for the most recently segmented texts, so methods that
+    receive the same text reuse its sentences.
+
+    Usage:
+        segmenter = SentenceSegmenter()
+        sentences = segmenter.spans(text)   # SpanList over text
+        sentences.span(0), sentences[0]
+    """
+
+    MODES = ("punkt", "regex")
+
+    def __init__(self, mode: str = "punkt", language: str = "english",
+                 abbreviations: Iterable[str] = (), cache_size: int = 4):
+        """
+        Initialize the segmenter.
+
+        Args:
+            mode: "punkt" (abbreviation-aware) or "regex" (split at every [.!?]+)
+            language: Punkt model language
+            abbreviations: Extra abbreviations for Punkt, e.g. ["approx", "ca"]
+            cache_size: Number of texts whose sentence offsets are kept (keyed by a
+                digest, so cached texts can be freed)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown segmenter mode {mode!r}; expected one of {self.MODES}")
+        self.mode = mode
+        self.language = language
+        self.abbreviations = frozenset(a.lower().rstrip(".") for a in abbreviations)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def __getstate__(self):
+        # Worker processes get the configuration; each loads its own Punkt model
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        return state
+
+    def _tokenizer(self):
+        return load_punkt(self.language, self.abbreviations)
+
+    def _segment(self, text: str):
+        starts, ends = array("q"), array("q")
+        if self.mode == "regex":
+            for match in REGEX_SENTENCE_PATTERN.finditer(text):
+                starts.append(match.start())
+                ends.append(match.end())
+            return starts, ends
+
+        for start, end in self._tokenizer().span_tokenize(text):
+            first = NON_SPACE_PATTERN.search(text, start, end)
+            if first is None:
+                continue
+            while text[end - 1].isspace():
+                end -= 1
+            starts.append(first.start())
+            ends.append(end)
+        return starts, ends
+
+    def spans(self, text: str) -> SpanList:
+        """
+        Segment text into sentences.
+
+        Args:
+            text: Text to segment
+
+        Returns:
+            SpanList of sentences (trimmed of surrounding whitespace) over text
+        """
+        key = self._cache_key(text)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._segment(text)
+            self._cache[key] = cached
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return SpanList(text, *cached)
+
+    @staticmethod
+    def _cache_key(text: str):
+        # surrogatepass: texts with lone surrogates still encode
+        return len(text), hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def sentences(self, text: str) -> List[str]:
+        """
+        Segment text into sentence strings.
+
+        Args:
+            text: Text to segment
+
+        Returns:
+            List of sentences
+        """
+        return self.spans(text).to_list()
+
+    def count(self, text: str, start: int = 0, end: Optional[int] = None,
+              spans: Optional[SpanList] = None) -> int:
+        """
+        Count the sentences of text that overlap text[start:end].
+
+        Args:
+            text: Text to segment (its segmentation is cached)
+            start: Start offset of the range
+            end: End offset of the range (defaults to the end of text)
+            spans: spans(text), when counting several ranges of one text, so the
+                text is not hashed again for the cache lookup
+
+        Returns:
+            Number of sentences
+        """
+        if spans is None:
+            spans = self.spans(text)
+        end = len(text) if end is None else end
+        first = bisect.bisect_right(spans.ends, start)
+        last = bisect.bisect_left(spans.starts, end)
+        return max(0, last - first)
+
+    def is_boundary(self, text: str, position: int) -> bool:
+        """
+        Check whether a sentence ends at position (just after its terminator).
+
+        Only the text around position needs to be given: Punkt decides each break
+        from the tokens on either side of it.
+
+        Args:
+            text: Text (or a window of it) containing position
+            position: Offset to check
+
+        Returns:
+            True if a sentence ends at position
+        """
+        if self.mode == "regex":
+            return 0 < position and text[position - 1] in ".!?"
+        return any(end == position for _, end in self._tokenizer().span_tokenize(text))
+
@@ -0,0 +1,484 @@
+"""
+Local HTTP Service for NLPMethods and OCR
+
+NLPService exposes text processing (get_processed_text, extract_quotes, chapter
+statistics) and PDF processing (process_pdf_complete) as JSON endpoints on
+localhost, so notebooks and scripts can share one set of warm workers instead of
+each importing the classes and loading NLTK resources themselves.
+
+Jobs run in a process pool whose workers build their NLPMethods and OCR instances
+once, load Punkt and the heavy imports at startup, and keep them for every job.
+The number of jobs in flight is bounded: when it is reached, requests are
+refused at once with 503 (and Retry-After) instead of queueing without limit.
+Small text requests arriving within a few milliseconds of each other are
+micro-batched into one pool task to save the per-task round trip.
+
+POST requests must be sent as Content-Type: application/json, with a localhost
+Host and no foreign Origin, so a web page open in a browser cannot submit jobs
+with a cross-origin form post. PDF output is only written under output_root.
+
+Endpoints (POST bodies and responses are JSON):
+    GET  /health            workers, jobs in flight and counters
+    POST /text/processed    {"text"}                        -> get_processed_text result
+    POST /text/quotes       {"text"}                        -> extract_quotes result
+    POST /text/chapters     {"text", "chapters"?, "content"?} -> chapter statistics
+    POST /pdf               {"path", "output_dir"?, "page_store"?, "save_tables"?, "text"?}
+                                                            -> process_pdf_complete results
+
+Approach: ThreadingHTTPServer -> bounded in-flight slots -> micro-batcher
+          -> pre-warmed ProcessPoolExecutor (one NLPMethods/OCR per worker)
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from .nlp_methods import NLPMethods
+    from .ocr import OCR
+    from .sentence_segmenter import SentenceSegmenter
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from nlp_methods import NLPMethods
+    from ocr import OCR
+    from sentence_segmenter import SentenceSegmenter
+
+
+# Imported when a worker starts rather than on its first job
+WARM_MODULES = ("pandas", "pymupdf")
+
+# Large fields of process_pdf_complete results, returned only when asked for
+PDF_TEXT_FIELDS = ("original_text", "cleaned_text", "fixed_text")
+
+ROUTES = {
+    "/text/processed": "processed",
+    "/text/quotes": "quotes",
+    "/text/chapters": "chapters",
+    "/pdf": "pdf",
+}
+TEXT_OPERATIONS = {"processed", "quotes", "chapters"}
+
+# Host and Origin names accepted on POST requests
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+class ServiceBusy(Exception):
+    """Raised when the service already has its maximum number of jobs in flight."""
+
+
+class JobError(Exception):
+    """Raised (through the job's future) when an operation fails in a worker."""
+
+
+# Per-process worker state, filled in by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(segmenter_mode: str = "punkt") -> None:
+    """Build the NLPMethods and OCR instances of a worker and load heavy resources."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        nlp = NLPMethods(None, segmenter=SentenceSegmenter(segmenter_mode))
+        nlp.segmenter.spans("Warm up the sentence segmenter. It loads once.")
+        for name in WARM_MODULES:
+            with contextlib.suppress(ImportError):
+                importlib.import_module(name)
+    _worker.update(nlp=nlp, ocr=OCR(), pid=os.getpid())
+
+
+def _ping(delay: float = 0.0) -> int:
+    """Return the worker's process id (used to start and check workers)."""
+    time.sleep(delay)
+    return _worker.get("pid", os.getpid())
+
+
+def _run_job(operation: str, payload: Dict[str, Any]) -> Any:
+    """Run one operation with the worker's instances."""
+    if not _worker:
+        _init_worker()
+    nlp, ocr = _worker["nlp"], _worker["ocr"]
+
+    if operation == "processed":
+        return nlp.get_processed_text(payload["text"])
+    if operation == "quotes":
+        return nlp.extract_quotes(payload["text"])
+    if operation == "chapters":
+        text = payload["text"]
+        chapters = payload.get("chapters") or nlp.get_chapters(text)
+        chapter_data = nlp.get_chapter_data(chapters, text)
+        if not payload.get("content", False):
+            for chapter in chapter_data:
+                chapter.pop("content", None)
+        return chapter_data
+    if operation == "pdf":
+        results = ocr.process_pdf_complete(payload["path"],
+                                           output_dir=payload.get("output_dir", "processed_pdfs"),
+                                           save_tables=payload.get("save_tables", False),
+                                           page_store=payload.get("page_store", False))
+        if not payload.get("text", False):
+            for field in PDF_TEXT_FIELDS:
+                results.pop(field, None)
+        return results
+    raise ValueError(f"unknown operation: {operation}")
+
+
+def _run_batch(jobs: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+    """
+    Run several jobs in one pool task.
+
+    Returns:
+        (True, result) or (False, error message) per job; a failing job does not
+        affect the others. Printed progress is discarded.
+    """
+    outcomes = []
+    for operation, payload in jobs:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                outcomes.append((True, _run_job(operation, payload)))
+        except Exception as error:
+            outcomes.append((False, f"{type(error).__name__}: {error}"))
+    return outcomes
+
+
+class _Server(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog for bursts of clients."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the NLPService attached to the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body, default=list).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.server.service.health())
+        else:
+            self._send(404, {"error": f"unknown path: {self.path}"})
+
+    def _refusal(self) -> Optional[Tuple[int, str]]:
+        """Status and reason for refusing a POST from outside localhost or not sent as JSON."""
+        allowed = self.server.service.allowed_hosts
+        host = urlsplit("//" + self.headers.get("Host", "")).hostname
+        if host not in allowed:
+            return 403, f"Host {self.headers.get('Host')!r} is not allowed"
+        origin = self.headers.get("Origin")
+        if origin is not None and urlsplit(origin).hostname not in allowed:
+            return 403, f"Origin {origin!r} is not allowed"
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return 415, "Content-Type must be application/json"
+        return None
+
+    def do_POST(self):
+        service = self.server.service
+        operation = ROUTES.get(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        if operation is None:
+            self.rfile.read(length)
+            self._send(404, {"error": f"unknown path: {self.path}"})
+            return
+        refusal = self._refusal()
+        if refusal is not None:
+            self.close_connection = True
+            self._send(refusal[0], {"error": refusal[1]})
+            return
+        if length > service.max_body_bytes:
+            self.close_connection = True
+            self._send(413, {"error": f"request body over {service.max_body_bytes} bytes"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as error:
+            self._send(400, {"error": f"invalid JSON: {error}"})
+            return
+        required = "path" if operation == "pdf" else "text"
+        if not isinstance(payload, dict) or not isinstance(payload.get(required), str):
+            self._send(400, {"error": f'a JSON object with a string "{required}" field is required'})
+            return
+        if operation == "pdf":
+            output_dir = payload.get("output_dir", "processed_pdfs")
+            if not isinstance(output_dir, str):
+                self._send(400, {"error": 'the "output_dir" field must be a string'})
+                return
+            resolved = service.resolve_output_dir(output_dir)
+            if resolved is None:
+                self._send(403, {"error": f"output_dir must be inside {service.output_root}"})
+                return
+            payload["output_dir"] = resolved
+
+        try:
+            future = service.submit(operation, payload)
+            result = future.result(timeout=service.request_timeout)
+        except ServiceBusy as error:
+            self._send(503, {"error": str(error)}, {"Retry-After": "1"})
+        except TimeoutError:
+            self._send(504, {"error": f"no result within {service.request_timeout} seconds"})
+        except BrokenProcessPool as error:
+            self._send(500, {"error": f"worker pool failed: {error}"})
+        except JobError as error:
+            self._send(422, {"error": str(error)})
+        else:
+            self._send(200, {"result": result})
+
+    def log_message(self, format, *args):
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+
+class NLPService:
+    """
+    Local JSON-over-HTTP service backed by a pre-warmed worker pool.
+
+    Usage:
+        with NLPService(port=8765, workers=4) as service:
+            service.serve_forever()
+
+        # or in-process, without HTTP
+        with NLPService(port=0) as service:
+            service.submit("quotes", {"text": text}).result()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int = 2,
+                 max_pending: int = 64, batch_size: int = 16, batch_wait: float = 0.005,
+                 batch_max_chars: int = 20_000, request_timeout: float = 600.0,
+                 max_body_bytes: int = 64 * 2 ** 20, segmenter_mode: str = "punkt",
+                 output_root: Optional[str] = None, allowed_hosts: Tuple[str, ...] = LOCAL_HOSTS,
+                 verbose: bool = False):
+        """
+        Initialize the service (nothing starts until start()).
+
+        Args:
+            host: Interface to bind; keep the default to serve localhost only
+            port: Port to bind (0 picks a free port, see url)
+            workers: Worker processes
+            max_pending: Jobs accepted at once (queued or running); more get 503
+            batch_size: Most small text jobs run together in one pool task
+            batch_wait: Seconds the batcher waits for more small jobs after the first
+            batch_max_chars: Text jobs up to this length are micro-batched
+            request_timeout: Seconds a request waits for its result before 504
+            max_body_bytes: Largest accepted request body (413 above it)
+            segmenter_mode: SentenceSegmenter mode of the workers' NLPMethods
+            output_root: Directory that PDF output_dir values must stay inside;
+                relative output_dir values are taken from it (default: the
+                current working directory)
+            allowed_hosts: Host and Origin names accepted on POST requests
+            verbose: Log each request to stderr
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.batch_max_chars = batch_max_chars
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.segmenter_mode = segmenter_mode
+        self.output_root = os.path.realpath(output_root or os.getcwd())
+        self.allowed_hosts = allowed_hosts
+        self.verbose = verbose
+
+        self.counters = {"accepted": 0, "rejected": 0, "failed": 0, "pool_tasks": 0, "batched_jobs": 0}
+        self.worker_pids: List[int] = []
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._batch_queue: "queue.Queue[Optional[Tuple[str, Dict[str, Any], Future]]]" = queue.Queue()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[_Server] = None
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running service."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "NLPService":
+        """
+        Start and warm the worker pool, then the batcher and the HTTP server.
+
+        Returns:
+            The service
+        """
+        # The pool is created before any service thread, so forked workers copy no threads
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(self.segmenter_mode,))
+        pings = [self._executor.submit(_ping, 0.05) for _ in range(self.workers)]
+        self.worker_pids = sorted({ping.result() for ping in pings})
+
+        self._server = _Server((self.host, self.port), _RequestHandler)
+        self._server.service = self
+        self._threads = [
+            threading.Thread(target=self._batch_loop, name="nlp-service-batcher", daemon=True),
+            threading.Thread(target=self._server.serve_forever, name="nlp-service-http", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        if self.verbose:
+            print(f"NLPService listening on {self.url} with {len(self.worker_pids)} warm workers")
+        return self
+
+    def serve_forever(self) -> None:
+        """Block until interrupted (Ctrl+C), then stop."""
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop the HTTP server, the batcher and the worker pool."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        self._batch_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def health(self) -> Dict[str, Any]:
+        """Worker and queue state for /health."""
+        with self._lock:
+            counters = dict(self.counters, in_flight=self.in_flight)
+        return {
+            "status": "ok" if self._executor is not None else "stopped",
+            "workers": len(self.worker_pids),
+            "max_pending": self.max_pending,
+            **counters,
+        }
+
+    def resolve_output_dir(self, output_dir: str) -> Optional[str]:
+        """
+        Resolve a requested PDF output directory against output_root.
+
+        Args:
+            output_dir: Directory from the request, relative to output_root or absolute
+
+        Returns:
+            The absolute directory, or None if it lies outside output_root
+        """
+        resolved = os.path.realpath(os.path.join(self.output_root, output_dir))
+        if os.path.commonpath([resolved, self.output_root]) != self.output_root:
+            return None
+        return resolved
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def submit(self, operation: str, payload: Dict[str, Any]) -> Future:
+        """
+        Queue one job.
+
+        Args:
+            operation: "processed", "quotes", "chapters" or "pdf"
+            payload: Request fields, as for the HTTP endpoints
+
+        Returns:
+            Future with the result; it raises JobError if the operation fails
+
+        Raises:
+            ServiceBusy: If max_pending jobs are already in flight
+        """
+        with self._lock:
+            if self.in_flight >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise ServiceBusy(f"{self.max_pending} jobs already in flight")
+            self.in_flight += 1
+            self.counters["accepted"] += 1
+        future: Future = Future()
+        future.add_done_callback(self._release)
+
+        if operation in TEXT_OPERATIONS and len(payload.get("text", "")) <= self.batch_max_chars:
+            self._batch_queue.put((operation, payload, future))
+        else:
+            self._dispatch([(operation, payload, future)])
+        return future
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _dispatch(self, batch: List[Tuple[str, Dict[str, Any], Future]]) -> None:
+        """Send jobs to the pool as one task and resolve their futures when it ends."""
+        self._count("pool_tasks")
+        if len(batch) > 1:
+            self._count("batched_jobs", len(batch))
+        try:
+            task = self._executor.submit(_run_batch, [(operation, payload) for operation, payload, _ in batch])
+        except (BrokenProcessPool, RuntimeError) as error:
+            for _, _, future in batch:
+                future.set_exception(error if isinstance(error, BrokenProcessPool) else BrokenProcessPool(str(error)))
+            return
+
+        def resolve(task):
+            error = task.exception()
+            for index, (_, _, future) in enumerate(batch):
+                if error is not None:
+                    self._count("failed")
+                    future.set_exception(error)
+                    continue
+                ok, value = task.result()[index]
+                if ok:
+                    future.set_result(value)
+                else:
+                    self._count("failed")
+                    future.set_exception(JobError(value))
+        task.add_done_callback(resolve)
+
+    def _batch_loop(self) -> None:
+        """Collect small text jobs for up to batch_wait seconds and dispatch them together."""
+        while True:
+            item = self._batch_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            stopping = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._batch_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+            if stopping:
+                return
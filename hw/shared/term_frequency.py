@@ -0,0 +1,442 @@
+"""
+Incremental Term-Frequency Engine
+
+This module counts term frequencies one document (or one chunk of documents) at a
+time, so counts can be updated as new data arrives instead of re-tokenizing the
+whole corpus. Partial counts are plain Counters that merge by addition, which
+makes it straightforward to count chunks in worker processes and combine them.
+GroupedTermFrequency reuses one tokenization per document to fill per-group
+tables keyed by metadata columns alongside the overall totals.
+
+Approach: per-document tokenization + mergeable Counter / NumPy array views
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .lazy_imports import lazy_import
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+nltk_tokenize = lazy_import("nltk.tokenize")
+
+_NON_WORD = re.compile(r"[^\w]")
+
+
+@lru_cache(maxsize=None)
+def _tweet_tokenizer():
+    """Shared TweetTokenizer, created on first use."""
+    return nltk_tokenize.TweetTokenizer()
+
+
+def tokenize_document(text: str) -> List[str]:
+    """
+    Tokenize a single document the same way the week 5 notebook does, minus
+    lemmatization and stopword removal (see TokenNormalizer for those).
+
+    Args:
+        text: Document text
+
+    Returns:
+        List of lowercase word tokens
+    """
+    if not isinstance(text, str):
+        return []
+
+    words = _tweet_tokenizer().tokenize(" ".join(text.split()))
+    words = [_NON_WORD.sub("", word).lower() for word in words]
+    return [word for word in words if (len(word) > 1 or word == "i") and word != "ni"]
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _count_chunk(args) -> "TermFrequencyEngine":
+    """Worker entry point: count one chunk of documents."""
+    tokenizer, documents = args
+    engine = TermFrequencyEngine(tokenizer)
+    engine.add_documents(documents)
+    return engine
+
+
+class TermFrequencyEngine:
+    """
+    Incrementally maintained, mergeable term counts.
+
+    This class handles:
+    - Adding documents one at a time or in chunks
+    - Merging partial counts (e.g. from worker processes)
+    - Streaming top-N queries while documents are consumed
+    - Array-backed export and JSON persistence of the counts
+    """
+
+    def __init__(self, tokenizer: Optional[Callable[[str], List[str]]] = None):
+        """
+        Initialize an empty engine.
+
+        Args:
+            tokenizer: Function mapping a document to a list of tokens
+                (defaults to tokenize_document). Must be picklable for count_parallel.
+        """
+        self.tokenizer = tokenizer if tokenizer is not None else tokenize_document
+        self.counts = Counter()
+        self.document_frequencies = Counter()
+        self.document_count = 0
+
+    @property
+    def token_count(self) -> int:
+        """Total number of tokens counted."""
+        return sum(self.counts.values())
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add_tokens(self, tokens: Iterable[str]) -> None:
+        """
+        Add one already-tokenized document.
+
+        Args:
+            tokens: Tokens of a single document
+        """
+        self.add_counts(Counter(tokens))
+
+    def add_counts(self, document_counts: Counter) -> None:
+        """
+        Add the term counts of one document.
+
+        Args:
+            document_counts: Counter of a single document's tokens
+        """
+        self.counts.update(document_counts)
+        self.document_frequencies.update(document_counts.keys())
+        self.document_count += 1
+
+    def add_document(self, text: str) -> None:
+        """
+        Tokenize and add a single document.
+
+        Args:
+            text: Document text
+        """
+        self.add_tokens(self.tokenizer(text))
+
+    def add_documents(self, documents: Iterable[str]) -> "TermFrequencyEngine":
+        """
+        Tokenize and add many documents.
+
+        Args:
+            documents: Iterable of document texts
+
+        Returns:
+            self, to allow chaining
+        """
+        for text in documents:
+            self.add_document(text)
+        return self
+
+    def stream_top_n(self, documents: Iterable[str], n: int = 20,
+                     chunk_size: int = 1000) -> Iterator[List[Tuple[str, int]]]:
+        """
+        Consume documents in chunks, yielding the running top-N after each chunk.
+
+        Args:
+            documents: Iterable of document texts
+            n: Number of top terms to report
+            chunk_size: Number of documents consumed between reports
+
+        Yields:
+            Running list of (term, count) pairs, most frequent first
+        """
+        for chunk in _chunked(documents, chunk_size):
+            self.add_documents(chunk)
+            yield self.top_n(n)
+
+    def merge(self, other: "TermFrequencyEngine") -> "TermFrequencyEngine":
+        """
+        Add another engine's counts into this one.
+
+        Args:
+            other: Engine holding partial counts
+
+        Returns:
+            self, to allow chaining
+        """
+        self.counts.update(other.counts)
+        self.document_frequencies.update(other.document_frequencies)
+        self.document_count += other.document_count
+        return self
+
+    def __iadd__(self, other: "TermFrequencyEngine") -> "TermFrequencyEngine":
+        return self.merge(other)
+
+    def __add__(self, other: "TermFrequencyEngine") -> "TermFrequencyEngine":
+        return TermFrequencyEngine(self.tokenizer).merge(self).merge(other)
+
+    def top_n(self, n: int = 20) -> List[Tuple[str, int]]:
+        """
+        Return the n most frequent terms.
+
+        Args:
+            n: Number of terms to return
+
+        Returns:
+            List of (term, count) pairs, most frequent first
+        """
+        return self.counts.most_common(n)
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Export the counts as parallel arrays sorted by descending count.
+
+        Returns:
+            Tuple of (terms, counts) arrays
+        """
+        terms = np.array(list(self.counts.keys()), dtype=object)
+        counts = np.fromiter(self.counts.values(), dtype=np.int64, count=len(self.counts))
+        order = np.argsort(-counts, kind="stable")
+        return terms[order], counts[order]
+
+    @classmethod
+    def from_arrays(cls, terms: Iterable[str], counts: Iterable[int],
+                    tokenizer: Optional[Callable[[str], List[str]]] = None) -> "TermFrequencyEngine":
+        """
+        Build an engine from parallel term and count arrays.
+
+        Args:
+            terms: Term array
+            counts: Count array
+            tokenizer: Tokenizer for documents added later
+
+        Returns:
+            New engine holding the counts (document frequencies are not restored)
+        """
+        engine = cls(tokenizer)
+        engine.counts = Counter({term: int(count) for term, count in zip(terms, counts)})
+        return engine
+
+    def to_dataframe(self, n: Optional[int] = None) -> pd.DataFrame:
+        """
+        Convert the counts to a bag-of-words DataFrame.
+
+        Args:
+            n: Keep only the n most frequent terms (all terms if None)
+
+        Returns:
+            DataFrame with 'word' and 'counts' columns, most frequent first
+        """
+        terms, counts = self.to_arrays()
+        if n is not None:
+            terms, counts = terms[:n], counts[:n]
+        return pd.DataFrame({"word": terms, "counts": counts})
+
+    def save(self, path: str) -> None:
+        """
+        Save the counts to a JSON file so later runs can keep adding documents.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "document_count": self.document_count,
+                    "counts": self.counts,
+                    "document_frequencies": self.document_frequencies,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str, tokenizer: Optional[Callable[[str], List[str]]] = None) -> "TermFrequencyEngine":
+        """
+        Load counts previously written by save().
+
+        Args:
+            path: JSON file path
+            tokenizer: Tokenizer for documents added later
+
+        Returns:
+            Engine holding the saved counts
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        engine = cls(tokenizer)
+        engine.counts = Counter(data["counts"])
+        engine.document_frequencies = Counter(data["document_frequencies"])
+        engine.document_count = data["document_count"]
+        return engine
+
+    @classmethod
+    def count_parallel(cls, documents: Iterable[str], tokenizer: Optional[Callable[[str], List[str]]] = None,
+                       processes: Optional[int] = None, chunk_size: int = 1000) -> "TermFrequencyEngine":
+        """
+        Count documents in worker processes and merge the partial counts.
+
+        Args:
+            documents: Iterable of document texts
+            tokenizer: Picklable tokenizer (defaults to tokenize_document)
+            processes: Number of worker processes (defaults to the CPU count)
+            chunk_size: Number of documents sent to a worker at a time
+
+        Returns:
+            Engine holding the merged counts
+        """
+        total = cls(tokenizer)
+        tasks = ((total.tokenizer, chunk) for chunk in _chunked(documents, chunk_size))
+        with Pool(processes) as pool:
+            for partial in pool.imap_unordered(_count_chunk, tasks):
+                total.merge(partial)
+        return total
+
+
+class GroupedTermFrequency:
+    """
+    One-pass term counts split by metadata columns.
+
+    Each document is tokenized once; its counts are added to the overall totals
+    and to one table per grouping (e.g. Party, Chamber, State, year), so
+    comparing slices costs a single pass over the corpus.
+    """
+
+    def __init__(self, by: Sequence[Union[str, Tuple[str, ...]]],
+                 tokenizer: Optional[Callable[[str], List[str]]] = None):
+        """
+        Initialize empty grouped counts.
+
+        Args:
+            by: Groupings to count by. Each is a column name or a tuple of column
+                names, e.g. ["Party", "Chamber", ("Party", "Chamber")]
+            tokenizer: Function mapping a document to a list of tokens
+                (defaults to tokenize_document)
+        """
+        self.by = [grouping if isinstance(grouping, str) else tuple(grouping) for grouping in by]
+        self.tokenizer = tokenizer if tokenizer is not None else tokenize_document
+        self.total = TermFrequencyEngine(self.tokenizer)
+        self.groups: Dict[Any, Dict[Any, TermFrequencyEngine]] = {grouping: {} for grouping in self.by}
+
+    def _columns(self) -> List[str]:
+        """Distinct metadata columns needed by all groupings, in first-seen order."""
+        columns = []
+        for grouping in self.by:
+            for column in ([grouping] if isinstance(grouping, str) else grouping):
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def add_document(self, text: str, metadata: Dict[str, Any]) -> None:
+        """
+        Tokenize one document and add it to the totals and every matching group.
+
+        Args:
+            text: Document text
+            metadata: Mapping of column name to value for this document
+        """
+        document_counts = Counter(self.tokenizer(text))
+        self.total.add_counts(document_counts)
+        for grouping in self.by:
+            if isinstance(grouping, str):
+                key = metadata[grouping]
+            else:
+                key = tuple(metadata[column] for column in grouping)
+            engine = self.groups[grouping].get(key)
+            if engine is None:
+                engine = self.groups[grouping][key] = TermFrequencyEngine(self.tokenizer)
+            engine.add_counts(document_counts)
+
+    def add_dataframe(self, df: pd.DataFrame, text_column: str) -> "GroupedTermFrequency":
+        """
+        Add every row of a DataFrame in a single pass.
+
+        Args:
+            df: DataFrame holding the text and metadata columns
+            text_column: Name of the text column
+
+        Returns:
+            self, to allow chaining
+        """
+        columns = self._columns()
+        missing = [column for column in [text_column] + columns if column not in df.columns]
+        if missing:
+            raise KeyError(f"Columns not found in DataFrame: {missing}")
+
+        for text, *values in zip(df[text_column], *(df[column] for column in columns)):
+            self.add_document(text, dict(zip(columns, values)))
+        return self
+
+    def merge(self, other: "GroupedTermFrequency") -> "GroupedTermFrequency":
+        """
+        Add another instance's counts (with the same groupings) into this one.
+
+        Args:
+            other: Partial grouped counts
+
+        Returns:
+            self, to allow chaining
+        """
+        if other.by != self.by:
+            raise ValueError("Cannot merge grouped counts with different groupings")
+
+        self.total.merge(other.total)
+        for grouping, tables in other.groups.items():
+            for key, engine in tables.items():
+                target = self.groups[grouping].get(key)
+                if target is None:
+                    target = self.groups[grouping][key] = TermFrequencyEngine(self.tokenizer)
+                target.merge(engine)
+        return self
+
+    def get(self, grouping: Union[str, Tuple[str, ...]], key: Any) -> TermFrequencyEngine:
+        """
+        Return the counts for one group.
+
+        Args:
+            grouping: A grouping passed in by
+            key: Group value (a tuple for multi-column groupings)
+
+        Returns:
+            The group's TermFrequencyEngine (empty if the group was never seen)
+        """
+        grouping = grouping if isinstance(grouping, str) else tuple(grouping)
+        return self.groups[grouping].get(key, TermFrequencyEngine(self.tokenizer))
+
+    def to_dataframe(self, grouping: Union[str, Tuple[str, ...]], n: Optional[int] = None) -> pd.DataFrame:
+        """
+        Convert one grouping's counts to a long-format bag-of-words DataFrame.
+
+        Args:
+            grouping: A grouping passed in by
+            n: Keep only the n most frequent terms per group (all terms if None)
+
+        Returns:
+            DataFrame with the grouping column(s), 'word' and 'counts'
+        """
+        grouping = grouping if isinstance(grouping, str) else tuple(grouping)
+        columns = [grouping] if isinstance(grouping, str) else list(grouping)
+        frames = []
+        for key, engine in self.groups[grouping].items():
+            frame = engine.to_dataframe(n)
+            values = key if isinstance(key, tuple) else (key,)
+            for column, value in zip(columns, values):
+                frame.insert(len(frame.columns) - 2, column, value)
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=columns + ["word", "counts"])
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,251 @@
+"""
+Offset-Based Views over a Shared Source Text
+
+get_processed_text and get_chapter_data return many substrings of one large text:
+sentences, quotes, tokens and chapter contents. Copying each of them multiplies
+peak memory several times over. The classes here store only (start, end) offsets
+into the single source string, in compact integer arrays, and build the
+substrings when they are accessed.
+
+Approach: source string + array('q') start/end offsets, materialized on access
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+def _normalize_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+class SpanList(Sequence):
+    """
+    Read-only sequence of substrings of a source text, stored as offsets.
+
+    Indexing returns a new string (sliced from the source on every access). With
+    normalize=True, runs of whitespace inside each span are collapsed to single
+    spaces, matching text that was whitespace-normalized before it was split.
+    """
+
+    def __init__(self, source: str, starts: Iterable[int] = (), ends: Iterable[int] = (),
+                 normalize: bool = False):
+        """
+        Initialize the view.
+
+        Args:
+            source: Source text shared by every span
+            starts: Start offset of each span
+            ends: End offset (exclusive) of each span
+            normalize: Collapse whitespace runs when a span is materialized
+        """
+        self.source = source
+        self.starts = starts if isinstance(starts, array) else array("q", starts)
+        self.ends = ends if isinstance(ends, array) else array("q", ends)
+        self.normalize = normalize
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SpanList(self.source, self.starts[index], self.ends[index], self.normalize)
+        text = self.source[self.starts[index]:self.ends[index]]
+        return _normalize_whitespace(text) if self.normalize else text
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (SpanList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SpanList({len(self)} spans)"
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """
+        Return the (start, end) offsets of one span.
+
+        Args:
+            index: Span index
+
+        Returns:
+            Tuple of (start, end)
+        """
+        return self.starts[index], self.ends[index]
+
+    def spans(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over (start, end) offsets without materializing any text."""
+        return zip(self.starts, self.ends)
+
+    def select(self, mask: Iterable[bool]) -> "SpanList":
+        """
+        Keep the spans whose mask entry is true.
+
+        Args:
+            mask: One flag per span
+
+        Returns:
+            New SpanList over the same source
+        """
+        mask = list(mask) if not isinstance(mask, (bytes, bytearray, list)) else mask
+        return SpanList(self.source, array("q", compress(self.starts, mask)),
+                        array("q", compress(self.ends, mask)), self.normalize)
+
+    def to_list(self) -> List[str]:
+        """Materialize every span."""
+        return list(self)
+
+
+class NestedSpanList(Sequence):
+    """
+    Sequence of SpanLists stored as one flat SpanList plus group boundaries
+    (for example, the tokens of each sentence).
+    """
+
+    def __init__(self, items: SpanList, offsets: Iterable[int]):
+        """
+        Initialize the view.
+
+        Args:
+            items: Flat SpanList of every item
+            offsets: Group boundaries into items; group i is items[offsets[i]:offsets[i + 1]]
+        """
+        self.items = items
+        self.offsets = offsets if isinstance(offsets, array) else array("q", offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.items[self.offsets[index]:self.offsets[index + 1]]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (NestedSpanList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def to_list(self) -> List[List[str]]:
+        """Materialize every group."""
+        return [group.to_list() for group in self]
+
+
+class ProcessedText:
+    """
+    Offset-based result of NLPMethods.get_processed_text(text, as_spans=True).
+
+    Every field of the dictionary result is available as an attribute or by key.
+    Sentences, quotes and tokens are SpanLists over the original text; non_quotes
+    is built from the kept spans each time it is accessed.
+    """
+
+    KEYS = ["sentences", "tokenized_sentences", "all_tokens", "quotes", "non_quotes",
+            "quote_sentences", "non_quote_sentences", "quote_tokens", "non_quote_tokens"]
+
+    def __init__(self, source: str, sentences: SpanList, tokenized_sentences: NestedSpanList,
+                 quotes: SpanList, non_quote_spans: SpanList, quote_sentence_mask: Iterable[bool],
+                 quote_token_mask: Iterable[bool]):
+        """
+        Initialize the result.
+
+        Args:
+            source: Original text
+            sentences: Sentence spans (whitespace-normalized on access)
+            tokenized_sentences: Token spans grouped by sentence
+            quotes: Quote spans in extraction order
+            non_quote_spans: Spans of text left after quote removal
+            quote_sentence_mask: Whether each sentence contains a quote
+            quote_token_mask: Whether each token contains a quote
+        """
+        self.source = source
+        self.sentences = sentences
+        self.tokenized_sentences = tokenized_sentences
+        self.all_tokens = tokenized_sentences.items
+        self.quotes = quotes
+        self.non_quote_spans = non_quote_spans
+        self.quote_sentences = sentences.select(quote_sentence_mask)
+        self.non_quote_sentences = sentences.select(not flag for flag in quote_sentence_mask)
+        self.quote_tokens = self.all_tokens.select(quote_token_mask)
+        self.non_quote_tokens = self.all_tokens.select(not flag for flag in quote_token_mask)
+
+    @property
+    def non_quotes(self) -> str:
+        """Text with all quotes removed, whitespace-normalized (built on access)."""
+        return _normalize_whitespace("".join(self.non_quote_spans))
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self) -> List[str]:
+        return list(self.KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Materialize the same dictionary get_processed_text returns without as_spans.
+
+        Returns:
+            Dictionary of lists of strings (and the non_quotes string)
+        """
+        result = {}
+        for key in self.KEYS:
+            value = self[key]
+            result[key] = value.to_list() if hasattr(value, "to_list") else value
+        return result
+
+
+class ChapterView(Mapping):
+    """
+    One chapter of get_chapter_data(chapters, text, as_spans=True).
+
+    Behaves like the chapter dictionary, but "content" is sliced from the shared
+    source text only when it is accessed.
+    """
+
+    def __init__(self, source: str, content_start: int, content_end: int, **fields: Any):
+        """
+        Initialize the view.
+
+        Args:
+            source: Cleaned source text shared by every chapter
+            content_start: Offset of the first content character
+            content_end: Offset one past the last content character
+            **fields: The chapter's other fields (title, number, line numbers, counts)
+        """
+        self.source = source
+        self.content_start = content_start
+        self.content_end = content_end
+        self._fields = fields
+
+    @property
+    def content(self) -> str:
+        """Chapter content (sliced from the source on access)."""
+        return self.source[self.content_start:self.content_end]
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "content":
+            return self.content
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._fields
+        yield "content"
+
+    def __len__(self) -> int:
+        return len(self._fields) + 1
+
+    def __repr__(self) -> str:
+        return f"ChapterView({self._fields.get('chapter_title')!r}, {self.content_start}:{self.content_end})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the chapter dictionary."""
+        return dict(self)
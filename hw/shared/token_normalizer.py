@@ -0,0 +1,256 @@
+"""
+Memoized Token Normalization and Lemmatization
+
+Natural-language token streams are heavily Zipfian: a few thousand word types
+account for almost every token occurrence. This module normalizes and lemmatizes
+each distinct raw token once and remembers the result in a bounded LRU table, so
+the per-occurrence work becomes a dictionary lookup. The table can be exported,
+saved and preloaded into worker processes.
+
+Approach: raw token -> normalized word (or None) memo table in an OrderedDict LRU
+"""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .lazy_imports import ensure_nltk_resource
+    from .term_frequency import _NON_WORD, _tweet_tokenizer
+except ImportError:  # shared folder added to sys.path directly, as in the notebooks
+    from lazy_imports import ensure_nltk_resource
+    from term_frequency import _NON_WORD, _tweet_tokenizer
+
+
+BASIC_STOPWORDS = {
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+    "is", "are", "was", "were", "be", "been", "have", "has", "had", "do", "does", "did",
+    "will", "would", "could", "should",
+}
+CUSTOM_STOPWORDS = ["ha", "wa"]
+CUSTOM_LEMMAS = {"voting": "vote"}
+
+_MISSING = object()
+
+
+def load_stop_words() -> set:
+    """
+    Load NLTK English stopwords plus the custom ones, falling back to a basic list.
+
+    Returns:
+        Set of stopwords
+    """
+    try:
+        if not ensure_nltk_resource("corpora/stopwords"):
+            raise LookupError("corpora/stopwords")
+        from nltk.corpus import stopwords
+        stop_words = set(stopwords.words("english"))
+    except LookupError:
+        print("Warning: Could not load NLTK stopwords. Proceeding with basic stopwords.")
+        stop_words = set(BASIC_STOPWORDS)
+    stop_words.update(CUSTOM_STOPWORDS)
+    return stop_words
+
+
+class TokenNormalizer:
+    """
+    Per-type memoized token normalizer.
+
+    This class handles:
+    - Punctuation stripping, lowercasing and short-token filtering
+    - WordNet lemmatization plus custom lemma overrides
+    - Stopword removal
+    - A bounded LRU memo table that can be exported, saved and preloaded
+    """
+
+    def __init__(self, lemmatizer=None, maxsize: int = 200_000, remove_stop_words: bool = True,
+                 stop_words: Optional[Iterable[str]] = None, custom_lemmas: Optional[Dict[str, str]] = None):
+        """
+        Initialize the normalizer.
+
+        Args:
+            lemmatizer: Object with a lemmatize(word) method (defaults to WordNetLemmatizer)
+            maxsize: Maximum number of distinct raw tokens kept in the memo table
+            remove_stop_words: Whether stopwords are dropped
+            stop_words: Stopword set (defaults to load_stop_words() on first use)
+            custom_lemmas: Overrides applied after lemmatization (defaults to CUSTOM_LEMMAS)
+        """
+        self.lemmatizer = lemmatizer
+        self._default_lemmatizer = False
+        self.maxsize = maxsize
+        self.remove_stop_words = remove_stop_words
+        self.stop_words = set(stop_words) if stop_words is not None else None
+        self.custom_lemmas = dict(CUSTOM_LEMMAS if custom_lemmas is None else custom_lemmas)
+
+        self._table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # The memo table travels with the normalizer, so workers start warm.
+        # A default WordNet lemmatizer is recreated on first use instead of pickled.
+        state = self.__dict__.copy()
+        if self._default_lemmatizer:
+            state["lemmatizer"] = None
+            state["_default_lemmatizer"] = False
+        return state
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def _lemmatize(self, word: str) -> str:
+        if self.lemmatizer is None:
+            from nltk.stem import WordNetLemmatizer
+            self.lemmatizer = WordNetLemmatizer()
+            self._default_lemmatizer = True
+        return self.lemmatizer.lemmatize(word)
+
+    def _compute(self, token: str) -> Optional[str]:
+        """Normalize one raw token without consulting the memo table."""
+        word = _NON_WORD.sub("", token).lower()
+        if not word or (len(word) == 1 and word != "i") or word == "ni":
+            return None
+
+        word = self._lemmatize(word)
+        word = self.custom_lemmas.get(word, word)
+
+        if self.remove_stop_words:
+            if self.stop_words is None:
+                self.stop_words = load_stop_words()
+            if word.lower() in self.stop_words:
+                return None
+        return word
+
+    def normalize(self, token: str) -> Optional[str]:
+        """
+        Normalize a single raw token, computing it at most once per type.
+
+        Args:
+            token: Raw token as produced by the tokenizer
+
+        Returns:
+            Normalized word, or None if the token is filtered out
+        """
+        table = self._table
+        word = table.get(token, _MISSING)
+        if word is not _MISSING:
+            self.hits += 1
+            table.move_to_end(token)
+            return word
+
+        self.misses += 1
+        word = self._compute(token)
+        table[token] = word
+        if len(table) > self.maxsize:
+            table.popitem(last=False)
+        return word
+
+    def normalize_tokens(self, tokens: Iterable[str]) -> List[str]:
+        """
+        Normalize a sequence of raw tokens, dropping filtered ones.
+
+        Args:
+            tokens: Raw tokens
+
+        Returns:
+            List of normalized words
+        """
+        normalize = self.normalize
+        return [word for word in map(normalize, tokens) if word is not None]
+
+    def tokenize(self, text) -> List[str]:
+        """
+        Tokenize and normalize text, equivalent to the week 5 notebook's tokenize_words.
+
+        Args:
+            text: Document text, or a list of texts joined with spaces
+
+        Returns:
+            List of normalized words
+        """
+        if isinstance(text, list):
+            text = " ".join(text)
+        if not isinstance(text, str):
+            return []
+        return self.normalize_tokens(_tweet_tokenizer().tokenize(" ".join(text.split())))
+
+    __call__ = tokenize
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Report memo table statistics.
+
+        Returns:
+            Dictionary with hits, misses, size and maxsize
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._table), "maxsize": self.maxsize}
+
+    def export_table(self) -> Dict[str, Optional[str]]:
+        """
+        Export the memo table, least recently used entries first.
+
+        Returns:
+            Dictionary mapping raw tokens to normalized words (None for filtered tokens)
+        """
+        return dict(self._table)
+
+    def preload(self, table: Dict[str, Optional[str]]) -> None:
+        """
+        Load precomputed entries into the memo table.
+
+        Args:
+            table: Mapping of raw tokens to normalized words, e.g. from export_table()
+        """
+        self._table.update(table)
+        while len(self._table) > self.maxsize:
+            self._table.popitem(last=False)
+
+    def save(self, path: str) -> None:
+        """
+        Save the memo table to a JSON file.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.export_table(), f)
+
+    def load(self, path: str) -> None:
+        """
+        Preload the memo table from a JSON file written by save().
+
+        Args:
+            path: JSON file path
+        """
+        self.preload(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+_worker_normalizer: Optional[TokenNormalizer] = None
+
+
+def init_worker(table: Optional[Dict[str, Optional[str]]] = None, **kwargs) -> None:
+    """
+    multiprocessing.Pool initializer that creates a per-process normalizer,
+    optionally preloaded with a shared memo table.
+
+    Args:
+        table: Memo table to preload, e.g. from export_table()
+        **kwargs: Arguments passed to TokenNormalizer
+    """
+    global _worker_normalizer
+    _worker_normalizer = TokenNormalizer(**kwargs)
+    if table:
+        _worker_normalizer.preload(table)
+
+
+def worker_normalizer() -> TokenNormalizer:
+    """
+    Return this process's normalizer, creating a default one if needed.
+
+    Returns:
+        The per-process TokenNormalizer
+    """
+    if _worker_normalizer is None:
+        init_worker()
+    return _worker_normalizer
@@ -0,0 +1,104 @@
+"""
+Unit tests for columnar Parquet export and import.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from hw.shared.columnar_io import (
+    read_chapters, read_pages, read_spans, write_chapters, write_pages, write_spans
+)
+from hw.shared.layout_table import SpanTableBuilder
+from hw.shared.nlp_methods import NLPMethods
+from hw.shared.ocr import OCR
+from tests.test_ocr import make_pdf
+
+
+BODY = "The river flowed past the village for many long years. " * 3
+BOOK = f"THE RIVER\n{BODY}\n\nTHE FERRYMAN\n{BODY}"
+
+
+class TestColumnarIO:
+    """Test cases for the columnar_io functions."""
+
+    @pytest.fixture
+    def chapters_data(self):
+        """Chapter records from get_chapter_data."""
+        return NLPMethods("http://example.com").get_chapter_data(["THE RIVER", "THE FERRYMAN"], BOOK)
+
+    def test_chapters_round_trip_with_separate_content(self, chapters_data, tmp_path):
+        """
+        Test writing chapter stats and content to separate typed Parquet files.
+
+        This test verifies that the stats file holds no text, that column types
+        are narrow, and that reading with content reproduces the DataFrame.
+        """
+        stats_path = write_chapters(chapters_data, tmp_path)
+
+        schema = pq.read_schema(stats_path)
+        assert "content" not in schema.names
+        assert str(schema.field("sentence_count").type) == "int32"
+        assert (tmp_path / "chapters_content.parquet").exists()
+
+        expected = NLPMethods("http://example.com").chapters_to_dataframe(chapters_data)
+        loaded = read_chapters(tmp_path, with_content=True)
+        assert loaded[expected.columns].astype(expected.dtypes).equals(expected)
+
+    def test_column_projection(self, chapters_data, tmp_path):
+        """
+        Test loading only selected columns.
+        """
+        write_chapters(chapters_data, tmp_path)
+
+        loaded = read_chapters(tmp_path, columns=["chapter_title", "word_count"])
+
+        assert list(loaded.columns) == ["chapter_title", "word_count"]
+        assert loaded["word_count"].tolist() == [chapter["word_count"] for chapter in chapters_data]
+
+    def test_chapter_views_are_written(self, tmp_path):
+        """
+        Test that ChapterView records are accepted like dictionaries.
+        """
+        views = NLPMethods("http://example.com").get_chapter_data(["THE RIVER"], BOOK, as_spans=True)
+
+        write_chapters(views, tmp_path)
+
+        assert read_chapters(tmp_path, with_content=True)["content"].tolist() == [views[0]["content"]]
+
+    def test_spans_round_trip_and_page_filter(self, tmp_path):
+        """
+        Test writing a SpanTable with dictionary-encoded fonts and reading selected pages.
+        """
+        builder = SpanTableBuilder()
+        builder.add(0, {"text": "TITLE", "bbox": (72, 60, 200, 80), "font": "Helv-Bold", "size": 24.0, "flags": 16})
+        builder.add(1, {"text": "Body", "bbox": (72, 90, 120, 100), "font": "Helv", "size": 10.0, "flags": 0})
+        builder.add(1, {"text": "More", "bbox": (72, 110, 120, 120), "font": "Helv-Bold", "size": 10.0, "flags": 16})
+        table = builder.build()
+
+        stats_path = write_spans(table, tmp_path)
+
+        assert str(pq.read_schema(stats_path).field("font").type).startswith("dictionary")
+        assert read_spans(tmp_path).to_records() == table.to_records()
+        assert read_spans(tmp_path, pages=[1]).to_records() == table.pages(1).to_records()
+        assert read_spans(tmp_path, with_text=False).text.tolist() == ["", "", ""]
+
+    def test_process_pdf_complete_saves_tables(self, tmp_path):
+        """
+        Test that process_pdf_complete can save page and span tables.
+        """
+        pdf_path = tmp_path / "catalog.pdf"
+        make_pdf(pdf_path, [[("University course catalog", 20)], [("CMPE 5220. Embedded Systems.", 10)]])
+
+        results = OCR().process_pdf_complete(str(pdf_path), str(tmp_path / "out"), save_tables=True)
+        pages = read_pages(results["tables_dir"], with_content=True)
+
+        assert pages["page"].tolist() == [1, 2]
+        assert "Embedded Systems" in pages["text"][1]
+        assert len(read_spans(results["tables_dir"])) == 2
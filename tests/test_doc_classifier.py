@@ -0,0 +1,131 @@
+"""
+Unit tests for the keyword matcher and DocumentTypeClassifier.
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.doc_classifier import DEFAULT_RULES, DocumentTypeClassifier, KeywordMatcher
+from hw.shared.ocr import OCR
+
+
+class TestKeywordMatcher:
+    """Test cases for KeywordMatcher class."""
+
+    def test_finds_overlapping_keywords_ignoring_case(self):
+        """
+        Test matching overlapping and nested keywords in mixed-case text.
+
+        This test verifies that keywords sharing prefixes and suffixes are all
+        found, which a single left-to-right regex alternation would miss.
+        """
+        matcher = KeywordMatcher(["he", "She", "his", "hers", "state of"])
+
+        assert matcher.find("USHERS") == ["he", "she", "hers"]
+        assert matcher.find("The State Of Vermont") == ["he", "state of"]
+        assert matcher.find("nothing here") == ["he"]
+        assert matcher.find("") == []
+
+    def test_scan_resumes_across_chunks(self):
+        """
+        Test that a keyword split across two scanned chunks is still found.
+        """
+        matcher = KeywordMatcher(["notary"])
+        found = [False]
+
+        state = matcher.scan("sworn before a NOT", found)
+        matcher.scan("ARY public", found, state)
+
+        assert found == [True]
+
+
+class TestDocumentTypeClassifier:
+    """Test cases for DocumentTypeClassifier class."""
+
+    @pytest.fixture
+    def classifier(self):
+        """Create a classifier with the default rules."""
+        return DocumentTypeClassifier()
+
+    def test_matches_substring_scoring(self, classifier):
+        """
+        Test that classification agrees with counting keywords by substring search.
+        """
+        samples = [
+            "UNIVERSITY COURSE CATALOG. Prerequisite: MATH 1234.",
+            "State of Vermont, County of Chittenden. Sworn and acknowledged before a notary.",
+            "The university county fair.",
+            "Call me Ishmael.",
+        ]
+        for text in samples:
+            lower = text.lower()
+            expected = {doc_type: sum(keyword in lower for keyword in keywords)
+                        for doc_type, keywords in DEFAULT_RULES.items()}
+            assert classifier.scores(text) == expected
+
+        assert [classifier.classify(text) for text in samples] == ["academic", "legal", "general", "general"]
+        assert classifier.classify("") == "unknown"
+
+    def test_pages_stop_once_decided(self):
+        """
+        Test that page streaming stops reading pages once the result is decided.
+
+        This test verifies that pages after the decisive one are never requested
+        from the generator.
+        """
+        classifier = DocumentTypeClassifier(decisive_margin=2)
+        read = []
+
+        def pages():
+            for text in ["Department of Physics", "Course credit and prerequisite", "Witness", "Notary"]:
+                read.append(text)
+                yield text
+
+        assert classifier.classify_pages(pages()) == "academic"
+        assert len(read) == 2
+        assert classifier.classify_pages([]) == "unknown"
+
+    def test_max_pages_samples_leading_pages(self):
+        """
+        Test that only the first max_pages pages are scored.
+        """
+        pages = ["Sworn statement", "University course", "University course credit"]
+
+        assert DocumentTypeClassifier().classify_pages(pages) == "academic"
+        assert DocumentTypeClassifier(max_pages=1).classify_pages(pages) == "legal"
+
+    def test_rules_from_config_file(self, tmp_path):
+        """
+        Test loading custom document types from a JSON config file.
+        """
+        config_path = tmp_path / "doc_types.json"
+        config_path.write_text(json.dumps({
+            "rules": {"medical": ["patient", "diagnosis"], "financial": ["invoice", "balance due"]},
+            "default_type": "other",
+        }))
+
+        classifier = DocumentTypeClassifier.from_config(str(config_path))
+
+        assert classifier.types == ["medical", "financial"]
+        assert classifier.classify("INVOICE #12. Balance Due: $40") == "financial"
+        assert classifier.classify("Patient invoice") == "other"
+
+    def test_ocr_uses_classifier(self):
+        """
+        Test that OCR.detect_document_type delegates to the configured classifier.
+        """
+        assert OCR().detect_document_type("Course prerequisite, university department") == "academic"
+        assert OCR().detect_document_type("") == "unknown"
+
+        # Without a decisive margin, later keywords still count, as before the classifier
+        text = "University course credit. " + "County, state of Vermont. Notary, acknowledged, sworn, witness."
+        assert OCR().detect_document_type(text) == "legal"
+
+        custom = OCR(classifier=DocumentTypeClassifier({"legal": ["whereas"]}))
+        assert custom.detect_document_type("WHEREAS the parties agree") == "legal"
+        assert custom.detect_document_type_from_pages(["Course", "credit"]) == "general"
@@ -0,0 +1,112 @@
+"""
+Unit tests for the hashed document-term matrix builder.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.document_term_matrix import HashedCSRMatrix, HashingDocumentTermBuilder, feature_index
+from hw.shared.term_frequency import tokenize_document
+
+
+DOCUMENTS = [
+    "Vote early and vote often.",
+    "The election is on Tuesday.",
+    "",
+    "Election security matters to every voter, vote vote.",
+    "Make a plan to vote.",
+]
+
+
+class TestHashingDocumentTermBuilder:
+    """Test cases for HashingDocumentTermBuilder and HashedCSRMatrix classes."""
+
+    @pytest.fixture
+    def builder(self):
+        """Create a builder with a small feature space and tiny batches."""
+        return HashingDocumentTermBuilder(n_features=2 ** 12, batch_size=2)
+
+    def test_transform_batches_match_token_counts(self, builder):
+        """
+        Test that CSR batches hold each document's hashed token counts.
+        """
+        batches = list(builder.transform(DOCUMENTS))
+
+        assert [batch.shape[0] for batch in batches] == [2, 2, 1]
+        first = batches[0]
+        row = dict(zip(first.indices[first.indptr[0]:first.indptr[1]].tolist(),
+                       first.data[first.indptr[0]:first.indptr[1]].tolist()))
+        assert row[feature_index("vote", 2 ** 12)] == 2
+        assert sum(row.values()) == len(tokenize_document(DOCUMENTS[0]))
+
+    def test_write_and_memory_map_back(self, builder, tmp_path):
+        """
+        Test writing batches to disk, appending more rows and reading them back.
+
+        This test verifies that appended rows continue the existing matrix and
+        that rows read through the memory map equal the in-memory batches.
+        """
+        matrix_dir = str(tmp_path / "dtm")
+        builder.write(DOCUMENTS[:3], matrix_dir)
+        matrix = builder.write(DOCUMENTS[3:], matrix_dir)
+
+        assert matrix.shape == (5, 2 ** 12)
+        assert isinstance(matrix.indices, np.memmap)
+        assert matrix.row(2) == {}
+        assert matrix.row(3)[feature_index("vote", 2 ** 12)] == 2
+        assert matrix.column_sums()[feature_index("vote", 2 ** 12)] == 5
+        assert matrix.document_frequencies()[feature_index("election", 2 ** 12)] == 2
+
+        reopened = HashedCSRMatrix(matrix_dir)
+        assert reopened.nnz == matrix.nnz
+        assert [batch.shape[0] for batch in reopened.iter_batches(4)] == [4, 1]
+
+    def test_resume_after_partial_write(self, builder, tmp_path):
+        """
+        Test appending after a crash that left unrecorded bytes in the data files.
+
+        This test verifies that bytes past the rows recorded in meta.json are
+        dropped, so the resumed matrix equals one written in a single pass.
+        """
+        matrix_dir = tmp_path / "dtm"
+        builder.write(DOCUMENTS[:3], str(matrix_dir))
+        # A batch written without its meta.json update
+        for name in ("indptr.bin", "indices.bin", "data.bin"):
+            with open(matrix_dir / name, "ab") as f:
+                f.write(b"\x07" * 20)
+
+        resumed = builder.write(DOCUMENTS[3:], str(matrix_dir))
+        expected = builder.write(DOCUMENTS, str(tmp_path / "single"))
+
+        assert resumed.shape == expected.shape
+        assert [resumed.row(i) for i in range(5)] == [expected.row(i) for i in range(5)]
+        assert os.path.getsize(matrix_dir / "data.bin") == os.path.getsize(tmp_path / "single" / "data.bin")
+
+    def test_mismatched_feature_space_is_rejected(self, builder, tmp_path):
+        """
+        Test that appending with a different n_features raises an error.
+        """
+        matrix_dir = str(tmp_path / "dtm")
+        builder.write(DOCUMENTS, matrix_dir)
+
+        with pytest.raises(ValueError):
+            HashingDocumentTermBuilder(n_features=2 ** 10).write(DOCUMENTS, matrix_dir)
+
+    def test_tfidf_rows_are_normalized(self, builder, tmp_path):
+        """
+        Test tf-idf weighting of memory-mapped rows.
+        """
+        matrix = builder.write(DOCUMENTS, str(tmp_path / "dtm"))
+
+        batch = matrix.tfidf_rows(0, 5)
+
+        for i in range(5):
+            row = batch.data[batch.indptr[i]:batch.indptr[i + 1]]
+            expected = 0.0 if i == 2 else 1.0
+            assert np.isclose(np.sqrt((row ** 2).sum()), expected)
@@ -0,0 +1,184 @@
+"""
+Unit tests for edit logs recorded by the OCR cleaning and fix stages.
+"""
+
+import random
+import re
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.edit_log import Edit, EditLog
+from hw.shared.ocr import OCR
+from hw.shared.page_cache import PageCache
+
+
+ACADEMIC = (
+    "THE UNIVERSITY OF VERMONT\n"
+    "CMPE 5220. Digital Systems   Design\n"
+    "3 Credits.  Taught by Smith,Jones;  see http://uvm.edu/cmpe\n"
+    "\n\n\n"
+    "lNtroduction to rnodern 0ptics and U niversity labs\n"
+    "ELECTRICAL ENGINEERING"
+)
+
+
+def unchanged_parts_survive(original, final, log):
+    """Check that the original text outside the change map appears in order in the final text."""
+    position = 0
+    previous = 0
+    for start, end in log.change_map() + [(len(original), len(original))]:
+        part = original[previous:start]
+        found = final.find(part, position)
+        if found < 0:
+            return False
+        position = found + len(part)
+        previous = end
+    return True
+
+
+class TestEditLog:
+    """Test cases for EditLog and the OCR edit logging."""
+
+    @pytest.fixture
+    def ocr(self):
+        """OCR instance used for cleaning and fixing."""
+        return OCR()
+
+    def test_edits_map_to_original_offsets(self):
+        """
+        Test that edits of later rules are located in the original text.
+
+        This test verifies that a second rule's match after an earlier length
+        change, and a match inside an earlier replacement, get original offsets.
+        """
+        text = "aa bb cc bb"
+        log = EditLog(text)
+        text, count = log.sub(r"aa", "AAAA", text, rule="grow")
+        text, _ = log.sub(r"bb", "B", text, rule="shrink")
+        text, _ = log.sub(r"AA\s", "x ", text, rule="inner")
+
+        assert count == 1
+        assert text == "AAx B cc B"
+        assert log.edits == [
+            Edit("", "grow", 0, 2, "AAAA"),
+            Edit("", "shrink", 3, 5, "B"),
+            Edit("", "shrink", 9, 11, "B"),
+            Edit("", "inner", 0, 3, "x "),
+        ]
+        assert log.change_map() == [(0, 5), (9, 11)]
+        assert log.changed_characters() == 7
+
+    def test_page_spans_follow_edits(self):
+        """
+        Test locating pages in the edited text.
+
+        This test verifies that an edit starting on a page stays with that page,
+        an edit across a page break stays with the earlier page, and unchanged
+        separators belong to no page.
+        """
+        pages = ["alpha 3", "Credits beta", "gamma  delta"]
+        text = "\n".join(pages)
+        log = EditLog(text, page_starts=[0, 8, 21])
+        text, _ = log.sub(r"(\d+)\s+Credits", r"\1 Credits", text)
+        text, _ = log.sub(r"^beta|gamma", "G", text, flags=re.MULTILINE)
+        text, _ = log.sub(r" +", " ", text)
+
+        assert text == "alpha 3 Credits beta\nG delta"
+        assert [text[start:end] for start, end in log.page_spans()] == ["alpha 3 Credits", " beta", "G delta"]
+
+    def test_no_op_matches_are_not_recorded(self):
+        """
+        Test that replacements equal to their match are not counted as edits.
+        """
+        log = EditLog("a b  c")
+        text, count = log.sub(r" +", " ", "a b  c", rule="spaces", stage="clean")
+
+        assert (text, count) == ("a b c", 2)
+        assert log.by_rule() == {"clean:spaces": {"count": 1, "original_chars": 2, "replacement_chars": 1}}
+
+    def test_random_rule_chains(self):
+        """
+        Test many random rule chains against plain re.sub.
+
+        This test verifies that logged substitutions give the same text as re.sub
+        and that every original character outside the change map survives in order.
+        """
+        rng = random.Random(3)
+        rules = [(r"ab", "X"), (r"X+", ""), (r"c", "ccc"), (r"b\s", "\n"), (r"\s+", " "), (r"^a|a$", ""),
+                 (r"(a)(c)?", r"\2\1\n"), (r"(?P<x>b)c", r"\g<x>\g<0>")]
+        for _ in range(200):
+            original = "".join(rng.choice("abcX \n") for _ in range(rng.randint(0, 40)))
+            text = expected = original
+            log = EditLog(original)
+            for pattern, replacement in rng.sample(rules, 4):
+                text, _ = log.sub(pattern, replacement, text)
+                expected = re.sub(pattern, replacement, expected)
+            text = log.strip(text)
+
+            assert text == expected.strip()
+            assert unchanged_parts_survive(original, text, log)
+            assert all(0 <= edit.start <= edit.end <= len(original) for edit in log.edits)
+
+    def test_cleaning_output_unchanged_by_logging(self, ocr, capsys):
+        """
+        Test that academic and legal cleaning give the same text with and without a log.
+        """
+        legal = "STATE  OF VERMONT )\n  ) ss:\n12th day of March , 2020  [Signature]  Page 1  of 3  "
+        for doc_type, text in (("academic", ACADEMIC), ("legal", legal)):
+            log = EditLog(text)
+            cleaned = ocr.clean_document(text, doc_type, edit_log=log)
+            fixed = ocr.fix_ocr_errors(cleaned, edit_log=log)
+
+            assert cleaned == ocr.clean_document(text, doc_type)
+            assert fixed == ocr.fix_ocr_errors(ocr.clean_document(text, doc_type))
+            assert unchanged_parts_survive(text, fixed, log)
+
+    def test_compare_versions_reports_rules_and_pages(self, ocr, capsys):
+        """
+        Test per-rule and per-page edit statistics from the per-page pipeline.
+
+        This test verifies that header removal, cleaning rules and OCR fixes are
+        counted, that edits land on the pages they came from, and that edit
+        offsets point at the original text of each page.
+        """
+        pages = [
+            {"page": 1, "text": ACADEMIC, "content_hash": "p1"},
+            {"page": 2, "text": "Plain text with a rnap.", "content_hash": "p2"},
+        ]
+        log = ocr.page_edit_log(pages)
+        cleaned_pages, fixed_pages = ocr.process_pages(pages, "academic", edit_log=log)
+        original = "\n".join(page["text"] for page in pages)
+        comparison = ocr.compare_versions(original, "\n".join(cleaned_pages), "\n".join(fixed_pages),
+                                          "Doc", edit_log=log)
+
+        by_rule = comparison["edits_by_rule"]
+        assert by_rule["clean:headers"]["count"] == 2
+        assert by_rule["clean:urls"]["count"] == 1
+        assert by_rule["clean:course_codes"]["count"] == 1
+        assert by_rule[r"fix:rn([a-z])"]["count"] == 2
+        assert comparison["edits_by_page"][2] == {r"fix:rn([a-z])": 1}
+        assert comparison["edits"] == len(log)
+        assert unchanged_parts_survive(original, "\n".join(fixed_pages), log)
+        assert [original[edit.start:edit.end] for edit in log.edits if edit.rule == r"rn([a-z])"] == ["rno", "rna"]
+
+    def test_cached_pages_keep_their_edits(self, ocr, tmp_path, capsys):
+        """
+        Test that edit records are stored with cached pages and shifted into place.
+        """
+        cache = PageCache(tmp_path / "cache")
+        pages = [
+            {"page": 1, "text": "first page", "content_hash": "a"},
+            {"page": 2, "text": "a rnap page", "content_hash": "b"},
+        ]
+        first = ocr.page_edit_log(pages)
+        ocr.process_pages(pages, "general", cache=cache, edit_log=first)
+        second = ocr.page_edit_log(pages)
+        ocr.process_pages(pages, "general", cache=cache, edit_log=second)
+
+        assert cache.hits == 2
+        assert second.edits == first.edits == [Edit("fix", r"rn([a-z])", 13, 16, "ma")]
@@ -0,0 +1,186 @@
+"""
+Unit tests for GutenbergFetcher class.
+
+These tests run against a local HTTP/1.1 stand-in server, so no network is needed.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.gutenberg_fetcher import GutenbergFetcher
+from hw.shared.nlp_methods import NLPMethods
+
+
+BOOK_TEMPLATE = (
+    "Project Gutenberg header\n"
+    "*** START OF THE PROJECT GUTENBERG EBOOK SIDDHARTHA ***\n"
+    "Book {n}: Siddhartha sat by the river. “Om,” he said.\n"
+    "*** END OF THE PROJECT GUTENBERG EBOOK SIDDHARTHA ***\n"
+    "Project Gutenberg footer\n"
+)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/flaky/"):
+            with self.lock:
+                remaining = self.failures.get(self.path, 2)
+                self.failures[self.path] = remaining - 1
+            if remaining > 0:
+                self._send(503, b"busy")
+                return
+        if self.path == "/missing":
+            self._send(404, b"not found")
+            return
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/books/7")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        number = self.path.rstrip("/").rsplit("/", 1)[-1]
+        body = BOOK_TEMPLATE.format(n=number).encode("utf-8")
+        if self.path.startswith("/chunked/"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            # Split inside a multi-byte character to exercise streaming decode
+            split = body.index("“".encode("utf-8")) + 1
+            for piece in (body[:split], body[split:]):
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        time.sleep(0.02)
+        self._send(200, body)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestGutenbergFetcher:
+    """Test cases for GutenbergFetcher class."""
+
+    @pytest.fixture
+    def server_url(self):
+        """Start a local stand-in server and return its base URL."""
+        _StandInHandler.failures = {}
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def test_fetch_many_downloads_all_books(self, server_url):
+        """
+        Test fetch_many with many URLs.
+
+        This test verifies that every book is downloaded and that keep-alive
+        connections are reused instead of opening one socket per request.
+        """
+        fetcher = GutenbergFetcher(max_concurrency=4)
+        urls = [f"{server_url}/books/{n}" for n in range(40)]
+
+        result = fetcher.fetch_many(urls)
+
+        assert len(result) == 40
+        for n, url in enumerate(urls):
+            assert f"Book {n}:" in result[url]
+        assert fetcher.stats["connections_opened"] <= 4
+        assert fetcher.stats["connections_reused"] >= 36
+
+    def test_fetch_many_inside_running_loop(self, server_url):
+        """
+        Test the blocking wrappers when an event loop is already running.
+
+        This test verifies that fetch_many and fetch_text work from a coroutine,
+        as in a Jupyter notebook, instead of failing in asyncio.run().
+        """
+        fetcher = GutenbergFetcher()
+
+        async def notebook_cell():
+            return fetcher.fetch_many([f"{server_url}/books/1"]), fetcher.fetch_text(f"{server_url}/books/2")
+
+        many, text = asyncio.run(notebook_cell())
+
+        assert "Book 1:" in many[f"{server_url}/books/1"]
+        assert "Book 2:" in text
+
+    def test_fetch_retries_transient_errors(self, server_url):
+        """
+        Test fetch with a server that fails twice with 503 before succeeding.
+        """
+        fetcher = GutenbergFetcher(backoff=0.01)
+
+        text = fetcher.fetch_text(f"{server_url}/flaky/3")
+
+        assert "Book 3:" in text
+        assert fetcher.stats["retries"] == 2
+
+    def test_fetch_returns_none_on_client_error(self, server_url):
+        """
+        Test fetch with a 404 response, which should not be retried.
+        """
+        fetcher = GutenbergFetcher(backoff=0.01)
+
+        assert fetcher.fetch_text(f"{server_url}/missing") is None
+        assert fetcher.stats["retries"] == 0
+
+    def test_fetch_chunked_and_redirect(self, server_url):
+        """
+        Test fetch with chunked transfer encoding and a redirect.
+
+        This test verifies that a multi-byte character split across chunks
+        is decoded correctly and that redirects are followed.
+        """
+        fetcher = GutenbergFetcher()
+
+        result = fetcher.fetch_many([f"{server_url}/chunked/5", f"{server_url}/redirect"])
+
+        assert "“Om,” he said." in result[f"{server_url}/chunked/5"]
+        assert "Book 7:" in result[f"{server_url}/redirect"]
+
+    def test_nlp_methods_uses_fetcher_as_source(self, server_url):
+        """
+        Test NLPMethods with a GutenbergFetcher as its text source.
+        """
+        nlp = NLPMethods(f"{server_url}/books/1", source=GutenbergFetcher())
+
+        assert nlp.remove_gutenberg_header().startswith("Book 1:")
+
+        texts = nlp.fetch_texts([f"{server_url}/books/2", f"{server_url}/books/3"])
+        cleaned = [nlp.remove_gutenberg_header(text) for text in texts.values()]
+        assert [c.split(":")[0] for c in cleaned] == ["Book 2", "Book 3"]
+
+    def test_fetch_texts_without_source_reports_failures(self, server_url, capsys):
+        """
+        Test that the plain urllib path returns None for a failed download instead of raising.
+        """
+        nlp = NLPMethods(f"{server_url}/books/1")
+
+        texts = nlp.fetch_texts([f"{server_url}/books/2", f"{server_url}/missing"])
+
+        assert "Book 2:" in texts[f"{server_url}/books/2"]
+        assert texts[f"{server_url}/missing"] is None
@@ -0,0 +1,87 @@
+"""
+Unit tests for the inverted index and concordance search.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.inverted_index import Concordance, Hit, InvertedIndex, InvertedIndexBuilder
+
+
+RIVER = (
+    'The river was wide. Siddhartha said "The river knows everything." '
+    "He listened to the river for a long time.\nThe ferryman smiled."
+)
+CAFE = "Le café était fermé. “The river is far,” she said. A river? No, the sea."
+
+
+class TestInvertedIndex:
+    """Test cases for InvertedIndexBuilder and InvertedIndex."""
+
+    @pytest.fixture
+    def builder(self, capsys):
+        """A builder holding two short documents."""
+        builder = InvertedIndexBuilder()
+        builder.add_text("river", RIVER)
+        builder.add_text("cafe", CAFE)
+        # Indexing does not print per-book quote reports
+        assert capsys.readouterr().out == ""
+        return builder
+
+    def test_word_queries_across_documents(self, builder):
+        """
+        Test case-insensitive word lookups over several documents.
+
+        This test verifies counts, document frequencies and that each hit
+        carries its document, token position, sentence id and quote flag.
+        """
+        index = builder.build()
+
+        assert index.documents == ["river", "cafe"]
+        assert index.count("RIVER") == 5
+        assert index.document_frequency("river") == 2
+        assert index.count("missing") == 0
+        assert index.hits("ferryman") == [Hit("river", 20, 3, False)]
+        assert index.hits("knows") == [Hit("river", 8, 1, True)]
+
+    def test_phrase_and_quote_filters(self, builder):
+        """
+        Test phrase queries and quote-only or narrative-only filtering.
+        """
+        index = builder.build()
+
+        assert len(index.hits("the river")) == 4
+        assert [hit.document for hit in index.hits("the river", quotes=True)] == ["river", "cafe"]
+        assert [hit.sentence for hit in index.hits("the river", quotes=False)] == [0, 2]
+        # Phrases do not run across sentence boundaries
+        assert index.hits("wide siddhartha") == []
+        assert index.hits("river no") == []
+
+    def test_kwic_lines(self, builder):
+        """
+        Test keyword-in-context lines, including multibyte text and document edges.
+        """
+        index = builder.build()
+
+        assert index.kwic("fermé", window=2) == [Concordance("cafe", "café était", "fermé", ". “The river")]
+        assert index.kwic("the ferryman", window=3) == [
+            Concordance("river", "a long time.", "The ferryman", "smiled")
+        ]
+        assert len(index.kwic("river", limit=2)) == 2
+
+    def test_write_and_open(self, builder, tmp_path):
+        """
+        Test that a written index answers queries from the memory-mapped files.
+        """
+        expected = builder.build()
+
+        written = builder.write(tmp_path / "index")
+        reopened = InvertedIndex.open(tmp_path / "index")
+
+        for index in (written, reopened):
+            assert index.hits("the river") == expected.hits("the river")
+            assert index.kwic("sea") == expected.kwic("sea")
@@ -0,0 +1,88 @@
+"""
+Unit tests for lazy module loading and one-time resource checks.
+"""
+
+import pytest
+import subprocess
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.lazy_imports import LazyModule, ensure_nltk_resource, lazy_import
+
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+class TestLazyImports:
+    """Test cases for LazyModule and ensure_nltk_resource."""
+
+    def test_lightweight_import_path(self):
+        """
+        Test that quote extraction and OCR fixing do not load heavy dependencies.
+
+        This test verifies, in a fresh interpreter, that importing nlp_methods and
+        ocr and calling their text-only methods leaves pandas, nltk, numpy and
+        pymupdf unimported.
+        """
+        script = (
+            "import sys\n"
+            "from hw.shared.nlp_methods import NLPMethods\n"
+            "from hw.shared.ocr import OCR\n"
+            "quotes = NLPMethods('http://example.com').extract_quotes('He said \"Hi\" twice.')\n"
+            "fixed = OCR().fix_ocr_errors('CMPE 5220. Embedded Systems.')\n"
+            "assert quotes == ['Hi'], quotes\n"
+            "print(sorted(m for m in ('pandas', 'nltk', 'numpy', 'pymupdf') if m in sys.modules))\n"
+        )
+
+        result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=120)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_lazy_module_loads_on_attribute_access(self):
+        """
+        Test that a LazyModule imports its module on first attribute access.
+        """
+        proxy = LazyModule("colorsys")
+        already_loaded = LazyModule.is_loaded("colorsys")
+
+        assert proxy.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert LazyModule.is_loaded("colorsys")
+        assert "loaded" in repr(proxy)
+        assert already_loaded or "not loaded" not in repr(proxy)
+        assert lazy_import("sys") is sys
+
+    def test_missing_module_fails_on_use(self):
+        """
+        Test that a missing module raises ImportError only when it is used.
+        """
+        proxy = lazy_import("module_that_does_not_exist")
+
+        with pytest.raises(ImportError):
+            proxy.anything
+
+    def test_nltk_resource_checked_once(self, monkeypatch):
+        """
+        Test that ensure_nltk_resource looks a resource up only once per process.
+        """
+        import nltk
+
+        calls = []
+
+        def find(resource):
+            calls.append(resource)
+            raise LookupError(resource)
+
+        monkeypatch.setattr(nltk.data, "find", find)
+        ensure_nltk_resource.cache_clear()
+        try:
+            assert ensure_nltk_resource("corpora/made_up") is False
+            assert ensure_nltk_resource("corpora/made_up") is False
+        finally:
+            ensure_nltk_resource.cache_clear()
+
+        assert calls == ["corpora/made_up"]
@@ -0,0 +1,127 @@
+"""
+Unit tests for the metrics registry and NLPMethods instrumentation.
+"""
+
+import json
+import math
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.metrics import MetricsRegistry
+from hw.shared.nlp_methods import NLPMethods
+from hw.shared.sentence_segmenter import SentenceSegmenter
+
+
+TEXT = 'The river was wide. "Come in," said the ferryman. "Sit down." He sat.'
+
+
+class TestMetrics:
+    """Test cases for MetricsRegistry and the instrument decorator."""
+
+    @pytest.fixture
+    def metrics(self):
+        """An empty registry."""
+        return MetricsRegistry()
+
+    @pytest.fixture
+    def nlp(self, metrics):
+        """NLPMethods recording into the registry."""
+        return NLPMethods("http://example.com", segmenter=SentenceSegmenter("regex"), metrics=metrics)
+
+    def test_prometheus_text_format(self, metrics):
+        """
+        Test counter and histogram output in the Prometheus text format.
+
+        This test verifies HELP and TYPE lines, label escaping, cumulative
+        buckets with +Inf, and the _sum and _count samples.
+        """
+        metrics.counter("jobs_total", "Jobs run", ["kind"]).inc(2, kind='say "hi"')
+        histogram = metrics.histogram("job_seconds", "Job time", ["kind"], buckets=[0.1, 1])
+        for value in (0.05, 0.5, 2.0):
+            histogram.observe(value, kind="pdf")
+
+        assert metrics.to_prometheus() == (
+            "# HELP job_seconds Job time\n"
+            "# TYPE job_seconds histogram\n"
+            'job_seconds_bucket{kind="pdf",le="0.1"} 1\n'
+            'job_seconds_bucket{kind="pdf",le="1"} 2\n'
+            'job_seconds_bucket{kind="pdf",le="+Inf"} 3\n'
+            'job_seconds_sum{kind="pdf"} 2.55\n'
+            'job_seconds_count{kind="pdf"} 3\n'
+            "# HELP jobs_total Jobs run\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{kind="say \\"hi\\""} 2\n'
+        )
+        assert histogram.quantile(0.5, kind="pdf") == 1
+        assert histogram.quantile(0.9, kind="pdf") == math.inf
+        with pytest.raises(ValueError):
+            metrics.counter("job_seconds")
+
+    def test_methods_record_units(self, nlp, metrics, capsys):
+        """
+        Test that instrumented methods count calls, bytes, tokens, sentences and quotes.
+        """
+        processed = nlp.get_processed_text(TEXT)
+        quotes = nlp.extract_quotes(TEXT)
+        nlp.extract_quotes("“café”")
+
+        calls = metrics.get("nlp_calls_total")
+        assert calls.value(method="get_processed_text") == 1
+        assert calls.value(method="extract_quotes") == 2
+        assert metrics.get("nlp_tokens_total").value(method="get_processed_text") == len(processed["all_tokens"])
+        assert metrics.get("nlp_sentences_total").value(method="get_processed_text") == len(processed["sentences"])
+        assert metrics.get("nlp_quotes_total").value(method="extract_quotes") == len(quotes) + 1
+        # Input is counted in UTF-8 bytes
+        assert metrics.get("nlp_input_bytes_total").value(method="extract_quotes") == len(TEXT) + len("“café”".encode("utf-8"))
+        assert metrics.get("nlp_latency_seconds").count(method="extract_quotes") == 2
+        assert metrics.get("nlp_throughput_mb_per_second").count(method="get_processed_text") == 1
+
+    def test_errors_and_uninstrumented_instances(self, nlp, metrics):
+        """
+        Test that failing calls are counted as errors and that metrics are opt-in.
+        """
+        with pytest.raises(TypeError):
+            nlp.get_chapter_data(5, TEXT)
+
+        assert metrics.get("nlp_errors_total").value(method="get_chapter_data") == 1
+        assert "nlp_calls_total" not in metrics
+
+        plain = NLPMethods("http://example.com", segmenter=SentenceSegmenter("regex"))
+        assert plain.metrics is None
+        assert plain.extract_quotes(TEXT) == nlp.extract_quotes(TEXT)
+
+    def test_slow_calls_are_logged(self, capsys):
+        """
+        Test that calls below the throughput threshold are counted and kept for inspection.
+        """
+        metrics = MetricsRegistry(slow_mb_per_second=1e9, min_slow_bytes=10, slow_log_size=2)
+        nlp = NLPMethods("http://example.com", segmenter=SentenceSegmenter("regex"), metrics=metrics)
+        for _ in range(3):
+            nlp.get_processed_text(TEXT)
+        nlp.extract_quotes('"hi"')  # below min_slow_bytes
+
+        assert metrics.get("nlp_slow_calls_total").value(method="get_processed_text") == 3
+        assert len(metrics.slow_calls) == 2
+        assert metrics.slow_calls[-1]["method"] == "get_processed_text"
+        assert metrics.slow_calls[-1]["quotes"] == 2
+        assert metrics.slow_calls[-1]["preview"] == TEXT
+
+    def test_write_files(self, nlp, metrics, tmp_path, capsys):
+        """
+        Test the Prometheus and JSON files written from a registry.
+        """
+        nlp.get_chapters("CHAPTER ONE\nText.")
+        metrics.write_prometheus(tmp_path / "nlp.prom")
+        metrics.write_json(tmp_path / "nlp.json")
+
+        assert 'nlp_calls_total{method="get_chapters"} 1' in (tmp_path / "nlp.prom").read_text()
+        snapshot = json.loads((tmp_path / "nlp.json").read_text())
+        assert snapshot["metrics"]["nlp_calls_total"]["samples"] == [
+            {"name": "nlp_calls_total", "labels": {"method": "get_chapters"}, "value": 1}
+        ]
+        assert sorted(os.listdir(tmp_path)) == ["nlp.json", "nlp.prom"]
@@ -0,0 +1,120 @@
+"""
+Unit tests for MinHashLSH near-duplicate detection.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.near_duplicates import MinHashLSH, drop_near_duplicates
+
+
+NEWSLETTER = (
+    "Dear friend, this week in Congress I voted to protect Social Security and Medicare "
+    "for every senior in our district. I also met with local farmers about the farm bill, "
+    "visited three schools, and held a town hall on election security and voting access. "
+    "Thank you for reading, and please reach out to my office with any questions."
+)
+FORWARDED = "FW: " + NEWSLETTER.replace("three schools", "3 schools") + " Sent from my phone."
+UNRELATED = (
+    "The committee hearing on infrastructure spending will be held Thursday morning. "
+    "Witnesses include transportation officials from several states and city mayors "
+    "who will testify about bridge repairs, transit funding and broadband expansion."
+)
+
+
+class TestMinHashLSH:
+    """Test cases for MinHashLSH class."""
+
+    def test_lightly_edited_copy_is_clustered(self):
+        """
+        Test that a forwarded, lightly edited newsletter clusters with the original.
+
+        This test verifies that exact-match deduplication would miss the copy
+        while the MinHash detector groups it with the original.
+        """
+        detector = MinHashLSH(shingle_size=3, threshold=0.6)
+        detector.add_documents([NEWSLETTER, UNRELATED, FORWARDED, "", ""])
+
+        assert detector.clusters() == [[0, 2]]
+        assert detector.duplicate_mask().tolist() == [False, False, True, False, False]
+
+    def test_bucket_mate_between_duplicates(self):
+        """
+        Test that a false-positive bucket-mate sorted between two duplicates does not hide them.
+
+        This test verifies that every pair in a bucket is checked, not only neighbours.
+        """
+        detector = MinHashLSH(shingle_size=3, threshold=0.6)
+        for text in [NEWSLETTER, UNRELATED, FORWARDED]:
+            detector.add_document(text)
+        # The unrelated document collides with the original in every band
+        detector._pending_bands[1] = detector._pending_bands[0].copy()
+
+        assert detector.clusters() == [[0, 2]]
+
+    def test_large_bucket(self):
+        """
+        Test that thousands of near-identical documents in one bucket form one cluster.
+
+        This test verifies that members are checked against the bucket's groups,
+        not against every other member, so a large bucket stays fast.
+        """
+        base = " ".join(f"word{i}" for i in range(300))
+        detector = MinHashLSH(shingle_size=3, threshold=0.8)
+        for i in range(2000):
+            detector.add_tokens(f"{base} extra{i}".split())
+        detector.add_document(UNRELATED)
+
+        assert detector.clusters() == [list(range(2000))]
+
+    def test_signature_estimates_jaccard(self):
+        """
+        Test that identical documents get identical signatures and unrelated ones rarely agree.
+        """
+        detector = MinHashLSH()
+        tokens = NEWSLETTER.lower().split()
+
+        same = detector.signature(tokens)
+        other = detector.signature(UNRELATED.lower().split())
+
+        assert np.array_equal(same, detector.signature(list(tokens)))
+        assert (same == other).mean() < 0.1
+        assert detector.signature([]) is None
+
+    def test_disk_storage_without_verification(self, tmp_path):
+        """
+        Test keeping band hashes on disk with verification disabled.
+        """
+        detector = MinHashLSH(shingle_size=3, verify=False, storage_dir=str(tmp_path))
+        detector._flush_every = 2
+        detector.add_documents([NEWSLETTER, UNRELATED, NEWSLETTER, UNRELATED, FORWARDED])
+
+        clusters = detector.clusters()
+
+        assert [0, 2] == clusters[0][:2]
+        assert [1, 3] in clusters
+        assert (tmp_path / "bands.bin").stat().st_size == 5 * detector.bands * 8
+
+    def test_drop_near_duplicates_dataframe(self):
+        """
+        Test dropping near-duplicate rows from a DataFrame.
+        """
+        df = pd.DataFrame({"Body": [NEWSLETTER, FORWARDED, UNRELATED], "Party": ["D", "D", "R"]})
+
+        result = drop_near_duplicates(df, "Body", shingle_size=3, threshold=0.6)
+
+        assert result.index.tolist() == [0, 2]
+
+    def test_bands_must_divide_permutations(self):
+        """
+        Test that an invalid band configuration is rejected.
+        """
+        with pytest.raises(ValueError):
+            MinHashLSH(num_perm=100, bands=16)
@@ -0,0 +1,93 @@
+"""
+Unit tests for memory-bounded n-gram counting.
+"""
+
+import pytest
+import random
+import sys
+import os
+from collections import Counter
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.ngrams import NGramCounter, count_dialogue_and_narrative
+from hw.shared.nlp_methods import NLPMethods
+
+
+def exact_counts(sentences, n):
+    counts = Counter()
+    for tokens in sentences:
+        tokens = [token.lower() for token in tokens]
+        counts.update(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return counts
+
+
+class TestNGramCounter:
+    """Test cases for NGramCounter and count_dialogue_and_narrative."""
+
+    @pytest.fixture
+    def sentences(self):
+        """Random sentences over a Zipf-like vocabulary, with a few very common phrases."""
+        rng = random.Random(0)
+        words = [f"w{i}" for i in range(400)]
+        weights = [1 / (i + 1) for i in range(400)]
+        sentences = [rng.choices(words, weights, k=rng.randint(1, 12)) for _ in range(3000)]
+        sentences += [["The", "River", "flows", "on"]] * 300
+        return sentences
+
+    @pytest.mark.parametrize("n", [1, 2, 3, 5])
+    def test_exact_counts_match_counter(self, sentences, n):
+        """
+        Test that exact mode matches a Counter of n-gram tuples.
+
+        This test verifies counts across several merge batches, that no n-gram
+        spans two sentences, and that tokens are lowercased.
+        """
+        counter = NGramCounter(n, batch_size=500)
+        counter.add_token_lists(sentences)
+        expected = exact_counts(sentences, n)
+
+        assert counter.exact
+        assert counter.total == sum(expected.values())
+        assert [count for _, count in counter.most_common(10)] == [count for _, count in expected.most_common(10)]
+        sample = list(expected)[:50] + [("missing",) * n]
+        assert counter.counts(sample).tolist() == [expected[ngram] for ngram in sample]
+        if n == 3:
+            assert counter.count("the river flows") == 300
+
+    def test_sketch_fallback_within_budget(self, sentences):
+        """
+        Test the switch to a count-min sketch once the memory budget is exceeded.
+
+        This test verifies that memory stays within the budget, that estimates
+        never undercount, and that the heavy hitters are still reported.
+        """
+        counter = NGramCounter(2, max_memory=16 * 1024, batch_size=500, heavy_hitters=50)
+        counter.add_token_lists(sentences)
+        expected = exact_counts(sentences, 2)
+
+        assert not counter.exact
+        assert counter.memory_usage() <= 16 * 1024
+        sample = list(expected)
+        estimates = counter.counts(sample)
+        assert all(estimate >= expected[ngram] for ngram, estimate in zip(sample, estimates))
+        top = [ngram for ngram, _ in counter.most_common(3)]
+        assert set(top) == {ngram for ngram, _ in expected.most_common(3)}
+
+    def test_dialogue_and_narrative_counts(self, capsys):
+        """
+        Test separate n-gram counts for quoted and narrative text.
+        """
+        text = 'He said "come to the river" and walked to the river. She said “the river is cold” quietly.'
+        processed = NLPMethods("http://example.com").get_processed_text(text, as_spans=True)
+        capsys.readouterr()
+
+        counts = count_dialogue_and_narrative(processed, n=2)
+
+        assert counts["dialogue"].count("the river") == 2
+        assert counts["narrative"].count("the river") == 1
+        # "said and" would only appear if n-grams crossed a removed quote
+        assert counts["narrative"].count("said and") == 0
+        with pytest.raises(ValueError):
+            NGramCounter(6)
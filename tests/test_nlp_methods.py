@@ -221,3 +221,81 @@ It provides a satisfying ending to the story.
         for chapter in result:
             assert "To Romain Rolland, my dear friend" not in chapter["content"]
             assert "Some preamble text here" not in chapter["content"]
+
+    def test_get_processed_text_parallel_matches_serial(self, nlp_instance, capsys):
+        """
+        Test get_processed_text in parallel mode.
+
+        This test verifies that processing shared-memory segments in worker
+        processes gives exactly the serial result, including quote order and
+        quotes spanning several sentences.
+        """
+        paragraph = (
+            'He said "Wait. Stop!" and left. She whispered “Come back. Please.” to him. '
+            "It's late, 'they said. Go home.' Then\nsilence fell.  “Unclosed.\n"
+        )
+        text = paragraph * 40
+
+        serial = nlp_instance.get_processed_text(text)
+        parallel = nlp_instance.get_processed_text(text, workers=3, min_segment_chars=500)
+        output = capsys.readouterr().out
+
+        assert parallel == serial
+        assert output.count("Number of quotes found: 140") == 2
+
+    def test_segment_bounds_avoid_quotes(self, nlp_instance):
+        """
+        Test that parallel segments are only cut outside quotes.
+        """
+        text = 'Start. "One. Two. Three." Four. “Five. Six.” Seven.'
+        data = text.encode("utf-8")
+
+        bounds = nlp_instance._segment_bounds(data, 4)
+        cuts = [data[:end].decode("utf-8") for _, end in bounds[:-1]]
+
+        assert bounds[0][0] == 0 and bounds[-1][1] == len(data)
+        # Cuts inside "One. Two. Three." and “Five. Six.” are skipped
+        assert cuts == ['Start. "One. Two. Three." Four.']
+
+    def test_get_processed_text_as_spans(self, nlp_instance, capsys):
+        """
+        Test get_processed_text with offset-based views.
+
+        This test verifies that every field materializes to the same value as the
+        copied result, and that sentences and quotes keep their offsets into the text.
+        """
+        text = 'She said  "Come\nin."  The door was open! “Why?” he asked.\n\nNobody  answered.'
+
+        copied = nlp_instance.get_processed_text(text)
+        spans = nlp_instance.get_processed_text(text, as_spans=True)
+        output = capsys.readouterr().out
+
+        assert spans.to_dict() == copied
+        assert spans["sentences"] == copied["sentences"]
+        assert spans.sentences[0] == "She said \"Come in.\""
+        assert spans.quotes.span(0) == (text.index("Come"), text.index('"  The'))
+        assert spans.quotes[0] == "Come\nin."
+        assert spans.non_quotes == "She said The door was open! he asked. Nobody answered."
+        assert list(spans.tokenized_sentences[-1]) == ["Nobody", "answered"]
+        assert output.count("Number of quotes found: 2") == 2
+
+        quiet = nlp_instance.get_processed_text(text, as_spans=True, verbose=False)
+        assert capsys.readouterr().out == ""
+        assert quiet.to_dict() == copied
+
+    def test_get_chapter_data_as_spans(self, nlp_instance):
+        """
+        Test get_chapter_data with chapter views over one shared text.
+        """
+        body = "The river flowed past the village for many long years. " * 3
+        text = f"INTRODUCTION\n{body}\nTHE RIVER\n{body}\n\nTHE FERRYMAN\n{body}"
+        chapters = ["THE RIVER", "THE FERRYMAN"]
+
+        copied = nlp_instance.get_chapter_data(chapters, text)
+        views = nlp_instance.get_chapter_data(chapters, text, as_spans=True)
+
+        assert [view.to_dict() for view in views] == copied
+        assert views[0].source is views[1].source
+        assert views[0]["end_line"] == 5
+        assert views[1]["content"] == body.strip()
+        assert nlp_instance.chapters_to_dataframe(views).equals(nlp_instance.chapters_to_dataframe(copied))
@@ -0,0 +1,204 @@
+"""
+Unit tests for OCR class.
+
+Test PDFs are generated on the fly with PyMuPDF.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+import pymupdf
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.ocr import OCR
+from hw.shared.layout_table import SpanTable
+from hw.shared.page_cache import PageCache
+
+
+def make_pdf(path, pages):
+    """Write a PDF where each page is a list of (text, fontsize) lines."""
+    doc = pymupdf.open()
+    for lines in pages:
+        page = doc.new_page()
+        y = 72
+        for text, fontsize in lines:
+            page.insert_text((72, y), text, fontsize=fontsize)
+            y += fontsize * 2
+    doc.save(str(path))
+    doc.close()
+
+
+class TestOCR:
+    """Test cases for OCR class."""
+
+    @pytest.fixture
+    def ocr_instance(self):
+        """Create an OCR instance for testing."""
+        return OCR()
+
+    @pytest.fixture
+    def catalog_pdf(self, tmp_path):
+        """Create a three-page catalog-like PDF."""
+        path = tmp_path / "catalog.pdf"
+        make_pdf(
+            path,
+            [
+                [("ELECTRICAL ENGINEERING", 24), ("CMPE 5220. Embedded Systems. 3 Credits.", 10)],
+                [("Course Descriptions", 24), ("EE 2110. Circuit Analysis. 4 Credits.", 10),
+                 ("Prerequisite: MATH 1234.", 10)],
+                [("EE 3150. Signals. 3 Credits.", 10)],
+            ],
+        )
+        return str(path)
+
+    def test_extract_layout_table_covers_all_pages(self, ocr_instance, catalog_pdf):
+        """
+        Test extract_layout_table over the whole document.
+
+        This test verifies that spans from every page are returned as NumPy
+        columns with dictionary-encoded fonts.
+        """
+        table = ocr_instance.extract_layout_table(catalog_pdf)
+
+        assert isinstance(table, SpanTable)
+        assert len(table) == 6
+        assert table.page.tolist() == [0, 0, 1, 1, 1, 2]
+        assert table.bbox.shape == (6, 4)
+        assert table.size.dtype == np.float64
+        assert len(table.fonts) == 1
+        assert table.font_histogram() == {table.fonts[0]: 6}
+
+    def test_extract_layout_table_page_range(self, ocr_instance, catalog_pdf):
+        """
+        Test extract_layout_table with a page range and a list of pages.
+        """
+        first_two = ocr_instance.extract_layout_table(catalog_pdf, page_range=(0, 2))
+        last = ocr_instance.extract_layout_table(catalog_pdf, page_range=[2])
+
+        assert sorted(set(first_two.page.tolist())) == [0, 1]
+        assert last.text.tolist() == ["EE 3150. Signals. 3 Credits."]
+        assert ocr_instance.extract_layout_table("missing.pdf") is None
+
+    def test_layout_table_matches_extract_with_layout(self, ocr_instance, catalog_pdf):
+        """
+        Test that the table holds the same spans as the per-page dict extraction.
+        """
+        records = ocr_instance.extract_with_layout(catalog_pdf, 1)
+        table = ocr_instance.extract_layout_table(catalog_pdf).pages(1)
+
+        for record, row in zip(records, table.to_records()):
+            assert row["text"] == record["text"]
+            assert row["font"] == record["font"]
+            assert row["size"] == record["size"]
+            assert row["bbox"] == pytest.approx(tuple(record["bbox"]))
+
+    def test_headers_and_structure_analysis(self, ocr_instance, catalog_pdf, capsys):
+        """
+        Test vectorized header detection and analyze_document_structure output.
+        """
+        table = ocr_instance.extract_layout_table(catalog_pdf)
+
+        headers = table.headers()
+        ocr_instance.analyze_document_structure(table)
+        output = capsys.readouterr().out
+
+        assert headers.text.tolist() == ["ELECTRICAL ENGINEERING", "Course Descriptions"]
+        assert "Size 24.0: 2 elements" in output
+        assert "Size 10.0: 4 elements" in output
+        assert "Likely headers (2 found)" in output
+
+    def test_structure_analysis_accepts_records(self, ocr_instance, catalog_pdf, capsys):
+        """
+        Test analyze_document_structure with the list returned by extract_with_layout.
+        """
+        ocr_instance.analyze_document_structure(ocr_instance.extract_with_layout(catalog_pdf, 0))
+
+        output = capsys.readouterr().out
+        assert "Likely headers (1 found)" in output
+
+    def test_page_cache_reprocesses_only_changed_pages(self, ocr_instance, tmp_path, monkeypatch):
+        """
+        Test incremental reprocessing of a revised document through the page cache.
+
+        This test verifies that only the changed page is extracted again and that
+        an unchanged document is not cleaned again.
+        """
+        pages = [
+            [("THE UNIVERSITY OF VERMONT", 12), ("CMPE 5220. Embedded Systems. 3 Credits.", 10)],
+            [("EE 2110. Circuit Analysis. 4 Credits. Prerequisite: MATH 1234.", 10)],
+            [("EE 3150. Signals. 3 Credits. Professor Smith, department chair.", 10)],
+        ]
+        original = tmp_path / "catalog_fall.pdf"
+        revised = tmp_path / "catalog_spring.pdf"
+        make_pdf(original, pages)
+        make_pdf(revised, pages[:2] + [[("EE 3150. Signals and Systems. 4 Credits.", 10)]])
+        cache = PageCache(str(tmp_path / "cache"))
+        output_dir = str(tmp_path / "out")
+
+        first = ocr_instance.process_pdf_complete(str(original), output_dir, cache=cache)
+        cleaned = []
+        clean = ocr_instance.clean_academic_document
+        monkeypatch.setattr(ocr_instance, "clean_academic_document",
+                            lambda text, remove_headers=True, **kwargs: cleaned.append(text) or clean(text, remove_headers, **kwargs))
+        second = ocr_instance.process_pdf_complete(str(revised), output_dir, cache=cache)
+        third = ocr_instance.process_pdf_complete(str(revised), output_dir, cache=cache)
+
+        # Text of the two unchanged pages is reused, then the document is cleaned once
+        assert first["cache_hits"] == 0
+        assert second["cache_hits"] == 2
+        assert len(cleaned) == 1 and "Signals and Systems" in cleaned[0]
+        # Nothing changed: the whole result comes from the cache
+        assert third["cache_misses"] == 0
+        assert third["fixed_text"] == second["fixed_text"]
+        assert third["comparison"] == second["comparison"]
+        assert "CMPE 5220:" in second["fixed_text"]
+
+    def test_page_cache_does_not_change_results(self, ocr_instance, tmp_path, capsys):
+        """
+        Test that cached runs give exactly the output of an uncached run.
+
+        This test verifies that text cleaned across page boundaries, and the edit
+        statistics, are the same with a cold cache, a warm cache and no cache.
+        """
+        path = tmp_path / "catalog.pdf"
+        make_pdf(path, [
+            [("CMPE 5220. Embedded Systems. 3", 10)],
+            [("Credits. EE 2110. Circuit Analysis. 4 Credits.", 10)],
+            [("Professor Smith, department chair.", 10)],
+        ])
+        output_dir = str(tmp_path / "out")
+        cache = PageCache(str(tmp_path / "cache"))
+
+        uncached = ocr_instance.process_pdf_complete(str(path), output_dir)
+        cold = ocr_instance.process_pdf_complete(str(path), output_dir, cache=cache)
+        warm = ocr_instance.process_pdf_complete(str(path), output_dir, cache=cache)
+
+        assert "3 Credits. EE 2110:" in uncached["fixed_text"]
+        for cached in (cold, warm):
+            assert cached["cleaned_text"] == uncached["cleaned_text"]
+            assert cached["fixed_text"] == uncached["fixed_text"]
+            assert cached["comparison"] == uncached["comparison"]
+
+    def test_page_key_covers_resources(self, tmp_path):
+        """
+        Test that page keys change with Form XObject content behind an unchanged content stream.
+        """
+        def page_showing(word):
+            source = pymupdf.open()
+            source.new_page().insert_text((72, 72), word)
+            doc = pymupdf.open()
+            page = doc.new_page()
+            page.show_pdf_page(page.rect, source, 0)
+            return doc, page
+
+        doc_a, alpha = page_showing("alpha")
+        doc_b, bravo = page_showing("bravo")
+        doc_c, again = page_showing("alpha")
+
+        assert alpha.read_contents() == bravo.read_contents()
+        assert PageCache.page_key(alpha) != PageCache.page_key(bravo)
+        assert PageCache.page_key(alpha) == PageCache.page_key(again)
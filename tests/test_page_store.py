@@ -0,0 +1,134 @@
+"""
+Unit tests for the random-access compressed page store.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.ocr import OCR
+from hw.shared.page_store import PageStore, PageStoreWriter
+from tests.test_ocr import make_pdf
+
+
+def page_text(number):
+    return f"Page {number}. " + " ".join(f"word{number * 7 + i}" for i in range(200))
+
+
+class TestPageStore:
+    """Test cases for PageStoreWriter and PageStore."""
+
+    @pytest.fixture
+    def store_path(self, tmp_path):
+        """A store of 50 pages; cleaning changed every 10th page, fixing none."""
+        path = tmp_path / "doc.pages"
+        with PageStoreWriter(path, metadata={"source": "doc.pdf"}) as writer:
+            for number in range(50):
+                original = page_text(number)
+                cleaned = original.upper() if number % 10 == 0 else original
+                writer.add_page(original=original, cleaned=cleaned, fixed=cleaned)
+        return path
+
+    def test_round_trip_and_random_access(self, store_path):
+        """
+        Test reading single pages, page ranges and whole variants.
+
+        This test verifies that every variant of any page can be fetched
+        directly, and that ranges and joined text match the written pages.
+        """
+        with PageStore(store_path) as store:
+            assert len(store) == 50
+            assert store.variants == ["original", "cleaned", "fixed"]
+            assert store.metadata == {"source": "doc.pdf"}
+            assert store.page(37, "original") == page_text(37)
+            assert store.page(40) == page_text(40).upper()
+            assert store.pages(21, 24, variant="cleaned") == [page_text(n) for n in range(21, 24)]
+            assert store.pages(48, 100) == [page_text(48), page_text(49)]
+            assert store.text("original") == "\n".join(page_text(n) for n in range(50))
+
+    def test_identical_variants_stored_once(self, store_path, tmp_path):
+        """
+        Test that identical page texts share one compressed blob.
+
+        This test verifies that a store with three variants per page is barely
+        larger than one holding only the original text.
+        """
+        single_path = tmp_path / "single.pages"
+        with PageStoreWriter(single_path, variants=["original"]) as writer:
+            for number in range(50):
+                writer.add_page(original=page_text(number))
+
+        with PageStore(store_path) as store:
+            assert store.blob_count() == 55
+        assert store_path.stat().st_size < single_path.stat().st_size * 1.2
+
+    def test_missing_variants_and_errors(self, tmp_path):
+        """
+        Test missing variants, bad indices and files that are not page stores.
+        """
+        path = tmp_path / "partial.pages"
+        with PageStoreWriter(path) as writer:
+            writer.add_page(original="raw text")
+            with pytest.raises(ValueError):
+                writer.add_page(translated="texte")
+
+        with PageStore(path) as store:
+            assert store.page(0, "original") == "raw text"
+            assert store.page(0, "fixed") is None
+            with pytest.raises(IndexError):
+                store.page(1)
+            with pytest.raises(KeyError):
+                store.page(0, "translated")
+
+        bad_path = tmp_path / "bad.pages"
+        bad_path.write_bytes(b"not a page store" * 10)
+        with pytest.raises(ValueError):
+            PageStore(bad_path)
+
+    def test_page_store_slices_document_result(self, tmp_path, capsys):
+        """
+        Test that stored pages are slices of the document's cleaned and fixed text.
+
+        This test verifies that the document is cleaned once and that text
+        rewritten across a page break is kept whole, with the earlier page.
+        """
+        pdf_path = tmp_path / "catalog.pdf"
+        make_pdf(pdf_path, [
+            [("CMPE 5220. Embedded Systems. 3", 10)],
+            [("Credits. EE 2110. Circuit Analysis. 4 Credits.", 10)],
+            [("Professor Smith, department chair.", 10)],
+        ])
+
+        results = OCR().process_pdf_complete(str(pdf_path), str(tmp_path / "out"), page_store=True)
+
+        assert capsys.readouterr().out.count("Applying academic document cleaning") == 1
+        with PageStore(results["page_store"]) as store:
+            pages = store.pages()
+            assert pages[0] == "CMPE 5220: Embedded Systems. 3 Credits. "
+            assert pages[1] == "EE 2110: Circuit Analysis. 4 Credits. "
+            assert "".join(pages) == results["fixed_text"]
+            assert "".join(store.pages(variant="cleaned")) == results["cleaned_text"]
+
+    def test_process_pdf_complete_writes_page_store(self, tmp_path):
+        """
+        Test that process_pdf_complete can save every page variant to a page store.
+        """
+        pdf_path = tmp_path / "catalog.pdf"
+        make_pdf(pdf_path, [[("University course catalog", 20)], [("CMPE 5220. Embedded Systems.", 10)]])
+
+        results = OCR().process_pdf_complete(str(pdf_path), str(tmp_path / "out"), page_store=True)
+        plain = OCR().process_pdf_complete(str(pdf_path), str(tmp_path / "plain"))
+
+        with PageStore(results["page_store"]) as store:
+            assert len(store) == 2
+            assert store.metadata["doc_type"] == "academic"
+            assert "Embedded Systems" in store.page(1, "original")
+            assert store.page(1, "fixed") == "CMPE 5220: Embedded Systems."
+            assert store.text() == results["fixed_text"]
+        # Storing pages does not change the document output
+        assert results["cleaned_text"] == plain["cleaned_text"]
+        assert results["fixed_text"] == plain["fixed_text"]
+        assert results["comparison"] == plain["comparison"]
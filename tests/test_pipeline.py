@@ -0,0 +1,244 @@
+"""
+Unit tests for the lazy, memoized DAG pipeline.
+"""
+
+import threading
+import time
+
+import pytest
+import sys
+import os
+
+import pymupdf
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.pipeline import Pipeline, PipelineError, _nlp, add_text_analysis, pdf_pipeline
+
+
+CALLS = []
+
+
+def upper(text):
+    CALLS.append("upper")
+    return text.upper()
+
+
+def count_words(text, min_length=1):
+    CALLS.append("count_words")
+    return sum(1 for word in text.split() if len(word) >= min_length)
+
+
+def first_word(text):
+    CALLS.append("first_word")
+    return text.split()[0]
+
+
+def strip_text(text):
+    CALLS.append("strip_text")
+    return text.strip()
+
+
+def fail(text):
+    raise ValueError("bad input")
+
+
+BOOK = (
+    "CHAPTER ONE\n"
+    'The river was wide and slow in the evening light, and the boat waited by the shore. "Come in," said the ferryman.\n\n'
+    "CHAPTER TWO\n"
+    "He listened to the river for a long time. Nothing else was said while the boat crossed slowly to the far bank.\n\n"
+)
+
+
+class TestPipeline:
+    """Test cases for Pipeline and the OCR-to-NLP builder."""
+
+    @pytest.fixture(autouse=True)
+    def reset_calls(self):
+        """Clear the record of node function calls."""
+        CALLS.clear()
+
+    @pytest.fixture
+    def pipeline(self, tmp_path):
+        """A small text pipeline with a branching DAG."""
+        pipeline = Pipeline(cache_dir=tmp_path / "cache", workers=2)
+        pipeline.value("text", "  the river knows everything  ")
+        pipeline.node("clean", strip_text, inputs={"text": "text"})
+        pipeline.node("upper", upper, inputs={"text": "clean"})
+        pipeline.node("words", count_words, inputs={"text": "clean"}, params={"min_length": 1})
+        pipeline.node("first", first_word, inputs={"text": "upper"})
+        return pipeline
+
+    def test_lazy_evaluation_and_memoization(self, pipeline):
+        """
+        Test that only requested outputs are computed, and each recipe only once.
+        """
+        assert pipeline.get("words") == 4
+        assert sorted(CALLS) == ["count_words", "strip_text"]
+
+        assert pipeline.run("first", "words") == {"first": "THE", "words": 4}
+        assert sorted(pipeline.executed) == ["first", "upper"]
+        assert sorted(pipeline.reused) == ["clean", "words"]
+
+    def test_parameter_change_reruns_only_dependents(self, pipeline):
+        """
+        Test that changing a downstream parameter reruns just that node.
+        """
+        pipeline.run("first", "words")
+        CALLS.clear()
+
+        pipeline.set_params("words", min_length=4)
+        assert pipeline.run("first", "words") == {"first": "THE", "words": 3}
+        assert CALLS == ["count_words"]
+
+        # Restoring the parameter reuses the earlier result
+        pipeline.set_params("words", min_length=1)
+        assert pipeline.get("words") == 4
+        assert pipeline.executed == []
+
+    def test_unchanged_output_stops_reruns(self, pipeline):
+        """
+        Test that a changed input whose intermediate output is unchanged reruns nothing below it.
+        """
+        pipeline.run("first", "words")
+        CALLS.clear()
+
+        pipeline.value("text", "the river knows everything")
+
+        assert pipeline.run("first", "words") == {"first": "THE", "words": 4}
+        assert CALLS == ["strip_text"]
+
+    def test_results_persist_on_disk(self, pipeline, tmp_path):
+        """
+        Test that a new pipeline over the same cache directory reuses stored results.
+        """
+        pipeline.run("first", "words")
+        CALLS.clear()
+
+        fresh = Pipeline(cache_dir=tmp_path / "cache")
+        fresh.value("text", "  the river knows everything  ")
+        fresh.node("clean", strip_text, inputs={"text": "text"})
+        fresh.node("upper", upper, inputs={"text": "clean"})
+        fresh.node("first", first_word, inputs={"text": "upper"})
+
+        assert fresh.get("first") == "THE"
+        assert CALLS == []
+        # Bumping a node's version invalidates its results
+        fresh.node("first", first_word, inputs={"text": "upper"}, version=2)
+        assert fresh.get("first") == "THE"
+        assert CALLS == ["first_word"]
+
+    def test_distinct_functions_do_not_share_results(self, tmp_path):
+        """
+        Test that lambdas and closures with the same name get their own recipes.
+        """
+        def make(factor):
+            return lambda text: text * factor
+
+        pipeline = Pipeline(cache_dir=tmp_path / "cache")
+        pipeline.value("text", "hello")
+        pipeline.node("up", lambda text: text.upper(), inputs={"text": "text"})
+        pipeline.node("low", lambda text: text.lower(), inputs={"text": "text"})
+        pipeline.node("double", make(2), inputs={"text": "text"})
+        pipeline.node("triple", make(3), inputs={"text": "text"})
+
+        assert pipeline.get("up") == "HELLO"
+        assert pipeline.get("low") == "hello"
+        assert pipeline.get("double") == "hellohello"
+        assert pipeline.get("triple") == "hellohellohello"
+
+    def test_independent_branches_run_in_parallel(self, tmp_path):
+        """
+        Test that nodes with ready inputs run at the same time.
+        """
+        barrier = threading.Barrier(2, timeout=5)
+
+        def branch(text, label):
+            barrier.wait()  # only passes when both branches run at once
+            return f"{label}:{text}"
+
+        pipeline = Pipeline(workers=2)
+        pipeline.value("text", "river")
+        pipeline.node("left", branch, inputs={"text": "text"}, params={"label": "left"})
+        pipeline.node("right", branch, inputs={"text": "text"}, params={"label": "right"})
+
+        assert pipeline.run("left", "right") == {"left": "left:river", "right": "right:river"}
+
+    def test_errors(self, pipeline):
+        """
+        Test unknown inputs and failing nodes.
+        """
+        with pytest.raises(KeyError):
+            pipeline.node("bad", upper, inputs={"text": "missing"})
+        pipeline.node("broken", fail, inputs={"text": "clean"})
+        with pytest.raises(PipelineError, match="broken"):
+            pipeline.get("broken")
+
+    def test_text_analysis_nodes(self, capsys):
+        """
+        Test the NLPMethods nodes on a text value.
+        """
+        with pytest.raises(KeyError):
+            add_text_analysis(Pipeline(), "text")
+
+        pipeline = Pipeline()
+        pipeline.value("text", BOOK)
+        add_text_analysis(pipeline, "text", segmenter_mode="regex")
+        result = pipeline.run("chapter_data", "quotes")
+
+        assert [chapter["chapter_title"] for chapter in result["chapter_data"]] == ["CHAPTER ONE", "CHAPTER TWO"]
+        assert result["quotes"] == ["Come in,"]
+        assert "processed" not in pipeline.executed
+
+    def test_threads_use_their_own_nlp_methods(self):
+        """
+        Test that node threads do not share an NLPMethods and its segmenter cache.
+        """
+        instances = []
+        thread = threading.Thread(target=lambda: instances.append(_nlp("regex")))
+        thread.start()
+        thread.join()
+
+        assert _nlp("regex") is _nlp("regex")
+        assert instances[0] is not _nlp("regex")
+        assert instances[0].segmenter is not _nlp("regex").segmenter
+
+    def test_pdf_pipeline(self, tmp_path, capsys):
+        """
+        Test the PDF-to-chapters pipeline and that an edited PDF reruns from OCR.
+        """
+        pdf = tmp_path / "book.pdf"
+
+        def write_pdf(lines):
+            doc = pymupdf.open()
+            page = doc.new_page()
+            for i, line in enumerate(lines):
+                page.insert_text((72, 72 + 14 * i), line, fontsize=10)
+            doc.save(str(pdf))
+            doc.close()
+
+        write_pdf(["THE RIVER", "The river was wide and slow in the evening light, and the boat waited.",
+                   "The ferryman smiled at him and said nothing for a long time after that."])
+        pipeline = pdf_pipeline(pdf, output_dir=str(tmp_path / "out"), cache_dir=tmp_path / "cache",
+                                segmenter_mode="regex", chapter_titles=["THE RIVER"])
+
+        chapters = pipeline.get("chapter_data")
+        assert chapters[0]["chapter_title"] == "THE RIVER"
+        assert pipeline.executed == ["ocr", "text", "chapters", "chapter_data"]
+
+        pipeline.get("chapter_data")
+        assert pipeline.executed == []
+
+        # A memoized OCR result is not reused once the files it wrote are gone
+        os.remove(pipeline.get("ocr")["output_file"])
+        pipeline.get("chapter_data")
+        assert pipeline.executed == ["ocr"]
+        assert os.path.exists(pipeline.get("ocr")["output_file"])
+
+        time.sleep(0.01)
+        write_pdf(["THE RIVER", "The river was wide and fast in the morning light, and the boat waited.",
+                   "The ferryman smiled at him and said nothing for a long time after that."])
+        assert "fast" in pipeline.get("chapter_data")[0]["content"]
+        assert pipeline.executed == ["ocr", "text", "chapters", "chapter_data"]
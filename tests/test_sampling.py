@@ -0,0 +1,133 @@
+"""
+Unit tests for chapter sampling over a precomputed chapter table.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.nlp_methods import NLPMethods
+from hw.shared.sampling import (
+    ChapterTable, PPSSampler, RandomSampler, Sampler, StratifiedSampler, SystematicSampler
+)
+
+
+def make_records(sizes):
+    return [
+        {"chapter_title": f"CHAPTER {i}", "chapter_number": i + 1, "token_count": size,
+         "word_count": size, "content": "x" * size}
+        for i, size in enumerate(sizes)
+    ]
+
+
+class TestSampling:
+    """Test cases for ChapterTable and the samplers."""
+
+    @pytest.fixture
+    def table(self):
+        """A table of 30 chapters with token counts 10, 20, ..., 300."""
+        return ChapterTable(make_records(range(10, 310, 10)))
+
+    def test_table_columns_and_prefix_sums(self, table):
+        """
+        Test that numeric columns and prefix sums are built from the records.
+        """
+        assert table.column("token_count")[:3].tolist() == [10, 20, 30]
+        assert table.prefix("token_count")[-1] == sum(range(10, 310, 10))
+        assert table.range_total("token_count", 2, 5) == 30 + 40 + 50
+        assert "content" not in table.columns
+        with pytest.raises(KeyError):
+            table.column("content")
+
+    def test_seeded_draws_are_reproducible(self, table):
+        """
+        Test that every sampler returns k distinct sorted indices, reproducibly for a seed.
+
+        This test verifies that the same seed gives the same sample and batch,
+        and that batches have one sorted row per draw.
+        """
+        for make in (RandomSampler, SystematicSampler, StratifiedSampler, PPSSampler):
+            first = make(seed=7).sample_batch(table, 6, 50)
+            second = make(seed=7).sample_batch(table, 6, 50)
+
+            assert first.shape == (50, 6)
+            assert np.array_equal(first, second)
+            assert all(len(set(row)) == 6 and list(row) == sorted(row) for row in first.tolist())
+            assert make(seed=3).sample_indices(table, 6).tolist() == make(seed=3).sample_indices(table, 6).tolist()
+
+    def test_sampler_requires_draw(self):
+        """
+        Test that a sampler without a _draw method cannot be created.
+        """
+        class Incomplete(Sampler):
+            pass
+
+        with pytest.raises(TypeError):
+            Sampler()
+        with pytest.raises(TypeError):
+            Incomplete(seed=1)
+
+    def test_systematic_sampler_uses_fixed_step(self, table):
+        """
+        Test that systematic samples are evenly spaced from a start within the first step.
+        """
+        batch = SystematicSampler(seed=1).sample_batch(table, 6, 100)
+
+        assert (np.diff(batch, axis=1) == 5).all()
+        assert set(batch[:, 0].tolist()) <= set(range(5))
+        # A fixed step too large for k keeps the chapters that fit
+        assert SystematicSampler(step=10, seed=1).sample_indices(table, 6).size == 3
+
+    def test_stratified_sampler_covers_every_bucket(self, table):
+        """
+        Test that stratified samples take their allocated share from each length bucket.
+        """
+        sampler = StratifiedSampler(n_strata=3, seed=2)
+
+        assert sampler.allocation(table, 7) == [3, 2, 2]
+        for row in sampler.sample_batch(table, 6, 20):
+            buckets = np.searchsorted([10, 20], row, side="right")
+            assert np.bincount(buckets, minlength=3).tolist() == [2, 2, 2]
+
+    def test_pps_sampler_favors_long_chapters(self, table):
+        """
+        Test that PPS inclusion frequencies follow chapter size.
+
+        This test verifies the certainty selection of very large chapters and
+        that empirical inclusion rates match the inclusion probabilities.
+        """
+        sampler = PPSSampler(seed=4)
+        batch = sampler.sample_batch(table, 5, 4000)
+        rates = np.bincount(batch.ravel(), minlength=len(table)) / len(batch)
+
+        assert np.allclose(rates, sampler.inclusion_probabilities(table, 5), atol=0.04)
+
+        skewed = ChapterTable(make_records([1000, 5, 5, 5, 5, 5, 5, 5]))
+        rows = PPSSampler(seed=4).sample_batch(skewed, 3, 100)
+        assert (rows[:, 0] == 0).all()
+
+        with_replacement = PPSSampler(replace=True, seed=4).sample_batch(table, 5, 2000)
+        assert with_replacement.mean() > len(table) / 2
+
+    def test_nlp_methods_sampling_respects_sample_size(self):
+        """
+        Test that get_random_sample_chapter_data returns sample_size chapters.
+        """
+        nlp = NLPMethods("http://example.com")
+        titles = [f"CHAPTER {word}" for word in ["ONE", "TWO", "THREE", "FOUR", "FIVE", "SIX"]]
+        body = "The river flowed past the village for many long years. " * 3
+        text = "\n".join(f"{title}\n{body}\n" for title in titles)
+        table = nlp.get_chapter_table(titles, text)
+
+        sample = nlp.get_random_sample_chapter_data(titles, text, sample_size=4, seed=0, table=table)
+        systematic = nlp.get_systematic_sample_chapter_data(titles, text, sample_size=3, seed=0)
+
+        assert len(table) == 6
+        assert len(sample) == 4
+        assert [chapter["chapter_number"] for chapter in sample] == sorted(chapter["chapter_number"] for chapter in sample)
+        assert [chapter["chapter_number"] for chapter in systematic] in ([1, 3, 5], [2, 4, 6])
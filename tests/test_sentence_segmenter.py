@@ -0,0 +1,131 @@
+"""
+Unit tests for the shared sentence segmenter.
+"""
+
+import pickle
+import pytest
+import re
+import sys
+import os
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.nlp_methods import NLPMethods
+from hw.shared.sentence_segmenter import SentenceSegmenter
+
+
+TEXT = "  Mr. Smith met Dr. Jones at noon, e.g. for lunch.  Then they left!\n\nDid they return? No"
+
+
+class TestSentenceSegmenter:
+    """Test cases for SentenceSegmenter."""
+
+    @pytest.fixture
+    def segmenter(self):
+        """Create a Punkt segmenter."""
+        return SentenceSegmenter()
+
+    def test_punkt_does_not_break_after_abbreviations(self, segmenter):
+        """
+        Test abbreviation-aware segmentation with offsets into the text.
+
+        This test verifies that no sentence ends after "Mr.", "Dr." or "e.g.",
+        and that each sentence is a trimmed slice of the original text.
+        """
+        sentences = segmenter.spans(TEXT)
+
+        assert sentences.to_list() == [
+            "Mr. Smith met Dr. Jones at noon, e.g. for lunch.",
+            "Then they left!",
+            "Did they return?",
+            "No",
+        ]
+        assert sentences.span(0) == (2, TEXT.index("  Then"))
+        assert all(TEXT[start:end] == sentence for (start, end), sentence in zip(sentences.spans(), sentences))
+
+    def test_regex_mode_matches_legacy_split(self):
+        """
+        Test that regex mode reproduces the stripped pieces of re.split(r"[.!?]+").
+        """
+        legacy = [piece.strip() for piece in re.split(r"[.!?]+", TEXT) if piece.strip()]
+
+        assert SentenceSegmenter("regex").sentences(TEXT) == legacy
+        with pytest.raises(ValueError):
+            SentenceSegmenter("spacy")
+
+    def test_results_are_cached_per_text(self, segmenter):
+        """
+        Test that a text is segmented once and its offsets are shared.
+        """
+        first = segmenter.spans(TEXT)
+        second = segmenter.spans(TEXT)
+
+        assert first.starts is second.starts
+        assert segmenter.count(TEXT) == 4
+        # Sentences overlapping "Jones ... left" are the first two
+        assert segmenter.count(TEXT, TEXT.index("Jones"), TEXT.index("left")) == 2
+
+        copy = pickle.loads(pickle.dumps(segmenter))
+        assert copy.sentences(TEXT) == segmenter.sentences(TEXT)
+
+    def test_cache_does_not_keep_texts(self, segmenter):
+        """
+        Test that cached segmentations do not keep their texts alive.
+        """
+        first = segmenter.spans("".join(["A long book. ", "It ends here."]))
+        # An equal text built separately reuses the cached offsets
+        second = segmenter.spans("".join(["A long book. ", "It ends here."]))
+
+        assert second.starts is first.starts
+        assert not any(isinstance(part, str) for key in segmenter._cache for part in key)
+
+    def test_extra_abbreviations(self):
+        """
+        Test that user-supplied abbreviations are respected.
+        """
+        text = "The bridge dates to ca. 1200. It still stands."
+
+        assert len(SentenceSegmenter().sentences(text)) == 3
+        assert SentenceSegmenter(abbreviations=["ca."]).sentences(text) == [
+            "The bridge dates to ca. 1200.", "It still stands."
+        ]
+
+    def test_nlp_methods_share_one_segmentation(self):
+        """
+        Test that NLPMethods uses its segmenter for sentences and chapter counts.
+
+        This test verifies that parallel segments are not cut after an
+        abbreviation, and that regex mode keeps the earlier chapter counts.
+        """
+        nlp = NLPMethods("http://example.com")
+        text = "Mr. Smith arrived. He waited. " * 30
+
+        bounds = nlp._segment_bounds(text.encode("utf-8"), 4)
+        assert len(bounds) == 4
+        assert all(not text[:end].endswith("Mr.") for _, end in bounds[:-1])
+        assert nlp.get_processed_text(text)["sentences"][:2] == ["Mr. Smith arrived.", "He waited."]
+
+        body = "The river flowed past the village. It was old! " * 3
+        book = f"THE RIVER\n{body}\n\nTHE FERRYMAN\n{body}"
+        regex_nlp = NLPMethods("http://example.com", segmenter=SentenceSegmenter("regex"))
+        counts = [chapter["sentence_count"] for chapter in regex_nlp.get_chapter_data(["THE RIVER", "THE FERRYMAN"], book)]
+        assert counts == [6, 6]
+
+    def test_chapter_counts_look_up_the_text_once(self, monkeypatch):
+        """
+        Test that get_chapter_data hashes the book once, not once per chapter.
+        """
+        segmenter = SentenceSegmenter("regex")
+        keys = []
+        cache_key = SentenceSegmenter._cache_key
+        monkeypatch.setattr(segmenter, "_cache_key", lambda text: keys.append(len(text)) or cache_key(text))
+
+        body = "The river flowed past the village. It was old! " * 3
+        titles = ["THE RIVER", "THE FERRYMAN", "THE SON", "THE BOAT", "THE BANK"]
+        book = "".join(f"{title}\n{body}\n\n" for title in titles)
+        chapters = NLPMethods(None, segmenter=segmenter).get_chapter_data(titles, book)
+
+        assert [chapter["sentence_count"] for chapter in chapters] == [6] * 5
+        assert keys == [len(book)]
+        assert segmenter.count(book, spans=segmenter.spans(book)) == segmenter.count(book) == 30
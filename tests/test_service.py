@@ -0,0 +1,171 @@
+"""
+Unit tests for the local NLP HTTP service.
+
+The service runs on localhost with a real worker process.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+import sys
+import os
+
+import pymupdf
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.service import NLPService, ServiceBusy
+
+
+TEXT = (
+    "CHAPTER ONE\n"
+    'The river was wide and slow in the evening light, and the boat waited. "Come in," said the ferryman. "Sit down."\n\n'
+    "CHAPTER TWO\n"
+    "He listened to the river for a long time. Nothing else was said while the boat crossed over to the far bank.\n\n"
+)
+
+
+def post(url, path, payload, headers=None):
+    """POST JSON and return (status, decoded body, headers)."""
+    data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(url + path, data=data,
+                                     headers={"Content-Type": "application/json", **(headers or {})})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read()), response.headers
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read()), error.headers
+
+
+class TestNLPService:
+    """Test cases for NLPService."""
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def service(cls, tmp_path_factory):
+        """A running service with one warm worker, on a free localhost port."""
+        output_root = str(tmp_path_factory.mktemp("service_output"))
+        with NLPService(port=0, workers=1, batch_wait=0.05, segmenter_mode="regex",
+                        output_root=output_root) as service:
+            yield service
+
+    def test_health_reports_warm_workers(self, service):
+        """
+        Test that the pool is started and warmed before the service accepts requests.
+        """
+        with urllib.request.urlopen(service.url + "/health", timeout=10) as response:
+            health = json.loads(response.read())
+
+        assert health["status"] == "ok"
+        assert health["workers"] == 1
+        assert len(service.worker_pids) == 1 and service.worker_pids[0] != os.getpid()
+
+    def test_text_endpoints(self, service):
+        """
+        Test quote extraction, text processing and chapter statistics over HTTP.
+
+        This test verifies that results match the NLPMethods methods and that
+        chapter content is only returned when asked for.
+        """
+        status, body, _ = post(service.url, "/text/quotes", {"text": TEXT})
+        assert status == 200
+        assert body["result"] == ["Come in,", "Sit down."]
+
+        status, body, _ = post(service.url, "/text/processed", {"text": TEXT})
+        assert status == 200
+        assert body["result"]["quotes"] == ["Come in,", "Sit down."]
+        assert "ferryman" in body["result"]["all_tokens"]
+
+        status, body, _ = post(service.url, "/text/chapters", {"text": TEXT})
+        assert status == 200
+        assert [chapter["chapter_title"] for chapter in body["result"]] == ["CHAPTER ONE", "CHAPTER TWO"]
+        assert "content" not in body["result"][0]
+        _, body, _ = post(service.url, "/text/chapters", {"text": TEXT, "chapters": ["CHAPTER TWO"], "content": True})
+        assert body["result"][0]["content"].startswith("He listened")
+
+    def test_small_requests_are_micro_batched(self, service):
+        """
+        Test that concurrent small text jobs share pool tasks and keep their own results.
+        """
+        before = dict(service.counters)
+        texts = [f'Line {i}: "quote {i}" here.' for i in range(8)]
+        futures = [service.submit("quotes", {"text": text}) for text in texts]
+
+        assert [future.result(timeout=60) for future in futures] == [[f"quote {i}"] for i in range(8)]
+        assert service.counters["pool_tasks"] - before["pool_tasks"] < 8
+        assert service.counters["batched_jobs"] > before["batched_jobs"]
+
+    def test_errors(self, service):
+        """
+        Test responses for unknown paths, invalid requests and failing jobs.
+        """
+        assert post(service.url, "/text/unknown", {"text": TEXT})[0] == 404
+        assert post(service.url, "/text/quotes", b"{not json")[0] == 400
+        assert post(service.url, "/text/quotes", {"body": TEXT})[0] == 400
+
+        status, body, _ = post(service.url, "/text/chapters", {"text": TEXT, "chapters": 5})
+        assert status == 422
+        assert "TypeError" in body["error"]
+        # The worker survives a failing job
+        assert post(service.url, "/text/quotes", {"text": '"ok"'})[1]["result"] == ["ok"]
+
+    def test_pdf_endpoint(self, service, tmp_path):
+        """
+        Test PDF processing in a worker, without the large text fields by default.
+        """
+        path = tmp_path / "catalog.pdf"
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "CMPE 5220. Embedded Systems. 3 Credits.", fontsize=10)
+        doc.save(str(path))
+        doc.close()
+
+        status, body, _ = post(service.url, "/pdf", {"path": str(path), "output_dir": "out"})
+
+        assert status == 200
+        assert body["result"]["pages_processed"] == 1
+        assert "fixed_text" not in body["result"]
+        assert body["result"]["output_file"].startswith(os.path.join(service.output_root, "out"))
+        with open(body["result"]["output_file"], encoding="utf-8") as f:
+            assert "CMPE 5220:" in f.read()
+
+        for outside in (str(tmp_path / "out"), "../escape"):
+            status, body, _ = post(service.url, "/pdf", {"path": str(path), "output_dir": outside})
+            assert status == 403
+            assert "output_dir" in body["error"]
+
+    def test_rejects_cross_origin_and_non_json_posts(self, service):
+        """
+        Test that POSTs a browser could send from another site are refused.
+
+        This test verifies that a foreign Origin or Host gets 403 and a body that
+        is not declared as JSON gets 415, while a localhost Origin is accepted.
+        """
+        assert post(service.url, "/text/quotes", {"text": TEXT}, {"Origin": "https://evil.example"})[0] == 403
+        assert post(service.url, "/text/quotes", {"text": TEXT}, {"Host": "evil.example"})[0] == 403
+        assert post(service.url, "/text/quotes", {"text": TEXT}, {"Content-Type": "text/plain"})[0] == 415
+        assert post(service.url, "/text/quotes", {"text": TEXT},
+                    {"Content-Type": "application/x-www-form-urlencoded"})[0] == 415
+
+        status, body, _ = post(service.url, "/text/quotes", {"text": '"ok"'}, {"Origin": "http://localhost:3000"})
+        assert status == 200
+        assert body["result"] == ["ok"]
+
+    def test_backpressure_rejects_when_full(self):
+        """
+        Test that requests beyond max_pending get 503 with Retry-After instead of queueing.
+        """
+        with NLPService(port=0, workers=1, max_pending=1, batch_wait=1.0, segmenter_mode="regex") as service:
+            held = service.submit("quotes", {"text": '"first"'})
+
+            status, body, headers = post(service.url, "/text/quotes", {"text": '"second"'})
+            assert status == 503
+            assert headers["Retry-After"] == "1"
+            with pytest.raises(ServiceBusy):
+                service.submit("quotes", {"text": '"third"'})
+
+            assert held.result(timeout=60) == ["first"]
+            assert service.health()["rejected"] == 2
+            assert post(service.url, "/text/quotes", {"text": '"fourth"'})[1]["result"] == ["fourth"]
@@ -0,0 +1,153 @@
+"""
+Unit tests for TermFrequencyEngine and GroupedTermFrequency classes.
+
+This module contains tests for incremental and mergeable term counting.
+"""
+
+import pytest
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.term_frequency import GroupedTermFrequency, TermFrequencyEngine, tokenize_document
+
+
+DOCUMENTS = [
+    "Vote early! Voting matters, and I will vote.",
+    "The election is Tuesday. Vote for democracy.",
+    "Election security matters to every voter.",
+    "Make a plan to vote in the election.",
+]
+
+
+class TestTermFrequencyEngine:
+    """Test cases for TermFrequencyEngine class."""
+
+    def test_tokenize_document_matches_notebook_cleaning(self):
+        """
+        Test tokenize_document with punctuation and short words.
+
+        This test verifies that punctuation is stripped, tokens are lowercased and
+        single-character tokens other than 'i' are dropped.
+        """
+        assert tokenize_document("I said: Vote a LOT!") == ["i", "said", "vote", "lot"]
+        assert tokenize_document(float("nan")) == []
+
+    def test_incremental_counts_equal_one_shot_counts(self):
+        """
+        Test that adding documents one at a time gives the same counts as
+        adding them all at once.
+        """
+        one_shot = TermFrequencyEngine().add_documents(DOCUMENTS)
+
+        incremental = TermFrequencyEngine()
+        for text in DOCUMENTS:
+            incremental.add_document(text)
+
+        assert incremental.counts == one_shot.counts
+        assert incremental.counts["vote"] == 4
+        assert incremental.document_frequencies["vote"] == 3
+        assert incremental.document_count == 4
+
+    def test_merge_partial_counts(self):
+        """
+        Test merging two partial engines into the totals.
+        """
+        left = TermFrequencyEngine().add_documents(DOCUMENTS[:2])
+        right = TermFrequencyEngine().add_documents(DOCUMENTS[2:])
+        total = TermFrequencyEngine().add_documents(DOCUMENTS)
+
+        merged = left + right
+
+        assert merged.counts == total.counts
+        assert merged.document_frequencies == total.document_frequencies
+        assert merged.document_count == total.document_count
+
+    def test_stream_top_n_and_dataframe(self):
+        """
+        Test streaming top-N reports and the bag-of-words DataFrame export.
+        """
+        engine = TermFrequencyEngine()
+
+        reports = list(engine.stream_top_n(DOCUMENTS, n=2, chunk_size=2))
+
+        assert len(reports) == 2
+        assert reports[-1][0] == ("vote", 4)
+        df = engine.to_dataframe(n=3)
+        assert list(df.columns) == ["word", "counts"]
+        assert df.iloc[0]["word"] == "vote"
+        assert len(df) == 3
+
+    def test_save_load_and_parallel(self, tmp_path):
+        """
+        Test JSON persistence and counting in worker processes.
+        """
+        engine = TermFrequencyEngine().add_documents(DOCUMENTS[:3])
+        path = tmp_path / "counts.json"
+        engine.save(str(path))
+
+        reloaded = TermFrequencyEngine.load(str(path))
+        reloaded.add_document(DOCUMENTS[3])
+        parallel = TermFrequencyEngine.count_parallel(DOCUMENTS * 5, processes=2, chunk_size=3)
+
+        assert reloaded.counts == TermFrequencyEngine().add_documents(DOCUMENTS).counts
+        assert parallel.counts["vote"] == 20
+        assert parallel.document_count == 20
+
+
+class TestGroupedTermFrequency:
+    """Test cases for GroupedTermFrequency class."""
+
+    @pytest.fixture
+    def emails(self):
+        """Create a small DataFrame of emails with metadata columns."""
+        return pd.DataFrame(
+            {
+                "Body": DOCUMENTS,
+                "Party": ["Republican", "Democrat", "Republican", "Democrat"],
+                "Chamber": ["House", "House", "Senate", "Senate"],
+            }
+        )
+
+    def test_group_counts_match_filtered_counts(self, emails):
+        """
+        Test that one-pass group counts equal counting each filtered slice separately.
+
+        This test verifies that each document is tokenized only once while the
+        results match the notebook's filter-then-tokenize approach.
+        """
+        calls = []
+
+        def counting_tokenizer(text):
+            calls.append(text)
+            return tokenize_document(text)
+
+        grouped = GroupedTermFrequency(["Party", ("Party", "Chamber")], counting_tokenizer)
+        grouped.add_dataframe(emails, "Body")
+
+        assert len(calls) == len(emails)
+        for party in ["Republican", "Democrat"]:
+            expected = TermFrequencyEngine().add_documents(emails[emails["Party"] == party]["Body"])
+            assert grouped.get("Party", party).counts == expected.counts
+        assert grouped.total.counts == TermFrequencyEngine().add_documents(DOCUMENTS).counts
+        assert grouped.get(("Party", "Chamber"), ("Democrat", "Senate")).document_count == 1
+
+    def test_grouped_dataframe_and_merge(self, emails):
+        """
+        Test the long-format export and merging of partial grouped counts.
+        """
+        left = GroupedTermFrequency(["Chamber"]).add_dataframe(emails.iloc[:2], "Body")
+        right = GroupedTermFrequency(["Chamber"]).add_dataframe(emails.iloc[2:], "Body")
+
+        merged = left.merge(right)
+        df = merged.to_dataframe("Chamber", n=1)
+
+        assert list(df.columns) == ["Chamber", "word", "counts"]
+        assert set(df["Chamber"]) == {"House", "Senate"}
+        assert merged.total.document_count == 4
+        with pytest.raises(KeyError):
+            GroupedTermFrequency(["State"]).add_dataframe(emails, "Body")
@@ -0,0 +1,100 @@
+"""
+Unit tests for the vectorized text cleaning module.
+
+The reference implementation below is the week 5 notebook's row-by-row
+clean_utf_characters, used to check that the vectorized version matches it.
+"""
+
+import pytest
+import sys
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.text_cleaning import (
+    ZERO_WIDTH_CHARS,
+    clean_dataframe_column,
+    clean_series,
+    clean_utf_characters,
+    read_clean_csv,
+)
+
+
+def reference_clean(text):
+    """Row-by-row cleaning exactly as written in the week 5 notebook."""
+    if not isinstance(text, str):
+        return text
+    for char in ZERO_WIDTH_CHARS:
+        text = text.replace(char, "")
+    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]", "", text)
+    text = re.sub(r"[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}\'\"\/\\\@\#\$\%\^\&\*\=\+\|`~]", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+SAMPLES = [
+    "Moran Minute: He is Risen! ✝️ As We Celebrate Easter, Here\\'s What I\\'m Working on ‌ ‌",
+    "  Tabs\tand\nnewlines — dashes • bullets\x1c\x1f end  ",
+    "Zero​width‮join \U0001F1FA\U0001F1F8 flags & $5.00 (50%)",
+    "\x00\x07control\x85chars nbsp",
+    "",
+]
+
+
+class TestTextCleaning:
+    """Test cases for the vectorized cleaning functions."""
+
+    def test_clean_utf_characters_matches_reference(self):
+        """
+        Test clean_utf_characters against the notebook's implementation.
+        """
+        for text in SAMPLES:
+            assert clean_utf_characters(text) == reference_clean(text)
+
+    def test_clean_series_matches_reference_and_keeps_non_strings(self):
+        """
+        Test clean_series on an object column with missing and numeric values.
+
+        This test verifies that strings are cleaned identically to the reference
+        and that non-string values are left untouched.
+        """
+        series = pd.Series(SAMPLES + [np.nan, 42], dtype=object)
+
+        result = clean_series(series)
+
+        for original, cleaned in zip(series[:len(SAMPLES)], result[:len(SAMPLES)]):
+            assert cleaned == reference_clean(original)
+        assert pd.isna(result.iloc[len(SAMPLES)])
+        assert result.iloc[-1] == 42
+
+    def test_clean_dataframe_column_does_not_modify_input(self):
+        """
+        Test clean_dataframe_column returns a cleaned frame without touching the original.
+        """
+        df = pd.DataFrame({"Body": SAMPLES, "Party": ["Democrat"] * len(SAMPLES)})
+
+        result = clean_dataframe_column(df, "Body")
+
+        assert df["Body"].tolist() == SAMPLES
+        assert result["Body"].tolist() == [reference_clean(t) for t in SAMPLES]
+        assert clean_dataframe_column(df, "Missing") is df
+
+    def test_read_clean_csv_in_chunks(self, tmp_path):
+        """
+        Test chunked CSV reading across several files.
+        """
+        paths = []
+        for i in range(2):
+            path = tmp_path / f"part_{i}.csv"
+            pd.DataFrame({"ID": range(5), "Body": SAMPLES}).to_csv(path, index=False)
+            paths.append(str(path))
+
+        df = read_clean_csv(paths, "Body", chunksize=2, drop_duplicates_subset=["ID", "Body"])
+
+        assert len(df) == 5
+        assert df["Body"].iloc[0] == reference_clean(SAMPLES[0])
@@ -0,0 +1,115 @@
+"""
+Unit tests for TokenNormalizer class.
+
+A stand-in lemmatizer is used so the tests do not need the WordNet corpus.
+"""
+
+import pytest
+import sys
+import os
+import pickle
+from multiprocessing import Pool
+
+# Add the parent directory to the path so we can import hw.shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hw.shared.token_normalizer import TokenNormalizer, init_worker, worker_normalizer
+from hw.shared.term_frequency import TermFrequencyEngine
+
+
+class CountingLemmatizer:
+    """Strips a plural 's' and counts how often it is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def lemmatize(self, word):
+        self.calls += 1
+        return word[:-1] if word.endswith("s") and len(word) > 3 else word
+
+
+def _normalize_in_worker(tokens):
+    normalizer = worker_normalizer()
+    return normalizer.normalize_tokens(tokens), normalizer.misses
+
+
+class TestTokenNormalizer:
+    """Test cases for TokenNormalizer class."""
+
+    @pytest.fixture
+    def normalizer(self):
+        """Create a normalizer with a counting lemmatizer and fixed stopwords."""
+        return TokenNormalizer(lemmatizer=CountingLemmatizer(), stop_words={"the", "to", "ha"})
+
+    def test_tokenize_matches_notebook_pipeline(self, normalizer):
+        """
+        Test tokenize on text with punctuation, stopwords and custom lemmas.
+        """
+        text = "The voters went to the polls... Voting matters! I voted, ni x."
+
+        result = normalizer.tokenize(text)
+
+        assert result == ["voter", "went", "poll", "vote", "matter", "i", "voted"]
+
+    def test_lemmatizer_called_once_per_type(self, normalizer):
+        """
+        Test that repeated tokens are lemmatized only once.
+
+        This test verifies that the memo table turns repeated occurrences into
+        lookups instead of lemmatizer calls.
+        """
+        tokens = ["Votes", "votes", "ballots", "Votes"] * 1000
+
+        result = normalizer.normalize_tokens(tokens)
+
+        assert len(result) == 4000
+        assert normalizer.lemmatizer.calls == 3
+        assert normalizer.cache_info()["misses"] == 3
+        assert normalizer.cache_info()["hits"] == 3997
+
+    def test_table_is_bounded(self):
+        """
+        Test that the memo table evicts least recently used entries.
+        """
+        normalizer = TokenNormalizer(lemmatizer=CountingLemmatizer(), stop_words=set(), maxsize=2)
+
+        normalizer.normalize_tokens(["alpha", "beta", "alpha", "gamma"])
+
+        assert list(normalizer.export_table()) == ["alpha", "gamma"]
+
+    def test_preload_and_pickle_share_table(self, normalizer, tmp_path):
+        """
+        Test that a warm table can be saved, preloaded and pickled.
+        """
+        normalizer.normalize_tokens(["states", "counties"])
+        path = tmp_path / "table.json"
+        normalizer.save(str(path))
+
+        fresh = TokenNormalizer(lemmatizer=CountingLemmatizer(), stop_words=set())
+        fresh.load(str(path))
+        copied = pickle.loads(pickle.dumps(normalizer))
+
+        assert fresh.normalize("states") == "state"
+        assert fresh.lemmatizer.calls == 0
+        assert copied.export_table() == normalizer.export_table()
+
+    def test_worker_processes_start_warm(self, normalizer):
+        """
+        Test the Pool initializer preloading the memo table in each worker.
+        """
+        normalizer.normalize_tokens(["states", "counties"])
+        table = normalizer.export_table()
+
+        with Pool(2, initializer=init_worker, initargs=(table,)) as pool:
+            results = pool.map(_normalize_in_worker, [["states"], ["counties"]])
+
+        assert [words for words, _ in results] == [["state"], ["countie"]]
+        assert all(misses == 0 for _, misses in results)
+
+    def test_normalizer_as_term_frequency_tokenizer(self, normalizer):
+        """
+        Test plugging the normalizer into TermFrequencyEngine.
+        """
+        engine = TermFrequencyEngine(normalizer).add_documents(["Voting votes", "The votes"])
+
+        assert engine.counts["vote"] == 3